@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_users_id'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlogs',
+            index=models.Index(fields=['created_at'], name='audit_logs_created_262184_idx'),
+        ),
+    ]
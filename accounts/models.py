@@ -84,6 +84,7 @@ class AuditLogs(models.Model):
         indexes = [
             models.Index(fields=['user', '-created_at']),
             models.Index(fields=['action', '-created_at']),
+            models.Index(fields=['created_at']),
         ]
 
     def __str__(self):
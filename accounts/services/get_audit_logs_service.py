@@ -2,6 +2,11 @@ from rest_framework import status
 
 from accounts.models import AuditLogs
 from accounts.services.service_helper.accounts_service_helper import AccountsServiceHelper
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from file_integrity_monitoring.commons.keyset_paginator import KeysetPaginator, InvalidCursor
+
+# Non-null indexed columns that cursor pagination can sort by
+CURSOR_SORT_FIELDS = ("created_at", "id")
 
 
 class GetAuditLogsService(AccountsServiceHelper):
@@ -17,7 +22,9 @@ class GetAuditLogsService(AccountsServiceHelper):
             "sort_by": data.get("sort_by", "created_at"),
             "sort_order": data.get("sort_order", "desc"),
             "action": data.get("action"),
-            "resource_type": data.get("resource_type")
+            "resource_type": data.get("resource_type"),
+            "cursor": data.get("cursor"),
+            "include_total": str(data.get("include_total", "true")).lower() in ['true', '1', 'yes']
         }
 
     def get_data(self, *args, **kwargs):
@@ -39,10 +46,28 @@ class GetAuditLogsService(AccountsServiceHelper):
 
         page = params.get("page")
         page_size = params.get("page_size")
-        start = (page - 1) * page_size
-        end = start + page_size
+        next_cursor = None
+
+        # Cursor pagination unless a later page is requested by number
+        if params.get("cursor") or (page == 1 and params.get("sort_by") in CURSOR_SORT_FIELDS):
+            try:
+                paginator = KeysetPaginator(
+                    audit_logs, params.get("sort_by"), params.get("sort_order"), CURSOR_SORT_FIELDS
+                )
+                paginated_logs, next_cursor = paginator.get_page(params.get("cursor"), page_size)
+            except InvalidCursor:
+                self.error = True
+                self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+                return {"message": GenericConstants.INVALID_CURSOR_MESSAGE}
+        else:
+            start = (page - 1) * page_size
+            end = start + page_size
+            paginated_logs = audit_logs[start:end]
 
-        paginated_logs = audit_logs[start:end]
+        # Audit logs have no counters; the count stops at PAGINATION_COUNT_LIMIT
+        total, total_is_approximate = None, False
+        if params.get("include_total"):
+            total, total_is_approximate = KeysetPaginator.capped_count(audit_logs)
 
         return {
             "audit_logs": [
@@ -58,7 +83,9 @@ class GetAuditLogsService(AccountsServiceHelper):
                 }
                 for log in paginated_logs
             ],
-            "total": audit_logs.count(),
+            "total": total,
+            "total_is_approximate": total_is_approximate,
             "page": page,
-            "page_size": page_size
+            "page_size": page_size,
+            "next_cursor": next_cursor
         }
\ No newline at end of file
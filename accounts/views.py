@@ -114,6 +114,8 @@ class AuditLogsView(ListView):
         sort_order = request.GET.get('sort_order', 'desc')
         action = request.GET.get('action')
         resource_type = request.GET.get('resource_type')
+        cursor = request.GET.get('cursor')
+        include_total = request.GET.get('include_total', 'true')
 
         data = {
             'page': page,
@@ -121,7 +123,9 @@ class AuditLogsView(ListView):
             'sort_by': sort_by,
             'sort_order': sort_order,
             'action': action,
-            'resource_type': resource_type
+            'resource_type': resource_type,
+            'cursor': cursor,
+            'include_total': include_total
         }
 
         kwargs.update({
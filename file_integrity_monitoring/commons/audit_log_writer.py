@@ -0,0 +1,224 @@
+import atexit
+import queue
+import threading
+
+from django.db import IntegrityError, close_old_connections, transaction
+
+from accounts.models import AuditLogs, Users
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+
+
+class AuditLogWriter:
+    """
+        Buffer audit log entries in a bounded in-process queue and write them with bulk_create.
+
+        Entries are queued when the caller's transaction commits, so a rolled back change leaves
+        no audit trail. A background thread flushes every AUDIT_LOG_FLUSH_SECONDS, or as soon as
+        AUDIT_LOG_BATCH_SIZE entries are waiting. A caller that finds the queue full flushes it
+        itself. flush() writes everything queued so far and is also run at interpreter exit.
+
+        Entries for unknown user ids are dropped, as CreateAuditLogsService rejected them. A batch
+        whose insert fails is written again entry by entry, so only the failing entries are lost.
+        Known user ids are cached, so a batch costs at most one user lookup and one insert.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, queue_size=GenericConstants.AUDIT_LOG_QUEUE_SIZE,
+                 batch_size=GenericConstants.AUDIT_LOG_BATCH_SIZE,
+                 flush_seconds=GenericConstants.AUDIT_LOG_FLUSH_SECONDS):
+        """
+            @param queue_size: Entries buffered before writers flush synchronously
+            @param batch_size: Entries per insert, and queue depth that wakes the flusher
+            @param flush_seconds: Longest time an entry waits in the queue
+        """
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._flush_lock = threading.Lock()
+        self._known_user_ids = set()
+
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+
+    @classmethod
+    def get_instance(cls):
+        """
+            @return: Writer shared by the current process
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                atexit.register(cls._instance.stop)
+            return cls._instance
+
+    def write(self, user_id, action, resource_type, resource_id, old_values=None, new_values=None,
+              ip_address=None):
+        """
+            Queue one audit log entry once the current transaction commits
+            @param user_id:
+            @param action:
+            @param resource_type:
+            @param resource_id:
+            @param old_values:
+            @param new_values:
+            @param ip_address:
+            @return: None
+        """
+        self.write_many([{
+            "user_id": user_id,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "old_values": old_values,
+            "new_values": new_values,
+            "ip_address": ip_address
+        }])
+
+    def write_many(self, entries):
+        """
+            Queue audit log entries once the current transaction commits
+            @param entries: Dicts with the AuditLogs fields, user given as user_id
+            @return: None
+        """
+        entries = [{**entry, "user_id": self._normalize_user_id(entry.get("user_id"))} for entry in entries]
+        if entries:
+            transaction.on_commit(lambda: self._enqueue(entries))
+
+    @staticmethod
+    def _normalize_user_id(user_id):
+        """User ids arrive as ints or request strings; anything that is not a number never matches a user"""
+        if user_id is None or user_id == "":
+            return None
+        try:
+            return int(user_id)
+        except (TypeError, ValueError):
+            return str(user_id)
+
+    def _enqueue(self, entries):
+        for entry in entries:
+            while True:
+                try:
+                    self._queue.put_nowait(entry)
+                    break
+                except queue.Full:
+                    self.flush()
+
+        if not GenericConstants.AUDIT_LOG_ASYNC:
+            self.flush()
+            return
+
+        self._ensure_flusher()
+        if self._queue.qsize() >= self.batch_size:
+            self._wake_event.set()
+
+    def flush(self):
+        """
+            Write every queued entry
+            @return: Number of audit logs written
+        """
+        with self._flush_lock:
+            written = 0
+            while True:
+                batch = self._drain(self.batch_size)
+                if not batch:
+                    return written
+                written += self._write_batch(batch)
+
+    def stop(self, timeout=None):
+        """
+            Stop the flusher and write what is left in the queue
+            @param timeout: Seconds to wait for the flusher
+            @return: None
+        """
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def _drain(self, limit):
+        batch = []
+        while len(batch) < limit:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_batch(self, batch):
+        try:
+            return self._insert(batch)
+        except IntegrityError:
+            # A cached user was deleted since; look every user up again
+            self._known_user_ids.clear()
+            try:
+                return self._insert(batch)
+            except Exception as e:
+                print(f"Error writing {len(batch)} audit logs: {str(e)}")
+        except Exception as e:
+            print(f"Error writing {len(batch)} audit logs: {str(e)}")
+
+        # One bad entry fails the whole insert; write the rest one by one
+        return self._insert_each(batch)
+
+    def _insert_each(self, batch):
+        written = 0
+        for entry in batch:
+            try:
+                written += self._insert([entry])
+            except Exception as e:
+                print(
+                    f"Dropped audit log {entry.get('action')} {entry.get('resource_type')} "
+                    f"{entry.get('resource_id')}: {str(e)}"
+                )
+        return written
+
+    def _insert(self, batch):
+        unknown_user_ids = {
+            entry["user_id"] for entry in batch
+            if isinstance(entry["user_id"], int) and entry["user_id"] not in self._known_user_ids
+        }
+        if unknown_user_ids:
+            if len(self._known_user_ids) + len(unknown_user_ids) > GenericConstants.AUDIT_LOG_USER_CACHE_SIZE:
+                self._known_user_ids.clear()
+            self._known_user_ids.update(
+                Users.objects.filter(id__in=unknown_user_ids).values_list("id", flat=True)
+            )
+
+        audit_logs = [
+            AuditLogs(**entry)
+            for entry in batch
+            if entry["user_id"] is None or entry["user_id"] in self._known_user_ids
+        ]
+        if len(audit_logs) < len(batch):
+            print(f"Dropped {len(batch) - len(audit_logs)} audit logs of unknown users")
+
+        with transaction.atomic():
+            AuditLogs.objects.bulk_create(audit_logs)
+        return len(audit_logs)
+
+    def _ensure_flusher(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop_event.clear()
+                self._thread = threading.Thread(target=self._run, name="fim-audit-log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wake_event.wait(self.flush_seconds)
+            self._wake_event.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error in audit log writer: {str(e)}")
+            finally:
+                close_old_connections()
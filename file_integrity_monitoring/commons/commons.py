@@ -1,6 +1,4 @@
-from django.test import RequestFactory
-
-from accounts.services.create_audit_logs_service import CreateAuditLogsService
+from file_integrity_monitoring.commons.audit_log_writer import AuditLogWriter
 
 
 class Commons:
@@ -9,19 +7,44 @@ class Commons:
 
     @staticmethod
     def create_audit_log(user_id, action, resource_type, resource_id, old_values=None, new_values=None):
-        factory = RequestFactory()
-        request = factory.get('/')
-
-        data = {
-            'user_id': user_id,
-            'action': action,
-            'resource_type': resource_type,
-            'resource_id': resource_id,
-            'old_values': old_values,
-            'new_values': new_values
-        }
+        """
+        Queue an audit log; it is written in a batch by the AuditLogWriter after the current transaction commits
+        @param user_id:
+        @param action:
+        @param resource_type:
+        @param resource_id:
+        @param old_values:
+        @param new_values:
+        @return: None
+        """
+        AuditLogWriter.get_instance().write(
+            user_id=user_id,
+            action=action,
+            resource_type=resource_type,
+            resource_id=resource_id,
+            old_values=old_values,
+            new_values=new_values
+        )
 
-        service = CreateAuditLogsService()
-        service.execute_service(request=request, data=data)
-
-        return service.data
\ No newline at end of file
+    @staticmethod
+    def create_audit_logs(user_id, action, resource_type, entries):
+        """
+        Queue audit logs for many resources
+        @param user_id:
+        @param action:
+        @param resource_type:
+        @param entries: Iterable of (resource_id, new_values)
+        @return: Number of audit logs queued
+        """
+        audit_logs = [
+            {
+                "user_id": user_id,
+                "action": action,
+                "resource_type": resource_type,
+                "resource_id": resource_id,
+                "new_values": new_values
+            }
+            for resource_id, new_values in entries
+        ]
+        AuditLogWriter.get_instance().write_many(audit_logs)
+        return len(audit_logs)
@@ -36,6 +36,14 @@ class GenericConstants:
     BASELINE_CREATE_SUCCESSFUL_MESSAGE = "Baseline created successfully"
     BASELINE_UPDATE_SUCCESSFUL_MESSAGE = "Baseline updated successfully"
     BASELINE_DELETE_SUCCESSFUL_MESSAGE = "Baseline deleted successfully"
+    BASELINE_SCAN_NOT_RESUMABLE_MESSAGE = "Baseline scan is still running or already complete"
+    BASELINE_SCAN_RESUMED_MESSAGE = "Baseline scan resumed"
+    INVALID_HASH_ENGINE_MESSAGE = "Hash workers must be between 1 and 64 and hash executor must be thread or process"
+    INVALID_ROLLING_SLICES_MESSAGE = "Rolling slices must be between 1 and 1000"
+    INVALID_ALGORITHM_TYPE_MESSAGE = "Algorithm type must be one of: {}"
+    ALGORITHM_TYPE_LOCKED_MESSAGE = "Algorithm type of a baseline with files cannot be changed, create a new baseline instead"
+    INVALID_IO_BUDGET_MESSAGE = "I/O budgets must be non-negative integers, 0 for unlimited"
+    INVALID_BLOCK_HASH_THRESHOLD_MESSAGE = "Block hash threshold must be at least 64 MB, or 0 to disable block hashing"
 
     FILE_CHANGE_NOT_FOUND_MESSAGE = "File change not found"
     FILE_CHANGE_ID_REQUIRED_MESSAGE = "File change id is required"
@@ -53,8 +61,13 @@ class GenericConstants:
     MONITORING_SESSION_NOT_FOUND_MESSAGE = "Monitoring session not found"
     MONITORING_SESSION_CREATE_SUCCESSFUL_MESSAGE = "Monitoring session completed successfully"
     MONITORING_SESSION_CREATE_ERROR_MESSAGE = "Monitoring session create could not be completed"
+    MONITORING_SESSION_QUEUED_MESSAGE = "Monitoring session queued"
+    MONITORING_SESSION_CANCEL_SUCCESSFUL_MESSAGE = "Monitoring session cancelled"
+    MONITORING_SESSION_NOT_CANCELLABLE_MESSAGE = "Only queued or running monitoring sessions can be cancelled"
+    MONITORING_SESSION_ABANDONED_MESSAGE = "Monitoring session abandoned by its worker"
 
     FILE_PATTERN_REQUIRED_MESSAGE = "File pattern is required"
+    INVALID_FILE_PATTERN_MESSAGE = "Invalid regex in file pattern: {}"
 
     WHITELIST_RULE_ID_REQUIRED_MESSAGE = "Whitelist Rule id is required"
     WHITELIST_RULE_NOT_FOUND_MESSAGE = "Whitelist rule not found"
@@ -62,13 +75,41 @@ class GenericConstants:
     WHITELIST_RULE_UPDATE_SUCCESSFUL_MESSAGE = "Whitelist rule updated successfully"
     WHITELIST_RULE_DELETE_SUCCESSFUL_MESSAGE = "Whitelist rule deleted successfully"
 
+    SCHEDULE_ID_REQUIRED_MESSAGE = "Schedule id is required"
+    SCHEDULE_NOT_FOUND_MESSAGE = "Schedule not found"
+    CRON_EXPRESSION_REQUIRED_MESSAGE = "Cron expression is required"
+    INVALID_MONITOR_TYPE_MESSAGE = "Monitor type must be full, incremental, structural, quick or rolling"
+    SCHEDULE_CREATE_SUCCESSFUL_MESSAGE = "Schedule created successfully"
+    SCHEDULE_UPDATE_SUCCESSFUL_MESSAGE = "Schedule updated successfully"
+    SCHEDULE_DELETE_SUCCESSFUL_MESSAGE = "Schedule deleted successfully"
+
     SYNC_FILE_THRESHOLD = 5000
     CHUNK_SIZE = 8192
+    HASH_SMALL_FILE_SIZE = 256 * 1024
+    HASH_READ_BUFFER_SIZE = 1024 * 1024
+    # A mapped file truncated mid-hash raises SIGBUS; turn off where large files are truncated in place
+    HASH_USE_MMAP = True
+    HASH_MMAP_THRESHOLD = 32 * 1024 * 1024
+    HASH_MMAP_SLICE_SIZE = 8 * 1024 * 1024
+    DB_STREAM_CHUNK_SIZE = 5000
+
+    BASELINE_INSERT_BATCH_SIZE = 1000
+    BASELINE_SCAN_MAX_BUFFERED_FILES = 10000
+    BASELINE_SCAN_STALE_SECONDS = 300
+    SCAN_QUEUE_POLL_SECONDS = 0.5
+    SCAN_RECORD_FILE = "file"
+    SCAN_RECORD_ERROR = "error"
+    SCAN_RECORD_DONE = "done"
+    FILE_CHANGE_BATCH_SIZE = 500
+    DIRECTORY_FINGERPRINT_BATCH_SIZE = 500
+    # Whitelisted changes are stored with expected=True and no alert; True drops them entirely
+    WHITELIST_SUPPRESS_MATCHES = False
 
     STATUS_SCANNING = "scanning"
     STATUS_READY = "ready"
     STATUS_ERROR = "error"
     STATUS_ACTIVE = "active"
+    STATUS_INCOMPLETE = "incomplete"
 
     ACTION_CREATE = "create"
 
@@ -76,4 +117,103 @@ class GenericConstants:
     RESOURCE_TYPE_BASELINE_FILES = "Baseline Files"
 
     ALGORITHM_SHA256 = "sha256"
-    ALGORITHM_SHA512 = "sha512"
\ No newline at end of file
+    ALGORITHM_SHA512 = "sha512"
+    ALGORITHM_BLAKE2B = "blake2b"
+    ALGORITHM_BLAKE2S = "blake2s"
+    ALGORITHM_BLAKE3 = "blake3"
+    CHECKSUM_CRC32 = "crc32"
+    CHECKSUM_ADLER32 = "adler32"
+
+    HASH_EXECUTOR_THREAD = "thread"
+    HASH_EXECUTOR_PROCESS = "process"
+    DEFAULT_HASH_WORKERS = 4
+    MAX_HASH_WORKERS = 64
+    HASH_QUEUE_DEPTH_PER_WORKER = 4
+
+    SESSION_STATUS_QUEUED = "queued"
+    SESSION_STATUS_RUNNING = "running"
+    SESSION_STATUS_COMPLETED = "completed"
+    SESSION_STATUS_FAILED = "failed"
+    SESSION_STATUS_CANCELLED = "cancelled"
+
+    # Set JOB_RUNNER_IN_PROCESS to False when jobs are run by `manage.py run_monitoring_jobs` instead
+    JOB_RUNNER_IN_PROCESS = True
+    JOB_RUNNER_WORKERS = 2
+    JOB_POLL_SECONDS = 2.0
+    SESSION_PROGRESS_INTERVAL_SECONDS = 2.0
+    SESSION_PROGRESS_INTERVAL_FILES = 1000
+    # Checkpoints let a session interrupted by a dead worker resume where it stopped
+    SESSION_CHECKPOINT_INTERVAL_SECONDS = 30.0
+    SESSION_HEARTBEAT_SECONDS = 30.0
+    SESSION_STALE_SECONDS = 300
+    SESSION_MAX_ATTEMPTS = 3
+    SESSION_REAP_INTERVAL_SECONDS = 60.0
+
+    DASHBOARD_SUMMARY_CACHE_KEY = "monitoring:dashboard_summary"
+    DASHBOARD_SUMMARY_CACHE_SECONDS = 30
+
+    # Keyset pagination
+    PAGINATION_COUNT_LIMIT = 10000
+    INVALID_CURSOR_MESSAGE = "Invalid pagination cursor"
+
+    # Audit log writer; set AUDIT_LOG_ASYNC to False to write each entry before returning
+    AUDIT_LOG_ASYNC = True
+    AUDIT_LOG_QUEUE_SIZE = 10000
+    AUDIT_LOG_BATCH_SIZE = 500
+    AUDIT_LOG_FLUSH_SECONDS = 1.0
+    AUDIT_LOG_USER_CACHE_SIZE = 10000
+
+    # Inotify watcher (`manage.py watch_baselines`); WATCHER_MAX_WATCHES None leaves the limit to the kernel
+    WATCHER_DEBOUNCE_SECONDS = 2.0
+    WATCHER_MAX_DELAY_SECONDS = 30.0
+    WATCHER_REFRESH_SECONDS = 60.0
+    WATCHER_OVERFLOW_SCAN_SECONDS = 300.0
+    WATCHER_MAX_WATCHES = None
+    # Paths per check_files call when an overflow subtree is rescanned, bounding its memory
+    WATCHER_OVERFLOW_CHECK_SIZE = 5000
+
+    # Monitoring scheduler (`manage.py run_monitoring_scheduler`)
+    SCHEDULER_POLL_SECONDS = 15.0
+    SCHEDULER_DEFAULT_JITTER_SECONDS = 300
+    SCHEDULER_MAX_CONCURRENT_SESSIONS = 4
+    # Read budget shared by scheduled sessions, split evenly between the concurrent ones; 0 for unlimited
+    SCHEDULER_MAX_BYTES_PER_SECOND = 200 * 1024 * 1024
+
+    # Persistent hash cache shared across sessions and baselines; HASH_CACHE_PATH None keeps it in the
+    # project directory as hash_cache.sqlite3 (git-ignored, with its -wal and -shm files)
+    HASH_CACHE_ENABLED = True
+    HASH_CACHE_PATH = None
+    HASH_CACHE_MAX_ENTRIES = 5_000_000
+    HASH_CACHE_WRITE_BATCH_SIZE = 1000
+    # Fraction of cache hits a paranoid session reads anyway to check the cache
+    HASH_CACHE_PARANOID_SAMPLE = 0.01
+
+    # Rolling monitor type: a session content-verifies 1 of ROLLING_DEFAULT_SLICES slices, plus files whose stat moved
+    ROLLING_DEFAULT_SLICES = 7
+    ROLLING_MAX_SLICES = 1000
+
+    # Block hashing of files at least Baseline.block_hash_threshold bytes: fixed-size SHA-256 blocks hashed in parallel
+    BLOCK_HASH_SIZE = 8 * 1024 * 1024
+    BLOCK_HASH_READ_SIZE = 1024 * 1024
+    BLOCK_HASH_MIN_THRESHOLD = 64 * 1024 * 1024
+    # Incremental checks of a block-hashed file stop at the first changed block
+    BLOCK_HASH_EARLY_EXIT = True
+
+    # Checksum prefilter: files are screened with CHECKSUM_PREFILTER_ALGORITHM and only a mismatch gets the
+    # baseline's digest; a full session still computes every digest once CHECKSUM_VERIFY_INTERVAL_SECONDS passed
+    CHECKSUM_PREFILTER_ALGORITHM = "crc32"
+    CHECKSUM_VERIFY_INTERVAL_SECONDS = 7 * 24 * 3600
+
+    # I/O governor of baseline scans, sessions and the watcher. The global budgets, and the io_bytes_per_second and
+    # io_files_per_second of each baseline, are shared by every process on the host through files in IO_GOVERNOR_DIR
+    # (None for the system temp directory); 0 for unlimited
+    IO_GOVERNOR_DIR = None
+    IO_GLOBAL_BYTES_PER_SECOND = 0
+    IO_GLOBAL_FILES_PER_SECOND = 0
+    IO_BURST_SECONDS = 1.0
+    # Latency backoff: budgets are halved while read latency stays IO_BACKOFF_LATENCY_RATIO times the lowest seen
+    IO_LATENCY_UNIT_BYTES = 1024 * 1024
+    IO_BACKOFF_LATENCY_RATIO = 3.0
+    IO_BACKOFF_INTERVAL_SECONDS = 1.0
+    IO_BACKOFF_MIN_RATE_FACTOR = 0.1
+    IO_BACKOFF_RATE_STEP = 0.1
\ No newline at end of file
@@ -0,0 +1,103 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+
+
+class InvalidCursor(ValueError):
+    """Cursor token that cannot be decoded or belongs to another ordering"""
+
+
+class KeysetPaginator:
+    """
+        Cursor pagination over a queryset ordered by one sort column plus id.
+
+        A page is fetched with `WHERE (sort, id) < (last_sort, last_id)` (or `>` ascending)
+        instead of OFFSET, so every page costs the same on an indexed sort column. The
+        cursor is an opaque url-safe token holding the last row's sort value and id, and the
+        ordering it was issued for. Sort columns must be non-null.
+    """
+
+    def __init__(self, queryset, sort_by, sort_order, sort_fields):
+        """
+            @param queryset: Filtered queryset
+            @param sort_by: Sort column requested by the client
+            @param sort_order: "asc" or "desc"
+            @param sort_fields: Sort columns allowed for keyset pagination
+        """
+        if sort_by not in sort_fields:
+            raise InvalidCursor(f"Cursor pagination cannot sort by {sort_by}")
+
+        self.queryset = queryset
+        self.sort_by = sort_by
+        self.descending = sort_order == "desc"
+        self.field = queryset.model._meta.get_field(sort_by)
+
+    @staticmethod
+    def encode_cursor(payload):
+        return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+    def decode_cursor(self, cursor):
+        """
+            @param cursor: Token returned as next_cursor
+            @return: (sort value, id) of the last row of the previous page
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+            sort_by, descending = payload["s"], payload["d"]
+            value, last_id = self.field.to_python(payload["v"]), int(payload["id"])
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError, ValidationError):
+            raise InvalidCursor("Malformed cursor")
+
+        if sort_by != self.sort_by or descending != self.descending:
+            raise InvalidCursor("Cursor was issued for another sort order")
+        return value, last_id
+
+    def get_page(self, cursor, page_size):
+        """
+            @param cursor: Token from a previous page, or None for the first page
+            @param page_size:
+            @return: (rows, next_cursor); next_cursor is None on the last page
+        """
+        prefix = "-" if self.descending else ""
+        queryset = self.queryset.order_by(f"{prefix}{self.sort_by}", f"{prefix}id")
+
+        if cursor:
+            value, last_id = self.decode_cursor(cursor)
+            lookup = "lt" if self.descending else "gt"
+            # The redundant inclusive bound gives the planner an index range to seek to
+            queryset = queryset.filter(
+                Q(**{f"{self.sort_by}__{lookup}e": value}),
+                Q(**{f"{self.sort_by}__{lookup}": value}) | Q(**{self.sort_by: value, f"id__{lookup}": last_id})
+            )
+
+        rows = list(queryset[:page_size + 1])
+        if len(rows) <= page_size:
+            return rows, None
+
+        rows = rows[:page_size]
+        last = rows[-1]
+        next_cursor = self.encode_cursor({
+            "s": self.sort_by,
+            "d": self.descending,
+            "v": self.field.value_to_string(last),
+            "id": last.id
+        })
+        return rows, next_cursor
+
+    @staticmethod
+    def capped_count(queryset, limit=GenericConstants.PAGINATION_COUNT_LIMIT):
+        """
+            Count at most `limit` rows, so the count stops early on large tables
+            @param queryset:
+            @param limit:
+            @return: (count, is_approximate); approximate means "at least count"
+        """
+        count = queryset.order_by()[:limit + 1].count()
+        if count > limit:
+            return limit, True
+        return count, False
@@ -16,6 +16,7 @@ from accounts.services.update_users_service import UpdateUsersService
 from monitoring.services.alert_archive_create_service import AlertArchiveCreateService
 from monitoring.services.baseline_create_service import BaselineCreateService
 from monitoring.services.baseline_get_details_service import BaselineGetDetailsService
+from monitoring.services.baseline_scan_resume_service import BaselineScanResumeService
 from monitoring.services.file_changes_acknowledge_create_service import CreateFileChangesAcknowledgeService
 from monitoring.services.create_whitelist_rule_service import WhitelistRuleCreateService
 from monitoring.services.baseline_delete_service import BaselineDeleteService
@@ -32,8 +33,14 @@ from monitoring.services.whiltelist_rule_details_get_service import WhitelistRul
 from monitoring.services.whitelist_rules_get_service import WhitelistRulesGetService
 from monitoring.services.alert_mark_read_create_service import AlertMarkReadCreateService
 from monitoring.services.monitoring_session_create_service import MonitoringSessionCreateService
+from monitoring.services.monitoring_session_progress_get_service import MonitoringSessionProgressGetService
+from monitoring.services.monitoring_session_cancel_service import MonitoringSessionCancelService
 from monitoring.services.baseline_update_service import BaselineUpdateService
 from monitoring.services.whitelist_rule_update_service import WhitelistRuleUpdateService
+from monitoring.services.monitoring_schedules_get_service import MonitoringSchedulesGetService
+from monitoring.services.monitoring_schedule_create_service import MonitoringScheduleCreateService
+from monitoring.services.monitoring_schedule_update_service import MonitoringScheduleUpdateService
+from monitoring.services.monitoring_schedule_delete_service import MonitoringScheduleDeleteService
 
 
 class ViewServices:
@@ -63,6 +70,7 @@ class ViewServices:
             'update_baseline': self.UpdateBaseline,
             'delete_baseline': self.DeleteBaseline,
             'get_baseline_details': self.GetBaselineDetails,
+            'resume_baseline_scan': self.ResumeBaselineScan,
             'get_alerts': self.GetAlerts,
             'get_alert_details': self.GetAlertDetails,
             'mark_alert_read': self.MarkAlertRead,
@@ -73,11 +81,17 @@ class ViewServices:
             'get_monitoring_sessions': self.GetMonitoringSessions,
             'get_monitoring_session_details': self.GetMonitoringSessionDetails,
             'start_monitoring_session': self.StartMonitoringSession,
+            'get_monitoring_session_progress': self.GetMonitoringSessionProgress,
+            'cancel_monitoring_session': self.CancelMonitoringSession,
             'get_whitelist_rules': self.GetWhitelistRules,
             'create_whitelist_rule': self.CreateWhitelistRule,
             'update_whitelist_rule': self.UpdateWhitelistRule,
             'delete_whitelist_rule': self.DeleteWhitelistRule,
-            'get_whitelist_rule_details': self.GetWhitelistRuleDetails
+            'get_whitelist_rule_details': self.GetWhitelistRuleDetails,
+            'get_monitoring_schedules': self.GetMonitoringSchedules,
+            'create_monitoring_schedule': self.CreateMonitoringSchedule,
+            'update_monitoring_schedule': self.UpdateMonitoringSchedule,
+            'delete_monitoring_schedule': self.DeleteMonitoringSchedule
         }
         self.service_obj = self.service_config[service_name].get_instance()
 
@@ -186,6 +200,11 @@ class ViewServices:
         def get_instance():
             return BaselineGetDetailsService()
 
+    class ResumeBaselineScan:
+        @staticmethod
+        def get_instance():
+            return BaselineScanResumeService()
+
     class GetAlerts:
         @staticmethod
         def get_instance():
@@ -236,6 +255,16 @@ class ViewServices:
         def get_instance():
             return MonitoringSessionCreateService()
 
+    class GetMonitoringSessionProgress:
+        @staticmethod
+        def get_instance():
+            return MonitoringSessionProgressGetService()
+
+    class CancelMonitoringSession:
+        @staticmethod
+        def get_instance():
+            return MonitoringSessionCancelService()
+
     class GetWhitelistRules:
         @staticmethod
         def get_instance():
@@ -259,4 +288,24 @@ class ViewServices:
     class GetWhitelistRuleDetails:
         @staticmethod
         def get_instance():
-            return WhitelistRuleDetailsGetService()
\ No newline at end of file
+            return WhitelistRuleDetailsGetService()
+
+    class GetMonitoringSchedules:
+        @staticmethod
+        def get_instance():
+            return MonitoringSchedulesGetService()
+
+    class CreateMonitoringSchedule:
+        @staticmethod
+        def get_instance():
+            return MonitoringScheduleCreateService()
+
+    class UpdateMonitoringSchedule:
+        @staticmethod
+        def get_instance():
+            return MonitoringScheduleUpdateService()
+
+    class DeleteMonitoringSchedule:
+        @staticmethod
+        def get_instance():
+            return MonitoringScheduleDeleteService()
\ No newline at end of file
@@ -0,0 +1,98 @@
+import fnmatch
+import os
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from monitoring.services.service_helper.exclude_matcher import ExcludeMatcher
+
+
+def legacy_should_exclude(file_path, exclude_patterns):
+    """The per-file pattern loop ExcludeMatcher replaced, kept as the benchmark reference"""
+    if not exclude_patterns:
+        return False
+
+    file_name = os.path.basename(file_path)
+
+    for pattern in exclude_patterns:
+
+        if pattern.startswith("*"):
+            if file_name.endswith(pattern[1:]):
+                return True
+
+        elif pattern.endswith("*"):
+            if file_name.startswith(pattern[:-1]):
+                return True
+
+        elif pattern == file_name:
+            return True
+
+        elif "*" in pattern:
+            if fnmatch.fnmatch(file_name, pattern):
+                return True
+
+    return False
+
+
+class Command(BaseCommand):
+    help = "Benchmark the compiled exclude matcher against the legacy per-pattern loop"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--paths", type=int, default=200000, help="Number of synthetic paths")
+        parser.add_argument("--patterns", type=int, default=200, help="Number of exclude patterns")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        randomizer = random.Random(options["seed"])
+        patterns = self._create_patterns(options["patterns"])
+        paths = [
+            f"/srv/app/module_{randomizer.randrange(500)}/{self._random_name(randomizer)}"
+            for _ in range(options["paths"])
+        ]
+
+        started = time.perf_counter()
+        legacy_results = [legacy_should_exclude(path, patterns) for path in paths]
+        legacy_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        matcher = ExcludeMatcher.compile(patterns)
+        compiled_results = [matcher.matches(path) for path in paths]
+        compiled_elapsed = time.perf_counter() - started
+
+        mismatches = sum(1 for legacy, compiled in zip(legacy_results, compiled_results) if legacy != compiled)
+
+        self.stdout.write(f"{len(paths)} paths, {len(patterns)} patterns, {sum(compiled_results)} excluded")
+        self.stdout.write(f"{'legacy loop':<16}{legacy_elapsed:>10.3f}s{len(paths) / legacy_elapsed:>14.0f} paths/s")
+        self.stdout.write(f"{'compiled':<16}{compiled_elapsed:>10.3f}s{len(paths) / compiled_elapsed:>14.0f} paths/s")
+        self.stdout.write(f"speedup {legacy_elapsed / compiled_elapsed:.1f}x, mismatches {mismatches}")
+
+    @staticmethod
+    def _create_patterns(count):
+        """Mix of suffix, prefix, exact and glob patterns in the proportions seen in real baselines"""
+        patterns = []
+        for index in range(count):
+            kind = index % 4
+            if kind == 0:
+                patterns.append(f"*.ext{index}")
+            elif kind == 1:
+                patterns.append(f"cache{index}*")
+            elif kind == 2:
+                patterns.append(f"generated_{index}.json")
+            else:
+                patterns.append(f"build{index}_*.o.tmp")
+        return patterns
+
+    @staticmethod
+    def _random_name(randomizer):
+        kind = randomizer.randrange(5)
+        number = randomizer.randrange(400)
+        if kind == 0:
+            return f"file_{number}.ext{number}"
+        if kind == 1:
+            return f"cache{number}_data.bin"
+        if kind == 2:
+            return f"generated_{number}.json"
+        if kind == 3:
+            return f"build{number}_x.o.tmp"
+        return f"source_{number}.py"
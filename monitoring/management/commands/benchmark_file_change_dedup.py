@@ -0,0 +1,117 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from accounts.models import Users
+from monitoring.models import Baseline, FileChange
+from monitoring.services.service_helper.file_change_recorder import FileChangeRecorder
+
+
+class DedupOnlyRecorder(FileChangeRecorder):
+    """Alerts and audit logs are part of a real flush but not of the dedup cost being measured"""
+
+    def _create_alerts(self, new_changes, updated_changes):
+        return []
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark FileChange dedup-or-insert against a large change table: one lookup per change "
+        "against the chunked upsert of FileChangeRecorder. Runs in a transaction that is rolled back"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--existing", type=int, default=10_000_000, help="Change rows created before measuring")
+        parser.add_argument("--baselines", type=int, default=100, help="Baselines the existing rows are spread over")
+        parser.add_argument("--open-ratio", type=float, default=0.1, help="Fraction of existing rows unacknowledged")
+        parser.add_argument("--changes", type=int, default=20_000, help="Changes recorded per measured run")
+        parser.add_argument("--hit-ratio", type=float, default=0.5,
+                            help="Fraction of recorded changes that hit an open change")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        randomizer = random.Random(options["seed"])
+
+        with transaction.atomic():
+            user = Users.objects.create(email=f"fim-bench-{time.time_ns()}@example.invalid", password="!")
+            baselines = [
+                Baseline.objects.create(name=f"fim-bench-{index}", path=f"/bench/{index}", user=user)
+                for index in range(max(options["baselines"], 1))
+            ]
+
+            started = time.perf_counter()
+            open_paths = self._create_changes(baselines, options["existing"], options["open_ratio"], randomizer)
+            self.stdout.write(f"{options['existing']} existing changes in {time.perf_counter() - started:.1f}s")
+
+            baseline = baselines[0]
+            self.stdout.write(f"{'method':>10}{'changes':>10}{'seconds':>10}{'changes/s':>12}")
+            for method in ("lookup", "upsert"):
+                changes = self._workload(open_paths, options["changes"], options["hit_ratio"], method, randomizer)
+                started = time.perf_counter()
+                if method == "lookup":
+                    self._record_with_lookups(baseline, changes)
+                else:
+                    self._record_with_upserts(baseline, user, changes)
+                elapsed = time.perf_counter() - started
+                rate = len(changes) / elapsed if elapsed else 0
+                self.stdout.write(f"{method:>10}{len(changes):>10}{elapsed:>10.3f}{rate:>12.0f}")
+
+            transaction.set_rollback(True)
+
+    @staticmethod
+    def _create_changes(baselines, count, open_ratio, randomizer):
+        """Bulk insert synthetic changes; returns the open paths of the first baseline"""
+        open_paths = []
+        batch = []
+        for index in range(count):
+            baseline = baselines[index % len(baselines)]
+            file_path = f"{baseline.path}/dir_{index // 1000:05d}/file_{index:08d}"
+            acknowledged = randomizer.random() >= open_ratio
+            batch.append(FileChange(
+                baseline=baseline,
+                file_path=file_path,
+                change_type='modified',
+                severity='critical',
+                acknowledged=acknowledged,
+                dedup_key=None if acknowledged else FileChange.build_dedup_key(baseline.id, file_path, 'modified')
+            ))
+            if not acknowledged and baseline is baselines[0]:
+                open_paths.append(file_path)
+            if len(batch) >= 5000:
+                FileChange.objects.bulk_create(batch)
+                batch = []
+        FileChange.objects.bulk_create(batch)
+        return open_paths
+
+    @staticmethod
+    def _workload(open_paths, count, hit_ratio, method, randomizer):
+        """(file_path, severity) pairs: hits update an open change, misses are new paths"""
+        hits = randomizer.sample(open_paths, min(len(open_paths), int(count * hit_ratio)))
+        misses = [f"/bench/new/{method}/file_{index:08d}" for index in range(count - len(hits))]
+        changes = [(file_path, 'high') for file_path in hits + misses]
+        randomizer.shuffle(changes)
+        return changes
+
+    @staticmethod
+    def _record_with_lookups(baseline, changes):
+        """The old path: one filter().first() per change, then an update or an insert"""
+        for file_path, severity in changes:
+            change = FileChange.objects.filter(
+                baseline=baseline, file_path=file_path, change_type='modified', acknowledged=False
+            ).first()
+            if change is not None:
+                change.severity = severity
+                change.save(update_fields=['severity', 'updated_at'])
+            else:
+                FileChange.objects.create(
+                    baseline=baseline, file_path=file_path, change_type='modified', severity=severity
+                )
+
+    @staticmethod
+    def _record_with_upserts(baseline, user, changes):
+        recorder = DedupOnlyRecorder(baseline, user.id)
+        for file_path, severity in changes:
+            recorder.record(file_path, None, 'modified', None, severity)
+        recorder.flush()
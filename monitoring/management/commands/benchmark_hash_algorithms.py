@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.services.service_helper.hash_algorithms import HashAlgorithms
+from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark MB/s of every registered hash algorithm and checksum: digesting an in-memory buffer, "
+        "and reading a file through calculate_hash (page cache warm after the first run)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--size", type=int, default=256, help="MiB hashed per run")
+        parser.add_argument("--repeat", type=int, default=3, help="Best of N runs")
+        parser.add_argument("--algorithms", default="", help="Comma separated names, every registered one when empty")
+
+    def handle(self, *args, **options):
+        size = max(options["size"], 1) * 1024 * 1024
+        algorithms = [name.strip() for name in options["algorithms"].split(",") if name.strip()] or (
+            HashAlgorithms.digests() + HashAlgorithms.checksums()
+        )
+        chunk = os.urandom(GenericConstants.HASH_READ_BUFFER_SIZE)
+        root = tempfile.mkdtemp(prefix="fim-algorithm-bench-")
+        file_path = os.path.join(root, "payload.bin")
+
+        try:
+            with open(file_path, "wb") as f:
+                for _ in range(size // len(chunk)):
+                    f.write(chunk)
+
+            self.stdout.write(f"{'algorithm':>10}{'memory MB/s':>14}{'file MB/s':>12}{'vs sha256':>11}")
+            rates = {}
+            for algorithm in algorithms:
+                memory = self._best_of(options["repeat"], lambda: self._digest_buffer(algorithm, chunk, size))
+                from_file = self._best_of(options["repeat"], lambda: MonitoringServiceHelper.calculate_hash(
+                    file_path, algorithm
+                ))
+                rates[algorithm] = size / memory / 1e6
+                baseline_rate = rates.get(GenericConstants.ALGORITHM_SHA256)
+                relative = f"{rates[algorithm] / baseline_rate:>10.2f}x" if baseline_rate else f"{'-':>11}"
+                self.stdout.write(f"{algorithm:>10}{rates[algorithm]:>14.1f}{size / from_file / 1e6:>12.1f}{relative}")
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    @staticmethod
+    def _digest_buffer(algorithm, chunk, size):
+        hash_obj = HashAlgorithms.new(algorithm)
+        for _ in range(size // len(chunk)):
+            hash_obj.update(chunk)
+        return hash_obj.hexdigest()
+
+    @staticmethod
+    def _best_of(repeat, run):
+        best = None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
@@ -0,0 +1,103 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+
+
+class Command(BaseCommand):
+    help = "Benchmark the adaptive hash reader against fixed 8 KiB chunk reads across file-size buckets"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes", default="4K,64K,1M,16M,256M",
+            help="Comma separated file sizes (K/M/G suffixes)"
+        )
+        parser.add_argument("--total", default="512M", help="Approximate bytes hashed per bucket")
+        parser.add_argument("--algorithm", default=GenericConstants.ALGORITHM_SHA256)
+        parser.add_argument("--repeat", type=int, default=3, help="Best of N runs")
+
+    def handle(self, *args, **options):
+        sizes = [self._parse_size(size) for size in options["sizes"].split(",") if size.strip()]
+        total = self._parse_size(options["total"])
+        algorithm = options["algorithm"]
+        root = tempfile.mkdtemp(prefix="fim-reader-bench-")
+
+        try:
+            self.stdout.write(f"{'size':>10}{'files':>8}{'chunked MB/s':>15}{'adaptive MB/s':>15}{'speedup':>9}")
+            for size in sizes:
+                file_paths = self._create_files(root, size, max(1, total // size))
+                volume = size * len(file_paths)
+
+                chunked = self._best_of(options["repeat"], lambda: [
+                    self._chunked_hash(file_path, algorithm) for file_path in file_paths
+                ])
+                adaptive = self._best_of(options["repeat"], lambda: [
+                    MonitoringServiceHelper.calculate_hash(file_path, algorithm) for file_path in file_paths
+                ])
+
+                chunked_rate = volume / chunked / 1e6
+                adaptive_rate = volume / adaptive / 1e6
+                self.stdout.write(
+                    f"{self._format_size(size):>10}{len(file_paths):>8}"
+                    f"{chunked_rate:>15.1f}{adaptive_rate:>15.1f}{adaptive_rate / chunked_rate:>8.2f}x"
+                )
+
+                for file_path in file_paths:
+                    os.remove(file_path)
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    @staticmethod
+    def _chunked_hash(file_path, algorithm):
+        """The previous calculate_hash loop: fixed CHUNK_SIZE reads"""
+        hash_obj = hashlib.new(algorithm)
+        with open(file_path, 'rb') as f:
+            while chunk := f.read(GenericConstants.CHUNK_SIZE):
+                hash_obj.update(chunk)
+        return hash_obj.hexdigest()
+
+    @staticmethod
+    def _best_of(repeat, run):
+        best = None
+        for _ in range(max(repeat, 1)):
+            started = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    @staticmethod
+    def _create_files(root, size, count):
+        payload = os.urandom(min(size, 1024 * 1024))
+        file_paths = []
+        for index in range(count):
+            file_path = os.path.join(root, f"{size}_{index:06d}.bin")
+            with open(file_path, "wb") as f:
+                written = 0
+                while written < size:
+                    piece = payload[:size - written]
+                    f.write(piece)
+                    written += len(piece)
+            file_paths.append(file_path)
+        return file_paths
+
+    @staticmethod
+    def _parse_size(value):
+        value = value.strip().upper()
+        multipliers = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+        if value and value[-1] in multipliers:
+            return int(float(value[:-1]) * multipliers[value[-1]])
+        return int(value)
+
+    @staticmethod
+    def _format_size(size):
+        for unit, multiplier in (("G", 1024 ** 3), ("M", 1024 ** 2), ("K", 1024)):
+            if size >= multiplier and size % multiplier == 0:
+                return f"{size // multiplier}{unit}"
+        return str(size)
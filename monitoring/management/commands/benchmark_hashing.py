@@ -0,0 +1,67 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.services.service_helper.hashing_engine import HashingEngine
+from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+
+
+class Command(BaseCommand):
+    help = "Benchmark the hashing engine (files/sec vs worker count) on a synthetic tree"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--files", type=int, default=2000, help="Number of synthetic files")
+        parser.add_argument("--file-size", type=int, default=64 * 1024, help="Size of each file in bytes")
+        parser.add_argument("--dirs", type=int, default=20, help="Number of directories to spread files over")
+        parser.add_argument("--workers", default="1,2,4,8", help="Comma separated worker counts")
+        parser.add_argument("--executor", default="both", choices=["thread", "process", "both"])
+        parser.add_argument("--algorithm", default=GenericConstants.ALGORITHM_SHA256)
+        parser.add_argument("--path", help="Hash an existing tree instead of generating one")
+
+    def handle(self, *args, **options):
+        root = options["path"] or self._create_tree(options["files"], options["file_size"], options["dirs"])
+        try:
+            files = [
+                (os.path.join(dir_path, file_name), None)
+                for dir_path, _, file_names in os.walk(root)
+                for file_name in file_names
+            ]
+            executors = (
+                [GenericConstants.HASH_EXECUTOR_THREAD, GenericConstants.HASH_EXECUTOR_PROCESS]
+                if options["executor"] == "both" else [options["executor"]]
+            )
+            worker_counts = [int(w) for w in options["workers"].split(",") if w.strip()]
+
+            self.stdout.write(f"{len(files)} files, algorithm={options['algorithm']}")
+            self.stdout.write(f"{'executor':<10}{'workers':>8}{'seconds':>10}{'files/sec':>12}")
+
+            for executor_type in executors:
+                for workers in worker_counts:
+                    engine = HashingEngine(
+                        MonitoringServiceHelper.calculate_hashes, workers=workers, executor_type=executor_type
+                    )
+                    started = time.perf_counter()
+                    hashed = sum(1 for _ in engine.hash_files(files, (options["algorithm"],)))
+                    elapsed = time.perf_counter() - started
+                    self.stdout.write(
+                        f"{executor_type:<10}{workers:>8}{elapsed:>10.3f}{hashed / elapsed if elapsed else 0:>12.1f}"
+                    )
+        finally:
+            if not options["path"]:
+                shutil.rmtree(root, ignore_errors=True)
+
+    @staticmethod
+    def _create_tree(file_count, file_size, dir_count):
+        """Create a synthetic tree of random files"""
+        root = tempfile.mkdtemp(prefix="fim-bench-")
+        payload = os.urandom(file_size)
+        for index in range(file_count):
+            dir_path = os.path.join(root, f"dir_{index % max(dir_count, 1):04d}")
+            os.makedirs(dir_path, exist_ok=True)
+            with open(os.path.join(dir_path, f"file_{index:07d}.bin"), "wb") as f:
+                f.write(payload)
+        return root
@@ -0,0 +1,77 @@
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from monitoring.services.monitoring_session_create_service import MonitoringSessionCreateService
+from monitoring.services.service_helper.incremental_directory_walker import IncrementalDirectoryWalker
+
+
+class Command(BaseCommand):
+    help = "Benchmark structural (directory-fingerprint) walks against full walks as churn grows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dirs", type=int, default=1000, help="Number of leaf directories")
+        parser.add_argument("--files-per-dir", type=int, default=50, help="Files in each leaf directory")
+        parser.add_argument("--churn", default="0,0.001,0.01,0.1,1",
+                            help="Comma separated fractions of directories changed before each run")
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        root = self._create_tree(options["dirs"], options["files_per_dir"])
+        try:
+            helper = MonitoringSessionCreateService()
+            leaf_dirs = sorted(
+                dir_path for dir_path, dir_names, _ in os.walk(root) if not dir_names and dir_path != root
+            )
+            randomizer = random.Random(options["seed"])
+
+            # The first structural walk has no fingerprints and visits everything
+            walker = IncrementalDirectoryWalker(helper, root, [], {})
+            for _ in walker.walk():
+                pass
+            walker.apply_updates()
+
+            total_files = options["dirs"] * options["files_per_dir"]
+            self.stdout.write(f"{total_files} files in {len(leaf_dirs)} directories")
+            self.stdout.write(
+                f"{'churn':>8}{'dirs':>8}{'full s':>10}{'full files':>12}{'incr s':>10}{'incr files':>12}{'speedup':>10}"
+            )
+
+            for run, churn in enumerate(float(c) for c in options["churn"].split(",") if c.strip()):
+                changed_dirs = randomizer.sample(leaf_dirs, min(len(leaf_dirs), round(len(leaf_dirs) * churn)))
+                for dir_path in changed_dirs:
+                    with open(os.path.join(dir_path, f"added_{run}.bin"), "wb") as f:
+                        f.write(b"churn")
+
+                started = time.perf_counter()
+                full_files = sum(1 for _ in helper.walk_files(root, []))
+                full_elapsed = time.perf_counter() - started
+
+                started = time.perf_counter()
+                incremental_files = sum(1 for _ in walker.walk())
+                incremental_elapsed = time.perf_counter() - started
+                walker.apply_updates()
+
+                speedup = full_elapsed / incremental_elapsed if incremental_elapsed else 0
+                self.stdout.write(
+                    f"{churn:>8}{len(changed_dirs):>8}{full_elapsed:>10.3f}{full_files:>12}"
+                    f"{incremental_elapsed:>10.3f}{incremental_files:>12}{speedup:>9.1f}x"
+                )
+        finally:
+            shutil.rmtree(root, ignore_errors=True)
+
+    @staticmethod
+    def _create_tree(dir_count, files_per_dir):
+        """Create a two-level synthetic tree of small files"""
+        root = tempfile.mkdtemp(prefix="fim-bench-")
+        for dir_index in range(dir_count):
+            dir_path = os.path.join(root, f"group_{dir_index // 50:04d}", f"dir_{dir_index:05d}")
+            os.makedirs(dir_path)
+            for file_index in range(files_per_dir):
+                with open(os.path.join(dir_path, f"file_{file_index:05d}.txt"), "wb") as f:
+                    f.write(b"x")
+        return root
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from monitoring.services.dashboard_summary_get_service import DashboardSummaryGetService
+from monitoring.services.service_helper.monitoring_counters import MonitoringCounters
+
+
+class Command(BaseCommand):
+    help = "Recompute the file change and alert counters from the tables to repair drift"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--baseline-id", type=int, default=None,
+                            help="Rebuild the counters of one baseline only")
+
+    def handle(self, *args, **options):
+        rows = MonitoringCounters.rebuild(baseline_id=options["baseline_id"])
+        DashboardSummaryGetService.invalidate_cache()
+        self.stdout.write(f"Rebuilt {rows} counter rows")
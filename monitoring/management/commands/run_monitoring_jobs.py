@@ -0,0 +1,24 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.services.service_helper.monitoring_job_runner import MonitoringJobRunner
+
+
+class Command(BaseCommand):
+    help = "Run queued monitoring sessions from the job table with a pool of workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=GenericConstants.JOB_RUNNER_WORKERS,
+                            help="Number of sessions run concurrently")
+        parser.add_argument("--poll-seconds", type=float, default=GenericConstants.JOB_POLL_SECONDS,
+                            help="Idle wait between queue polls")
+
+    def handle(self, *args, **options):
+        # Stop like Ctrl-C, so queued audit logs are flushed at exit
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+        runner = MonitoringJobRunner(workers=options["workers"], poll_seconds=options["poll_seconds"])
+        self.stdout.write(f"Running monitoring jobs as {runner.worker_name} with {runner.workers} workers")
+        runner.run_forever()
@@ -0,0 +1,34 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.services.service_helper.monitoring_scheduler import MonitoringScheduler
+
+
+class Command(BaseCommand):
+    help = "Queue monitoring sessions for due schedules, spreading and capping the load"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-concurrent", type=int, default=GenericConstants.SCHEDULER_MAX_CONCURRENT_SESSIONS,
+                            help="Monitoring sessions queued or running at once")
+        parser.add_argument("--max-bytes-per-second", type=int,
+                            default=GenericConstants.SCHEDULER_MAX_BYTES_PER_SECOND,
+                            help="Read budget shared by scheduled sessions, 0 for unlimited")
+        parser.add_argument("--poll-seconds", type=float, default=GenericConstants.SCHEDULER_POLL_SECONDS,
+                            help="Wait between two looks at the schedules")
+
+    def handle(self, *args, **options):
+        # Stop like Ctrl-C, so queued audit logs are flushed at exit
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+        # Queued sessions are run by `run_monitoring_jobs` or the web process, not by the scheduler
+        GenericConstants.JOB_RUNNER_IN_PROCESS = False
+
+        scheduler = MonitoringScheduler(
+            max_concurrent=options["max_concurrent"],
+            max_bytes_per_second=options["max_bytes_per_second"],
+            poll_seconds=options["poll_seconds"]
+        )
+
+        self.stdout.write(f"Running monitoring schedules with at most {scheduler.max_concurrent} concurrent sessions")
+        scheduler.run_forever()
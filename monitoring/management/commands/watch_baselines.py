@@ -0,0 +1,34 @@
+import signal
+
+from django.core.management.base import BaseCommand
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.services.service_helper.baseline_watcher import BaselineWatcher
+
+
+class Command(BaseCommand):
+    help = "Detect file changes in real time with inotify watches on every monitored baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--monitor-type", choices=["full", "incremental"], default="full",
+                            help="full hashes every touched file, incremental only those whose size or mtime moved")
+        parser.add_argument("--debounce-seconds", type=float, default=GenericConstants.WATCHER_DEBOUNCE_SECONDS,
+                            help="Quiet time before a touched file is checked")
+        parser.add_argument("--max-watches", type=int, default=GenericConstants.WATCHER_MAX_WATCHES,
+                            help="Watches to hold at most; deeper directories are scanned periodically")
+
+    def handle(self, *args, **options):
+        # Stop like Ctrl-C, so pending paths are checked and queued audit logs are flushed at exit
+        signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+        watcher = BaselineWatcher(
+            monitor_type=options["monitor_type"],
+            debounce_seconds=options["debounce_seconds"],
+            max_watches=options["max_watches"]
+        )
+        watcher.start()
+        self.stdout.write(
+            f"Watching {watcher.watch_count} directories, "
+            f"{len(watcher.overflow_roots)} subtrees scanned every {GenericConstants.WATCHER_OVERFLOW_SCAN_SECONDS}s"
+        )
+        watcher.run_forever()
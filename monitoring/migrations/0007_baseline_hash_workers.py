@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0006_alert_alert_channels_alert_metadata'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseline',
+            name='hash_executor',
+            field=models.CharField(choices=[('thread', 'Thread Pool'), ('process', 'Process Pool')], default='thread', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='baseline',
+            name='hash_workers',
+            field=models.PositiveSmallIntegerField(default=4),
+        ),
+        migrations.AlterField(
+            model_name='filechange',
+            name='baseline',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='monitoring.baseline'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0007_baseline_hash_workers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseline',
+            name='scan_progress',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
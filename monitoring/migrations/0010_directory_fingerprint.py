@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:38
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0009_monitoring_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DirectoryFingerprint',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('dir_path', models.CharField(max_length=1024)),
+                ('mtime_ns', models.BigIntegerField()),
+                ('entry_count', models.PositiveIntegerField()),
+                ('fingerprint', models.CharField(max_length=32)),
+                ('child_dirs', models.JSONField(blank=True, default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('baseline', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='directory_fingerprints', to='monitoring.baseline')),
+            ],
+            options={
+                'ordering': ['dir_path'],
+                'unique_together': {('baseline', 'dir_path')},
+            },
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:46
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, F
+from django.db.models.functions import TruncDate
+
+
+def backfill_counters(apps, schema_editor):
+    # Frozen copy of the counter aggregation as of this migration, over historical models
+    file_change_model = apps.get_model('monitoring', 'FileChange')
+    alert_model = apps.get_model('monitoring', 'Alert')
+    counter_model = apps.get_model('monitoring', 'MonitoringCounter')
+    counts = defaultdict(int)
+
+    change_rows = file_change_model.objects.order_by().values(
+        'baseline_id', 'severity', 'acknowledged', day=TruncDate('detected_at')
+    ).annotate(total=Count('id'))
+    for row in change_rows:
+        metric = 'file_changes.acknowledged' if row['acknowledged'] else 'file_changes.open'
+        key = (metric, row['baseline_id'], row['severity'])
+        counts[key + (row['day'],)] += row['total']
+        counts[key + (None,)] += row['total']
+
+    alert_rows = alert_model.objects.order_by().values(
+        'severity', 'read', 'is_archived',
+        change_baseline_id=F('file_change__baseline_id'), day=TruncDate('created_at')
+    ).annotate(total=Count('id'))
+    for row in alert_rows:
+        metric = f"alerts.{'read' if row['read'] else 'unread'}.{'archived' if row['is_archived'] else 'inbox'}"
+        key = (metric, row['change_baseline_id'], row['severity'])
+        counts[key + (row['day'],)] += row['total']
+        counts[key + (None,)] += row['total']
+
+    counter_model.objects.bulk_create(
+        [
+            counter_model(metric=metric, baseline_id=baseline_id, severity=severity, day=day, count=count)
+            for (metric, baseline_id, severity, day), count in counts.items()
+        ],
+        batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0010_directory_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonitoringCounter',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('metric', models.CharField(max_length=50)),
+                ('severity', models.CharField(max_length=20)),
+                ('day', models.DateField(blank=True, null=True)),
+                ('count', models.BigIntegerField(default=0)),
+                ('baseline', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='counters', to='monitoring.baseline')),
+            ],
+            options={
+                'ordering': ['metric', 'day'],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('day__isnull', False)), fields=('metric', 'baseline', 'severity', 'day'), name='monitoring_counter_daily_unique'), models.UniqueConstraint(condition=models.Q(('day__isnull', True)), fields=('metric', 'baseline', 'severity'), name='monitoring_counter_total_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
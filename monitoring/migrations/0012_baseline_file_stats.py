@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:50
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_baseline_stats(apps, schema_editor):
+    Baseline = apps.get_model('monitoring', 'Baseline')
+    BaselineFile = apps.get_model('monitoring', 'BaselineFile')
+    MonitoringSession = apps.get_model('monitoring', 'MonitoringSession')
+
+    file_stats = BaselineFile.objects.order_by().values('baseline_id').annotate(
+        files=Count('id'), bytes=Sum('file_size')
+    )
+    for row in file_stats:
+        Baseline.objects.filter(id=row['baseline_id']).update(
+            total_files=row['files'], total_bytes=row['bytes'] or 0
+        )
+
+    for baseline in Baseline.objects.all():
+        session = MonitoringSession.objects.filter(
+            baseline_id=baseline.id, end_time__isnull=False
+        ).order_by('-end_time').first()
+        if session is not None:
+            Baseline.objects.filter(id=baseline.id).update(
+                last_scan_at=session.end_time,
+                last_scan_status=session.status,
+                last_scan_files_changed=session.files_changed
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0011_monitoring_counter'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseline',
+            name='last_scan_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='baseline',
+            name='last_scan_files_changed',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='baseline',
+            name='last_scan_status',
+            field=models.CharField(blank=True, max_length=20, null=True),
+        ),
+        migrations.AddField(
+            model_name='baseline',
+            name='total_bytes',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='baseline',
+            name='total_files',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_baseline_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 08:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_audit_logs_created_at_index'),
+        ('monitoring', '0012_baseline_file_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonitoringSchedule',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('monitor_type', models.CharField(choices=[('full', 'Full'), ('incremental', 'Incremental'), ('quick', 'Quick')], default='incremental', max_length=20)),
+                ('cron_expression', models.CharField(help_text='minute hour day-of-month month day-of-week', max_length=100)),
+                ('jitter_seconds', models.PositiveIntegerField(default=300)),
+                ('enabled', models.BooleanField(default=True)),
+                ('next_run_at', models.DateTimeField(blank=True, null=True)),
+                ('last_run_at', models.DateTimeField(blank=True, null=True)),
+                ('skipped_runs', models.PositiveIntegerField(default=0)),
+                ('last_skipped_at', models.DateTimeField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('baseline', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedules', to='monitoring.baseline')),
+                ('last_session', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='monitoring.monitoringsession')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.PROTECT, to='accounts.users')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['enabled', 'next_run_at'], name='monitoring__enabled_be0a9a_idx')],
+            },
+        ),
+    ]
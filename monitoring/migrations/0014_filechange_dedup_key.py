@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:07
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def build_dedup_key(baseline_id, file_path, change_type):
+    # Frozen copy of FileChange.build_dedup_key as of this migration
+    return hashlib.blake2b(
+        f"{baseline_id}\0{change_type}\0{file_path}".encode("utf-8", "surrogateescape"), digest_size=16
+    ).hexdigest()
+
+
+def backfill_dedup_keys(apps, schema_editor):
+    # Only the newest of duplicate open changes gets the key; the older ones stay open without one
+    file_change_model = apps.get_model('monitoring', 'FileChange')
+    open_changes = file_change_model.objects.filter(acknowledged=False).order_by(
+        'baseline_id', 'file_path', 'change_type', '-id'
+    ).only('id', 'baseline_id', 'file_path', 'change_type')
+
+    batch = []
+    previous = None
+    for change in open_changes.iterator(chunk_size=2000):
+        group = (change.baseline_id, change.file_path, change.change_type)
+        if group == previous:
+            continue
+        previous = group
+        change.dedup_key = build_dedup_key(*group)
+        batch.append(change)
+        if len(batch) >= 2000:
+            file_change_model.objects.bulk_update(batch, ['dedup_key'])
+            batch = []
+    file_change_model.objects.bulk_update(batch, ['dedup_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_audit_logs_created_at_index'),
+        ('monitoring', '0013_monitoring_schedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='filechange',
+            name='dedup_key',
+            field=models.CharField(blank=True, max_length=32, null=True, unique=True),
+        ),
+        migrations.AddIndex(
+            model_name='filechange',
+            index=models.Index(condition=models.Q(('acknowledged', False)), fields=['baseline', 'file_path', 'change_type'], name='filechange_open_lookup_idx'),
+        ),
+        migrations.RunPython(backfill_dedup_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0014_filechange_dedup_key'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseline',
+            name='rolling_coverage',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='baseline',
+            name='rolling_slices',
+            field=models.PositiveSmallIntegerField(default=7),
+        ),
+        migrations.AlterField(
+            model_name='monitoringschedule',
+            name='monitor_type',
+            field=models.CharField(choices=[('full', 'Full'), ('incremental', 'Incremental'), ('quick', 'Quick'), ('rolling', 'Rolling')], default='incremental', max_length=20),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0015_baseline_rolling_coverage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseline',
+            name='block_hash_threshold',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='baselinefile',
+            name='block_hashes',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='baselinefile',
+            name='block_root',
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+        migrations.AddField(
+            model_name='baselinefile',
+            name='block_size',
+            field=models.IntegerField(blank=True, null=True),
+        ),
+    ]
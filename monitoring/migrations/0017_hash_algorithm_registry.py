@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0016_block_hashes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseline',
+            name='checksum_prefilter',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddField(
+            model_name='baseline',
+            name='checksum_verified_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='baselinefile',
+            name='checksum',
+            field=models.CharField(blank=True, max_length=16, null=True),
+        ),
+        migrations.AddField(
+            model_name='baselinefile',
+            name='content_hash',
+            field=models.CharField(blank=True, max_length=128, null=True),
+        ),
+        migrations.AlterField(
+            model_name='baseline',
+            name='algorithm_type',
+            field=models.CharField(choices=[('sha256', 'SHA256'), ('sha512', 'SHA512'), ('blake2b', 'BLAKE2b'), ('blake2s', 'BLAKE2s'), ('blake3', 'BLAKE3')], default='sha256', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='baselinefile',
+            name='sha256',
+            field=models.CharField(blank=True, db_index=True, max_length=64, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0017_hash_algorithm_registry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='baseline',
+            name='io_bytes_per_second',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='baseline',
+            name='io_files_per_second',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
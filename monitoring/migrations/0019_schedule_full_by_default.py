@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0018_baseline_io_budgets'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='monitoringschedule',
+            name='monitor_type',
+            field=models.CharField(choices=[('full', 'Full'), ('incremental', 'Incremental'), ('quick', 'Quick'), ('rolling', 'Rolling')], default='full', max_length=20),
+        ),
+    ]
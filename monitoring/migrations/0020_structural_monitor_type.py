@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0019_schedule_full_by_default'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='monitoringschedule',
+            name='monitor_type',
+            field=models.CharField(choices=[('full', 'Full'), ('incremental', 'Incremental'), ('structural', 'Structural'), ('quick', 'Quick'), ('rolling', 'Rolling')], default='full', max_length=20),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 09:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0020_structural_monitor_type'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='monitoringsession',
+            name='attempt',
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -1,8 +1,11 @@
+import hashlib
+
 from django.db import models
 from django.db.models import JSONField
 from django.utils import timezone
 
 from accounts.models import Users
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
 
 
 class Baseline(models.Model):
@@ -10,6 +13,14 @@ class Baseline(models.Model):
     HASH_ALGORITHM_CHOICES = [
         ('sha256', 'SHA256'),
         ('sha512', 'SHA512'),
+        ('blake2b', 'BLAKE2b'),
+        ('blake2s', 'BLAKE2s'),
+        ('blake3', 'BLAKE3'),
+    ]
+
+    HASH_EXECUTOR_CHOICES = [
+        ('thread', 'Thread Pool'),
+        ('process', 'Process Pool'),
     ]
 
     id = models.BigAutoField(primary_key=True)
@@ -30,6 +41,37 @@ class Baseline(models.Model):
     exclude_patterns = JSONField(default=list, blank=True)
     algorithm_type = models.CharField(max_length=20, choices=HASH_ALGORITHM_CHOICES, default='sha256')
 
+    # Hashing engine
+    hash_workers = models.PositiveSmallIntegerField(default=GenericConstants.DEFAULT_HASH_WORKERS)
+    hash_executor = models.CharField(max_length=20, choices=HASH_EXECUTOR_CHOICES, default='thread')
+
+    # Baseline scan progress: files_processed, bytes_processed, last_file_path, updated_at
+    scan_progress = JSONField(default=dict, blank=True)
+
+    # Maintained by baseline scans and monitoring sessions, so listings never count baseline files
+    total_files = models.BigIntegerField(default=0)
+    total_bytes = models.BigIntegerField(default=0)
+    last_scan_at = models.DateTimeField(null=True, blank=True)
+    last_scan_status = models.CharField(max_length=20, blank=True, null=True)
+    last_scan_files_changed = models.PositiveIntegerField(default=0)
+
+    # Rolling sessions content-verify one of rolling_slices path-hash slices each; rolling_coverage tracks the
+    # cycle: slices, verified, next_slice, cycle_started_at, cycles_completed, last_cycle_completed_at, verified_since
+    rolling_slices = models.PositiveSmallIntegerField(default=GenericConstants.ROLLING_DEFAULT_SLICES)
+    rolling_coverage = JSONField(default=dict, blank=True)
+
+    # Files of at least block_hash_threshold bytes also get per-block digests; null disables block hashing
+    block_hash_threshold = models.BigIntegerField(null=True, blank=True)
+
+    # Screen files with a CHECKSUM_PREFILTER_ALGORITHM checksum and digest only mismatches; a full session
+    # computes every digest again once CHECKSUM_VERIFY_INTERVAL_SECONDS have passed since checksum_verified_at
+    checksum_prefilter = models.BooleanField(default=False)
+    checksum_verified_at = models.DateTimeField(null=True, blank=True)
+
+    # Read budgets shared by every scan of this baseline across processes, on top of the global ones; 0 for unlimited
+    io_bytes_per_second = models.PositiveBigIntegerField(default=0)
+    io_files_per_second = models.PositiveIntegerField(default=0)
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -43,7 +85,7 @@ class Baseline(models.Model):
 
     def file_count(self):
         """Get total files in this baseline"""
-        return self.baseline_files.count()
+        return self.total_files
 
 
 class BaselineFile(models.Model):
@@ -53,9 +95,18 @@ class BaselineFile(models.Model):
     file_path = models.CharField(max_length=1024)
     file_name = models.CharField(max_length=255, db_index=True)
 
-    # Hashes
-    sha256 = models.CharField(max_length=64, db_index=True)
+    # Hashes: sha256 for sha256 and sha512 baselines, sha512 for sha512 ones, content_hash for other algorithms
+    sha256 = models.CharField(max_length=64, db_index=True, blank=True, null=True)
     sha512 = models.CharField(max_length=128, blank=True, null=True)
+    content_hash = models.CharField(max_length=128, blank=True, null=True)
+    # CHECKSUM_PREFILTER_ALGORITHM checksum, kept for baselines with checksum_prefilter
+    checksum = models.CharField(max_length=16, blank=True, null=True)
+
+    # Block digests of large files: concatenated hex SHA-256 of each block_size block, and the SHA-256 of
+    # the concatenated raw block digests as block_root. Null when the file was not block hashed
+    block_size = models.IntegerField(blank=True, null=True)
+    block_hashes = models.TextField(blank=True, null=True)
+    block_root = models.CharField(max_length=64, blank=True, null=True)
 
     # File metadata
     file_size = models.BigIntegerField()
@@ -88,6 +139,27 @@ class BaselineFile(models.Model):
         return f"{self.file_path} ({self.baseline.name})"
 
 
+class DirectoryFingerprint(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    baseline = models.ForeignKey(Baseline, on_delete=models.CASCADE, related_name='directory_fingerprints')
+
+    dir_path = models.CharField(max_length=1024)
+    mtime_ns = models.BigIntegerField()
+    entry_count = models.PositiveIntegerField()
+    # Rolling hash of (name, inode, type) over the directory's entries
+    fingerprint = models.CharField(max_length=32)
+    child_dirs = JSONField(default=list, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ['baseline', 'dir_path']
+        ordering = ['dir_path']
+
+    def __str__(self):
+        return f"{self.dir_path} ({self.baseline.name})"
+
+
 class FileChange(models.Model):
     CHANGE_TYPE_CHOICES = [
         ('created', 'File Created'),
@@ -127,17 +199,45 @@ class FileChange(models.Model):
 
     metadata = JSONField(default=dict, blank=True)
 
+    # Digest of (baseline, file_path, change_type) while unacknowledged, null once acknowledged.
+    # Unique, so a scan writes a change or updates the open one in a single upsert
+    dedup_key = models.CharField(max_length=32, null=True, blank=True, unique=True)
+
     class Meta:
         ordering = ['-detected_at']
         indexes = [
             models.Index(fields=['baseline', 'detected_at']),
             models.Index(fields=['file_path']),
             models.Index(fields=['severity']),
+            models.Index(
+                fields=['baseline', 'file_path', 'change_type'],
+                condition=models.Q(acknowledged=False),
+                name='filechange_open_lookup_idx'
+            ),
         ]
 
     def __str__(self):
         return f"{self.change_type} - {self.file_path}"
 
+    @staticmethod
+    def build_dedup_key(baseline_id, file_path, change_type):
+        """
+            @param baseline_id:
+            @param file_path:
+            @param change_type:
+            @return: dedup_key of an unacknowledged change
+        """
+        return hashlib.blake2b(
+            f"{baseline_id}\0{change_type}\0{file_path}".encode("utf-8", "surrogateescape"), digest_size=16
+        ).hexdigest()
+
+    def save(self, *args, **kwargs):
+        if self.acknowledged:
+            self.dedup_key = None
+        elif self._state.adding and self.dedup_key is None:
+            self.dedup_key = self.build_dedup_key(self.baseline_id, self.file_path, self.change_type)
+        super().save(*args, **kwargs)
+
     def acknowledge(self, user, reason=''):
         """Mark change as acknowledged"""
         self.acknowledged = True
@@ -194,8 +294,39 @@ class Alert(models.Model):
         self.save()
 
 
+class MonitoringCounter(models.Model):
+    id = models.BigAutoField(primary_key=True)
+    baseline = models.ForeignKey(Baseline, on_delete=models.CASCADE, related_name='counters')
+
+    # e.g. "file_changes.open", "alerts.unread.inbox"
+    metric = models.CharField(max_length=50)
+    severity = models.CharField(max_length=20)
+    # Day the counted rows were created; null for the all-time total
+    day = models.DateField(null=True, blank=True)
+    count = models.BigIntegerField(default=0)
+
+    class Meta:
+        ordering = ['metric', 'day']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['metric', 'baseline', 'severity', 'day'],
+                condition=models.Q(day__isnull=False),
+                name='monitoring_counter_daily_unique'
+            ),
+            models.UniqueConstraint(
+                fields=['metric', 'baseline', 'severity'],
+                condition=models.Q(day__isnull=True),
+                name='monitoring_counter_total_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.metric} {self.severity} {self.day or 'total'}: {self.count}"
+
+
 class MonitoringSession(models.Model):
     STATUS_CHOICES = [
+        ('queued', 'Queued'),
         ('running', 'Running'),
         ('completed', 'Completed'),
         ('failed', 'Failed'),
@@ -217,6 +348,8 @@ class MonitoringSession(models.Model):
 
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='running')
     error_message = models.TextField(blank=True, null=True)
+    # Job attempt running the session; writes of an earlier, reaped attempt are dropped
+    attempt = models.PositiveSmallIntegerField(default=0)
 
     user = models.ForeignKey(Users, on_delete=models.SET_NULL, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
@@ -240,6 +373,79 @@ class MonitoringSession(models.Model):
         return (timezone.now() - self.start_time).total_seconds()
 
 
+class MonitoringJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+        ('cancelled', 'Cancelled'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    session = models.OneToOneField(MonitoringSession, on_delete=models.CASCADE, related_name='job')
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    params = JSONField(default=dict, blank=True)
+    worker = models.CharField(max_length=255, blank=True, null=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    def __str__(self):
+        return f"Job {self.id} ({self.status}) for session {self.session_id}"
+
+
+class MonitoringSchedule(models.Model):
+    MONITOR_TYPE_CHOICES = [
+        ('full', 'Full'),
+        ('incremental', 'Incremental'),
+        ('structural', 'Structural'),
+        ('quick', 'Quick'),
+        ('rolling', 'Rolling'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    baseline = models.ForeignKey(Baseline, on_delete=models.CASCADE, related_name='schedules')
+
+    # Full by default: only full sessions re-read files whose size and mtime did not move
+    monitor_type = models.CharField(max_length=20, choices=MONITOR_TYPE_CHOICES, default='full')
+    cron_expression = models.CharField(max_length=100, help_text='minute hour day-of-month month day-of-week')
+    # Runs start up to this many seconds after the cron time, at an offset fixed per baseline
+    jitter_seconds = models.PositiveIntegerField(default=GenericConstants.SCHEDULER_DEFAULT_JITTER_SECONDS)
+    enabled = models.BooleanField(default=True)
+
+    next_run_at = models.DateTimeField(null=True, blank=True)
+    last_run_at = models.DateTimeField(null=True, blank=True)
+    last_session = models.ForeignKey(
+        MonitoringSession, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    # Runs skipped because the previous session of the baseline was still queued or running
+    skipped_runs = models.PositiveIntegerField(default=0)
+    last_skipped_at = models.DateTimeField(null=True, blank=True)
+
+    user = models.ForeignKey(Users, on_delete=models.PROTECT)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['enabled', 'next_run_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.monitor_type} {self.cron_expression} - {self.baseline.name}"
+
+
 class WhitelistRule(models.Model):
     CHANGE_TYPE_CHOICES = [
         ('content_changed', 'Content Changed'),
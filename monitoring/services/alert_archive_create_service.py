@@ -1,7 +1,9 @@
 from rest_framework import status
+from django.db import transaction
 
 from monitoring.models import Alert
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+from monitoring.services.service_helper.monitoring_counters import MonitoringCounters
 from file_integrity_monitoring.commons.generic_constants import GenericConstants
 from file_integrity_monitoring.commons.commons import Commons
 
@@ -48,8 +50,18 @@ class AlertArchiveCreateService(MonitoringServiceHelper):
         }
 
         # Archive the alert
-        alert.is_archived = True
-        alert.save()
+        with transaction.atomic():
+            # Only the request that flips the flag moves the counters
+            newly_archived = Alert.objects.filter(id=alert.id, is_archived=False).update(is_archived=True)
+
+            alert.is_archived = True
+            alert.save()
+
+            if newly_archived:
+                counters = MonitoringCounters()
+                counters.add_alert(alert, alert.file_change.baseline_id, -1, is_archived=False)
+                counters.add_alert(alert, alert.file_change.baseline_id)
+                counters.apply()
 
         # Create audit log
         Commons.create_audit_log(
@@ -1,8 +1,10 @@
 from rest_framework import status
+from django.db import transaction
 import os
 
 from monitoring.models import Alert, FileChange
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+from monitoring.services.service_helper.monitoring_counters import MonitoringCounters
 from file_integrity_monitoring.commons.generic_constants import GenericConstants
 from file_integrity_monitoring.commons.commons import Commons
 
@@ -57,8 +59,8 @@ class AlertCreateService(MonitoringServiceHelper):
             return {"message": GenericConstants.ALERT_ALREADY_EXISTS}
 
         # Generate title and message
-        title = self._generate_title(change)
-        message = self._generate_message(change)
+        title = self.generate_title(change)
+        message = self.generate_message(change)
 
         # Create alert
         alert = Alert(
@@ -76,7 +78,12 @@ class AlertCreateService(MonitoringServiceHelper):
                 'detection_method': 'auto_scan'
             }
         )
-        alert.save()
+        with transaction.atomic():
+            alert.save()
+
+            counters = MonitoringCounters()
+            counters.add_alert(alert, change.baseline_id)
+            counters.apply()
 
         # Create audit log
         Commons.create_audit_log(
@@ -97,7 +104,8 @@ class AlertCreateService(MonitoringServiceHelper):
             "message": GenericConstants.ALERT_CREATE_SUCCESSFUL_MESSAGE,
         }
 
-    def _generate_title(self, change):
+    @staticmethod
+    def generate_title(change):
         """Generate alert title from change details"""
         # Extract filename from path
         filename = os.path.basename(change.file_path)
@@ -110,7 +118,8 @@ class AlertCreateService(MonitoringServiceHelper):
 
         return f"[{severity_label}] {change_type_label}: {filename}"
 
-    def _generate_message(self, change):
+    @staticmethod
+    def generate_message(change):
         """Generate alert message from change details"""
         baseline_name = change.baseline.name
         detected_time = change.detected_at.strftime("%Y-%m-%d %H:%M:%S UTC")
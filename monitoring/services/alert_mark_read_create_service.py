@@ -1,8 +1,10 @@
 from rest_framework import status
+from django.db import transaction
 
 from monitoring.models import Alert
 from accounts.models import Users
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+from monitoring.services.service_helper.monitoring_counters import MonitoringCounters
 from file_integrity_monitoring.commons.generic_constants import GenericConstants
 from file_integrity_monitoring.commons.commons import Commons
 
@@ -59,7 +61,17 @@ class AlertMarkReadCreateService(MonitoringServiceHelper):
         }
 
         # Mark alert as read and add user to M2M
-        alert.mark_as_read(user)
+        with transaction.atomic():
+            # Only the request that flips the flag moves the counters
+            newly_read = Alert.objects.filter(id=alert.id, read=False).update(read=True)
+
+            alert.mark_as_read(user)
+
+            if newly_read:
+                counters = MonitoringCounters()
+                counters.add_alert(alert, alert.file_change.baseline_id, -1, read=False)
+                counters.add_alert(alert, alert.file_change.baseline_id)
+                counters.apply()
 
         # Create audit log
         Commons.create_audit_log(
@@ -2,6 +2,12 @@ from rest_framework import status
 
 from monitoring.models import Alert
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+from monitoring.services.service_helper.monitoring_counters import MonitoringCounters
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from file_integrity_monitoring.commons.keyset_paginator import KeysetPaginator, InvalidCursor
+
+# Non-null indexed columns that cursor pagination can sort by
+CURSOR_SORT_FIELDS = ("created_at", "severity", "id")
 
 
 class AlertsGetService(MonitoringServiceHelper):
@@ -26,7 +32,9 @@ class AlertsGetService(MonitoringServiceHelper):
             "sort_order": data.get("sort_order", "desc"),
             "severity": data.get("severity"),
             "read": data.get("read"),
-            "is_archived": data.get("is_archived")
+            "is_archived": data.get("is_archived"),
+            "cursor": data.get("cursor"),
+            "include_total": str(data.get("include_total", "true")).lower() in ['true', '1', 'yes']
         }
 
     def get_data(self, *args, **kwargs):
@@ -46,11 +54,13 @@ class AlertsGetService(MonitoringServiceHelper):
             queryset = queryset.filter(severity=params.get("severity"))
 
         # Apply read filter if provided
+        read_value = None
         if params.get("read") is not None:
             read_value = params.get("read").lower() in ['true', '1', 'yes']
             queryset = queryset.filter(read=read_value)
 
         # Apply is_archived filter if provided
+        is_archived_value = None
         if params.get("is_archived") is not None:
             is_archived_value = params.get("is_archived").lower() in ['true', '1', 'yes']
             queryset = queryset.filter(is_archived=is_archived_value)
@@ -65,10 +75,23 @@ class AlertsGetService(MonitoringServiceHelper):
         # Apply pagination
         page = params.get("page")
         page_size = params.get("page_size")
-        start = (page - 1) * page_size
-        end = start + page_size
+        next_cursor = None
 
-        paginated_alerts = queryset[start:end]
+        # Cursor pagination unless a later page is requested by number
+        if params.get("cursor") or (page == 1 and params.get("sort_by") in CURSOR_SORT_FIELDS):
+            try:
+                paginator = KeysetPaginator(
+                    queryset, params.get("sort_by"), params.get("sort_order"), CURSOR_SORT_FIELDS
+                )
+                paginated_alerts, next_cursor = paginator.get_page(params.get("cursor"), page_size)
+            except InvalidCursor:
+                self.error = True
+                self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+                return {"message": GenericConstants.INVALID_CURSOR_MESSAGE}
+        else:
+            start = (page - 1) * page_size
+            end = start + page_size
+            paginated_alerts = queryset[start:end]
 
         # Serialize alerts data
         alerts_data = []
@@ -85,10 +108,19 @@ class AlertsGetService(MonitoringServiceHelper):
             }
             alerts_data.append(alert_dict)
 
+        total = None
+        if params.get("include_total"):
+            total = MonitoringCounters.total(
+                MonitoringCounters.alert_metrics(read=read_value, is_archived=is_archived_value),
+                severity=params.get("severity")
+            )
+
         self.set_status_code(status_code=status.HTTP_200_OK)
         return {
             "alerts": alerts_data,
-            "total": queryset.count(),
+            "total": total,
+            "total_is_approximate": False,
             "page": page,
-            "page_size": page_size
+            "page_size": page_size,
+            "next_cursor": next_cursor
         }
\ No newline at end of file
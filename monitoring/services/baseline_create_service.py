@@ -1,3 +1,4 @@
+import itertools
 import os
 import threading
 
@@ -7,6 +8,7 @@ from accounts.models import Users
 from file_integrity_monitoring.commons.commons import Commons
 from file_integrity_monitoring.commons.generic_constants import GenericConstants
 from monitoring.models import Baseline
+from monitoring.services.service_helper.hash_algorithms import HashAlgorithms
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
 
 
@@ -32,6 +34,13 @@ class BaselineCreateService(MonitoringServiceHelper):
             "algorithm_type": data.get("algorithm_type", "sha256"),
             "exclude_patterns": data.get("exclude_patterns", []),
             "monitoring_enabled": data.get("monitoring_enabled", True),
+            "hash_workers": data.get("hash_workers", GenericConstants.DEFAULT_HASH_WORKERS),
+            "hash_executor": data.get("hash_executor", GenericConstants.HASH_EXECUTOR_THREAD),
+            "rolling_slices": data.get("rolling_slices", GenericConstants.ROLLING_DEFAULT_SLICES),
+            "block_hash_threshold": data.get("block_hash_threshold"),
+            "checksum_prefilter": data.get("checksum_prefilter", False),
+            "io_bytes_per_second": data.get("io_bytes_per_second", 0),
+            "io_files_per_second": data.get("io_files_per_second", 0),
             "user_id": data.get("user_id") or data.get("created_by")
         }
 
@@ -61,6 +70,34 @@ class BaselineCreateService(MonitoringServiceHelper):
             self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
             return {"message": GenericConstants.BASELINE_PATH_DOES_NOT_EXIST.format(params.get('path'))}
 
+        if not self.is_valid_algorithm_type(params.get("algorithm_type")):
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.INVALID_ALGORITHM_TYPE_MESSAGE.format(
+                ", ".join(HashAlgorithms.digests())
+            )}
+
+        if not self.is_valid_hash_engine(params.get("hash_workers"), params.get("hash_executor")):
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.INVALID_HASH_ENGINE_MESSAGE}
+
+        if not self.is_valid_rolling_slices(params.get("rolling_slices")):
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.INVALID_ROLLING_SLICES_MESSAGE}
+
+        if not self.is_valid_block_hash_threshold(params.get("block_hash_threshold")):
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.INVALID_BLOCK_HASH_THRESHOLD_MESSAGE}
+
+        if not self.is_valid_io_budget(params.get("io_bytes_per_second")) or \
+                not self.is_valid_io_budget(params.get("io_files_per_second")):
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.INVALID_IO_BUDGET_MESSAGE}
+
+        checksum_prefilter = params.get("checksum_prefilter")
+        if isinstance(checksum_prefilter, str):
+            checksum_prefilter = checksum_prefilter.lower() == 'true'
+        checksum_prefilter = bool(checksum_prefilter)
+
         try:
             user = Users.objects.get(id=params.get("user_id"))
         except Users.DoesNotExist:
@@ -74,50 +111,48 @@ class BaselineCreateService(MonitoringServiceHelper):
             algorithm_type=params.get("algorithm_type"),
             exclude_patterns=params.get("exclude_patterns"),
             monitoring_enabled=params.get("monitoring_enabled"),
+            hash_workers=int(params.get("hash_workers")),
+            hash_executor=params.get("hash_executor"),
+            rolling_slices=int(params.get("rolling_slices")),
+            block_hash_threshold=int(params.get("block_hash_threshold") or 0) or None,
+            checksum_prefilter=checksum_prefilter,
+            io_bytes_per_second=int(params.get("io_bytes_per_second") or 0),
+            io_files_per_second=int(params.get("io_files_per_second") or 0),
             user=user,
             status=GenericConstants.STATUS_SCANNING
         )
 
-        # Count files to determine approach
-        is_success, file_count = self.count_files(params.get("path"), params.get("exclude_patterns"))
-
-        if not is_success:
+        # Walk once: buffer the first entries and decide on the approach from what was seen
+        entries = self.walk_files(params.get("path"), params.get("exclude_patterns"))
+        try:
+            head_entries = list(itertools.islice(entries, GenericConstants.SYNC_FILE_THRESHOLD))
+        except Exception as e:
             self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
             return {"message": GenericConstants.BASELINE_FILES_COUNT_ERROR_MESSAGE}
 
-        if file_count < GenericConstants.SYNC_FILE_THRESHOLD:
-            try:
-                is_success, message = self.scan_baseline_files_sync(baseline, params)
-                if not is_success:
-                    return {"message": message}
-
-                baseline.status = GenericConstants.STATUS_ACTIVE
-                baseline.save()
-
-                Commons.create_audit_log(
-                    user_id=params.get("user_id"),
-                    action=GenericConstants.ACTION_CREATE,
-                    resource_type=GenericConstants.RESOURCE_TYPE_BASELINE,
-                    resource_id=baseline.id,
-                    new_values={
-                        "name": baseline.name,
-                        "path": baseline.path,
-                    }
-                )
-
-                return {
-                    "message": GenericConstants.BASELINE_CREATE_SUCCESSFUL_MESSAGE
+        if len(head_entries) < GenericConstants.SYNC_FILE_THRESHOLD:
+            is_success, message = self.run_baseline_scan(baseline, params, head_entries)
+            if not is_success:
+                return {"message": message}
+
+            Commons.create_audit_log(
+                user_id=params.get("user_id"),
+                action=GenericConstants.ACTION_CREATE,
+                resource_type=GenericConstants.RESOURCE_TYPE_BASELINE,
+                resource_id=baseline.id,
+                new_values={
+                    "name": baseline.name,
+                    "path": baseline.path,
                 }
-            except Exception as e:
-                baseline.status = GenericConstants.STATUS_ERROR
-                baseline.save()
-                self.error = True
-                self.set_status_code(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
-                return {"message": f"Error scanning baseline: {str(e)}"}
+            )
+
+            return {
+                "message": GenericConstants.BASELINE_CREATE_SUCCESSFUL_MESSAGE
+            }
         else:
             thread = threading.Thread(
                 target=self._scan_baseline_files_async,
-                args=(baseline.id, params),
+                args=(baseline.id, params, itertools.chain(head_entries, entries)),
                 daemon=True
             )
             thread.start()
@@ -128,17 +163,18 @@ class BaselineCreateService(MonitoringServiceHelper):
 
 
     # TODO - Future Scope
-    def _scan_baseline_files_async(self, baseline_id, params):
-        """Asynchronously scan directory (>= 5000 files) - runs in background thread"""
+    def _scan_baseline_files_async(self, baseline_id, params, entries):
+        """Asynchronously scan directory (>= 5000 files) - runs in background thread, continuing the walk"""
         try:
             baseline = Baseline.objects.get(id=baseline_id)
 
             # Perform same scan as sync version
-            self.scan_baseline_files_sync(baseline, params)
-
-            # Update status to ready
-            baseline.status = "ready"
-            baseline.save()
+            is_success, message = self.run_baseline_scan(
+                baseline, params, entries, success_status=GenericConstants.STATUS_READY
+            )
+            if not is_success:
+                print(f"Error in async scan for baseline {baseline_id}: {message}")
+                return
 
             # Create audit log for completion
             Commons.create_audit_log(
@@ -148,15 +184,9 @@ class BaselineCreateService(MonitoringServiceHelper):
                 resource_id=baseline_id,
                 new_values={
                     "status": "ready",
-                    "file_count": baseline.baseline_files.count()
+                    "file_count": Baseline.objects.values_list('total_files', flat=True).get(id=baseline_id)
                 }
             )
 
         except Exception as e:
             print(f"Error in async scan for baseline {baseline_id}: {str(e)}")
-            try:
-                baseline = Baseline.objects.get(id=baseline_id)
-                baseline.status = "error"
-                baseline.save()
-            except:
-                pass
\ No newline at end of file
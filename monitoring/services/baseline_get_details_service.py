@@ -2,6 +2,7 @@ from rest_framework import status
 
 from monitoring.models import Baseline
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+from monitoring.services.service_helper.rolling_slice import RollingSlice
 from file_integrity_monitoring.commons.generic_constants import GenericConstants
 
 
@@ -56,7 +57,21 @@ class BaselineGetDetailsService(MonitoringServiceHelper):
             "monitoring_enabled": baseline.monitoring_enabled,
             "algorithm_type": baseline.algorithm_type,
             "exclude_patterns": baseline.exclude_patterns,
+            "hash_workers": baseline.hash_workers,
+            "hash_executor": baseline.hash_executor,
             "file_count": baseline.file_count(),
+            "total_bytes": baseline.total_bytes,
+            "last_scan_at": baseline.last_scan_at.isoformat() if baseline.last_scan_at else None,
+            "last_scan_status": baseline.last_scan_status,
+            "last_scan_files_changed": baseline.last_scan_files_changed,
+            "scan_progress": baseline.scan_progress,
+            "rolling_slices": baseline.rolling_slices,
+            "rolling_coverage": RollingSlice.describe(baseline),
+            "block_hash_threshold": baseline.block_hash_threshold,
+            "checksum_prefilter": baseline.checksum_prefilter,
+            "checksum_verified_at": baseline.checksum_verified_at.isoformat() if baseline.checksum_verified_at else None,
+            "io_bytes_per_second": baseline.io_bytes_per_second,
+            "io_files_per_second": baseline.io_files_per_second,
         }
 
         self.set_status_code(status_code=status.HTTP_200_OK)
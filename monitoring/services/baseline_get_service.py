@@ -62,6 +62,11 @@ class BaselineGetService(MonitoringServiceHelper):
                 "algorithm_type": baseline.algorithm_type,
                 "monitoring_enabled": baseline.monitoring_enabled,
                 "file_count": baseline.file_count(),
+                "total_bytes": baseline.total_bytes,
+                "last_scan_at": baseline.last_scan_at,
+                "last_scan_status": baseline.last_scan_status,
+                "status": baseline.status,
+                "scan_progress": baseline.scan_progress,
                 "created_at": baseline.created_at,
             }
             baselines_data.append(baseline_dict)
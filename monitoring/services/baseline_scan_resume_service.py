@@ -0,0 +1,133 @@
+import threading
+from datetime import timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+
+from file_integrity_monitoring.commons.commons import Commons
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.models import Baseline
+from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+
+
+class BaselineScanResumeService(MonitoringServiceHelper):
+    """
+        Resume an interrupted baseline scan from the files already committed
+    """
+    def __init__(self):
+        super().__init__()
+
+    def get_request_params(self, *args, **kwargs):
+        """
+        Get request params
+        @param args: request params
+        @param kwargs: request params
+        @return request params
+        """
+        data = kwargs.get("data")
+        return {
+            "baseline_id": data.get("baseline_id"),
+            "user_id": data.get("user_id")
+        }
+
+    def get_data(self, *args, **kwargs):
+        """
+        Resume baseline scan in a background thread
+        @param args: request params
+        @param kwargs: request params
+        @return response data
+        """
+        params = self.get_request_params(*args, **kwargs)
+
+        if not params.get("baseline_id"):
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.BASELINE_ID_REQUIRED_MESSAGE}
+
+        try:
+            baseline = Baseline.objects.get(id=params.get("baseline_id"))
+        except Baseline.DoesNotExist:
+            self.set_status_code(status_code=status.HTTP_404_NOT_FOUND)
+            return {"message": GenericConstants.BASELINE_NOT_FOUND_MESSAGE}
+
+        if not self._is_resumable(baseline):
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.BASELINE_SCAN_NOT_RESUMABLE_MESSAGE}
+
+        # Claim the scan on the state just checked; of concurrent resumes only one updates the row.
+        # The fresh progress timestamp keeps the claimed scan from looking stale before its first batch
+        now = timezone.now()
+        scan_progress = {**(baseline.scan_progress or {}), "updated_at": now.isoformat()}
+        claimed = Baseline.objects.filter(
+            id=baseline.id, status=baseline.status, updated_at=baseline.updated_at
+        ).update(status=GenericConstants.STATUS_SCANNING, scan_progress=scan_progress, updated_at=now)
+        if claimed != 1:
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.BASELINE_SCAN_NOT_RESUMABLE_MESSAGE}
+        baseline.status = GenericConstants.STATUS_SCANNING
+        baseline.scan_progress = scan_progress
+        baseline.updated_at = now
+
+        scan_params = {
+            "path": baseline.path,
+            "algorithm_type": baseline.algorithm_type,
+            "exclude_patterns": baseline.exclude_patterns,
+            "user_id": params.get("user_id") or baseline.user_id,
+            "resume": True
+        }
+        thread = threading.Thread(
+            target=self._resume_scan,
+            args=(baseline.id, scan_params),
+            daemon=True
+        )
+        thread.start()
+
+        self.set_status_code(status_code=status.HTTP_202_ACCEPTED)
+        return {
+            "message": GenericConstants.BASELINE_SCAN_RESUMED_MESSAGE,
+            "scan_progress": baseline.scan_progress
+        }
+
+    @staticmethod
+    def _is_resumable(baseline):
+        """
+        A scan can be resumed when it failed, or when it is still marked scanning
+        but has not committed progress for BASELINE_SCAN_STALE_SECONDS
+        """
+        if baseline.status in (GenericConstants.STATUS_INCOMPLETE, GenericConstants.STATUS_ERROR):
+            return True
+
+        if baseline.status != GenericConstants.STATUS_SCANNING:
+            return False
+
+        # Whichever is later: a claim moves updated_at, a committed batch moves the progress timestamp
+        progress_update = parse_datetime((baseline.scan_progress or {}).get("updated_at") or "")
+        last_update = max(progress_update, baseline.updated_at) if progress_update else baseline.updated_at
+        return timezone.now() - last_update > timedelta(seconds=GenericConstants.BASELINE_SCAN_STALE_SECONDS)
+
+    def _resume_scan(self, baseline_id, params):
+        """Resume the scan - runs in background thread"""
+        try:
+            baseline = Baseline.objects.get(id=baseline_id)
+
+            is_success, message = self.run_baseline_scan(
+                baseline, params, success_status=GenericConstants.STATUS_READY
+            )
+            if not is_success:
+                print(f"Error resuming scan for baseline {baseline_id}: {message}")
+                return
+
+            Commons.create_audit_log(
+                user_id=params.get("user_id"),
+                action="scan_complete",
+                resource_type=GenericConstants.RESOURCE_TYPE_BASELINE,
+                resource_id=baseline_id,
+                new_values={
+                    "status": GenericConstants.STATUS_READY,
+                    "resumed": True,
+                    "files_processed": baseline.scan_progress.get("files_processed")
+                }
+            )
+
+        except Exception as e:
+            print(f"Error resuming scan for baseline {baseline_id}: {str(e)}")
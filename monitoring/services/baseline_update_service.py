@@ -2,7 +2,8 @@ from rest_framework import status
 
 from file_integrity_monitoring.commons.commons import Commons
 from file_integrity_monitoring.commons.generic_constants import GenericConstants
-from monitoring.models import Baseline
+from monitoring.models import Baseline, DirectoryFingerprint
+from monitoring.services.service_helper.hash_algorithms import HashAlgorithms
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
 
 
@@ -29,6 +30,13 @@ class BaselineUpdateService(MonitoringServiceHelper):
             "algorithm_type": data.get("algorithm_type"),
             "exclude_patterns": data.get("exclude_patterns"),
             "monitoring_enabled": data.get("monitoring_enabled"),
+            "hash_workers": data.get("hash_workers"),
+            "hash_executor": data.get("hash_executor"),
+            "rolling_slices": data.get("rolling_slices"),
+            "block_hash_threshold": data.get("block_hash_threshold"),
+            "checksum_prefilter": data.get("checksum_prefilter"),
+            "io_bytes_per_second": data.get("io_bytes_per_second"),
+            "io_files_per_second": data.get("io_files_per_second"),
             "status": data.get("status"),
             "user_id": data.get("user_id")
         }
@@ -76,6 +84,17 @@ class BaselineUpdateService(MonitoringServiceHelper):
             baseline.path = params.get("path")
 
         if params.get("algorithm_type"):
+            if not self.is_valid_algorithm_type(params.get("algorithm_type")):
+                self.error = True
+                self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+                return {"message": GenericConstants.INVALID_ALGORITHM_TYPE_MESSAGE.format(
+                    ", ".join(HashAlgorithms.digests())
+                )}
+            if params.get("algorithm_type") != baseline.algorithm_type and baseline.baseline_files.exists():
+                # Stored digests are of the old algorithm; every file would compare as modified
+                self.error = True
+                self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+                return {"message": GenericConstants.ALGORITHM_TYPE_LOCKED_MESSAGE}
             baseline.algorithm_type = params.get("algorithm_type")
 
         if params.get("exclude_patterns") is not None:
@@ -87,8 +106,62 @@ class BaselineUpdateService(MonitoringServiceHelper):
         if params.get("status"):
             baseline.status = params.get("status")
 
+        if params.get("hash_workers") is not None or params.get("hash_executor"):
+            hash_workers = params.get("hash_workers") or baseline.hash_workers
+            hash_executor = params.get("hash_executor") or baseline.hash_executor
+            if not self.is_valid_hash_engine(hash_workers, hash_executor):
+                self.error = True
+                self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+                return {"message": GenericConstants.INVALID_HASH_ENGINE_MESSAGE}
+            baseline.hash_workers = int(hash_workers)
+            baseline.hash_executor = hash_executor
+
+        if params.get("rolling_slices") is not None:
+            if not self.is_valid_rolling_slices(params.get("rolling_slices")):
+                self.error = True
+                self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+                return {"message": GenericConstants.INVALID_ROLLING_SLICES_MESSAGE}
+            baseline.rolling_slices = int(params.get("rolling_slices"))
+
+        if params.get("block_hash_threshold") is not None:
+            if not self.is_valid_block_hash_threshold(params.get("block_hash_threshold")):
+                self.error = True
+                self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+                return {"message": GenericConstants.INVALID_BLOCK_HASH_THRESHOLD_MESSAGE}
+            # Files keep their block digests until the next baseline scan; 0 turns block hashing off
+            baseline.block_hash_threshold = int(params.get("block_hash_threshold")) or None
+
+        if params.get("checksum_prefilter") is not None:
+            checksum_prefilter = params.get("checksum_prefilter")
+            if isinstance(checksum_prefilter, str):
+                checksum_prefilter = checksum_prefilter.lower() == 'true'
+            checksum_prefilter = bool(checksum_prefilter)
+            if checksum_prefilter and not baseline.checksum_prefilter:
+                # The next full session computes every digest and stores the missing checksums
+                baseline.checksum_verified_at = None
+            baseline.checksum_prefilter = checksum_prefilter
+
+        # Scans already running keep the budgets they started with
+        if params.get("io_bytes_per_second") is not None:
+            if not self.is_valid_io_budget(params.get("io_bytes_per_second")):
+                self.error = True
+                self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+                return {"message": GenericConstants.INVALID_IO_BUDGET_MESSAGE}
+            baseline.io_bytes_per_second = int(params.get("io_bytes_per_second"))
+
+        if params.get("io_files_per_second") is not None:
+            if not self.is_valid_io_budget(params.get("io_files_per_second")):
+                self.error = True
+                self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+                return {"message": GenericConstants.INVALID_IO_BUDGET_MESSAGE}
+            baseline.io_files_per_second = int(params.get("io_files_per_second"))
+
         baseline.save()
 
+        # Directory fingerprints describe the old tree
+        if params.get("path") or params.get("exclude_patterns") is not None:
+            DirectoryFingerprint.objects.filter(baseline=baseline).delete()
+
         Commons.create_audit_log(
             user_id=params.get("user_id"),
             action="update",
@@ -3,6 +3,7 @@ from rest_framework import status
 from file_integrity_monitoring.commons.generic_constants import GenericConstants
 from monitoring.models import WhitelistRule, Baseline, Users
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+from monitoring.services.service_helper.whitelist_rule_engine import WhitelistRuleEngine
 from file_integrity_monitoring.commons.commons import Commons
 
 
@@ -40,6 +41,12 @@ class WhitelistRuleCreateService(MonitoringServiceHelper):
             self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
             return {"message": GenericConstants.FILE_PATTERN_REQUIRED_MESSAGE}
 
+        pattern_error = WhitelistRuleEngine.pattern_error(params.get("file_pattern"))
+        if pattern_error is not None:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.INVALID_FILE_PATTERN_MESSAGE.format(pattern_error)}
+
         # Get baseline
         try:
             baseline = Baseline.objects.get(id=params.get("baseline_id"))
@@ -1,4 +1,5 @@
 from rest_framework import status
+from django.core.cache import cache
 from django.db.models import Count, Q
 from django.utils import timezone
 from datetime import timedelta
@@ -7,6 +8,12 @@ from monitoring.models import (
     MonitoringSession, Baseline, FileChange, Alert, WhitelistRule
 )
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+from monitoring.services.service_helper.monitoring_counters import (
+    MonitoringCounters, FILE_CHANGES_OPEN, alert_metric
+)
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+
+SEVERITIES = ['critical', 'high', 'medium', 'low', 'info']
 
 
 class DashboardSummaryGetService(MonitoringServiceHelper):
@@ -20,174 +27,193 @@ class DashboardSummaryGetService(MonitoringServiceHelper):
         data = kwargs.get("data")
         return {}
 
+    @staticmethod
+    def invalidate_cache():
+        """
+        Drop the cached summary; called from model signals and after bulk writes
+        @return: None
+        """
+        cache.delete(GenericConstants.DASHBOARD_SUMMARY_CACHE_KEY)
+
     def get_data(self, *args, **kwargs):
-        """Get dashboard summary statistics"""
+        """Get dashboard summary statistics, served from cache while fresh"""
         try:
-            # Get current time for time-based queries
-            now = timezone.now()
-            last_24_hours = now - timedelta(hours=24)
-            last_7_days = now - timedelta(days=7)
-
-            # Baseline Statistics
-            total_baselines = Baseline.objects.filter(is_active=True).count()
-            baselines_monitored = MonitoringSession.objects.filter(
-                status='completed'
-            ).values('baseline_id').distinct().count()
-
-            # Monitoring Session Statistics
-            total_sessions = MonitoringSession.objects.count()
-            completed_sessions = MonitoringSession.objects.filter(status='completed').count()
-            failed_sessions = MonitoringSession.objects.filter(status='failed').count()
-            running_sessions = MonitoringSession.objects.filter(status='running').count()
-
-            sessions_last_24h = MonitoringSession.objects.filter(
-                created_at__gte=last_24_hours
-            ).count()
-            sessions_last_7d = MonitoringSession.objects.filter(
-                created_at__gte=last_7_days
-            ).count()
-
-            # File Change Statistics
-            total_changes = FileChange.objects.count()
-            unacknowledged_changes = FileChange.objects.filter(acknowledged=False).count()
-
-            changes_by_severity = {}
-            for severity in ['critical', 'high', 'medium', 'low', 'info']:
-                count = FileChange.objects.filter(severity=severity).count()
-                if count > 0:
-                    changes_by_severity[severity] = count
-
-            changes_last_24h = FileChange.objects.filter(
-                detected_at__gte=last_24_hours
-            ).count()
-            changes_last_7d = FileChange.objects.filter(
-                detected_at__gte=last_7_days
-            ).count()
-
-            # Alert Statistics
-            total_alerts = Alert.objects.count()
-            unread_alerts = Alert.objects.filter(read=False).count()
-            archived_alerts = Alert.objects.filter(is_archived=True).count()
-            active_alerts = Alert.objects.filter(read=False, is_archived=False).count()
-
-            alerts_by_severity = {}
-            for severity in ['critical', 'high', 'medium', 'low', 'info']:
-                count = Alert.objects.filter(severity=severity).count()
-                if count > 0:
-                    alerts_by_severity[severity] = count
-
-            critical_alerts = Alert.objects.filter(
-                severity='critical',
-                read=False,
-                is_archived=False
-            ).count()
-
-            alerts_last_24h = Alert.objects.filter(
-                created_at__gte=last_24_hours
-            ).count()
-            alerts_last_7d = Alert.objects.filter(
-                created_at__gte=last_7_days
-            ).count()
-
-            # Whitelist Rules Statistics
-            total_rules = WhitelistRule.objects.count()
-            active_rules = WhitelistRule.objects.filter(active=True).count()
-            inactive_rules = WhitelistRule.objects.filter(active=False).count()
-
-            rules_by_baseline = WhitelistRule.objects.values(
-                'baseline__name'
-            ).annotate(count=Count('id'))
-            rules_by_baseline_dict = {
-                item['baseline__name']: item['count']
-                for item in rules_by_baseline
-            }
-
-            # Recent Activity
-            recent_sessions = MonitoringSession.objects.order_by(
-                '-created_at'
-            )[:5]
-            recent_sessions_data = []
-            for session in recent_sessions:
-                recent_sessions_data.append({
-                    'id': session.id,
-                    'baseline_name': session.baseline.name,
-                    'status': session.status,
-                    'files_scanned': session.files_scanned,
-                    'files_changed': session.files_changed,
-                    'created_at': session.created_at.isoformat() if session.created_at else None
-                })
-
-            recent_alerts = Alert.objects.order_by('-created_at')[:5]
-            recent_alerts_data = []
-            for alert in recent_alerts:
-                recent_alerts_data.append({
-                    'id': alert.id,
-                    'severity': alert.severity,
-                    'title': alert.title,
-                    'read': alert.read,
-                    'created_at': alert.created_at.isoformat() if alert.created_at else None
-                })
-
-            # Health Status
-            health_status = self._calculate_health_status(
-                critical_alerts,
-                failed_sessions,
-                unacknowledged_changes
-            )
-
-            return {
-                "timestamp": now.isoformat(),
-                "health_status": health_status,
-                "baselines": {
-                    "total": total_baselines,
-                    "monitored": baselines_monitored,
-                    "coverage_percentage": (
-                        (baselines_monitored / total_baselines * 100)
-                        if total_baselines > 0 else 0
-                    )
-                },
-                "monitoring_sessions": {
-                    "total": total_sessions,
-                    "completed": completed_sessions,
-                    "failed": failed_sessions,
-                    "running": running_sessions,
-                    "last_24h": sessions_last_24h,
-                    "last_7d": sessions_last_7d
-                },
-                "file_changes": {
-                    "total": total_changes,
-                    "unacknowledged": unacknowledged_changes,
-                    "by_severity": changes_by_severity,
-                    "last_24h": changes_last_24h,
-                    "last_7d": changes_last_7d
-                },
-                "alerts": {
-                    "total": total_alerts,
-                    "unread": unread_alerts,
-                    "archived": archived_alerts,
-                    "active": active_alerts,
-                    "critical": critical_alerts,
-                    "by_severity": alerts_by_severity,
-                    "last_24h": alerts_last_24h,
-                    "last_7d": alerts_last_7d
-                },
-                "whitelist_rules": {
-                    "total": total_rules,
-                    "active": active_rules,
-                    "inactive": inactive_rules,
-                    "by_baseline": rules_by_baseline_dict
-                },
-                "recent_activity": {
-                    "recent_sessions": recent_sessions_data,
-                    "recent_alerts": recent_alerts_data
-                }
-            }
+            summary = cache.get(GenericConstants.DASHBOARD_SUMMARY_CACHE_KEY)
+            if summary is None:
+                summary = self._build_summary()
+                cache.set(
+                    GenericConstants.DASHBOARD_SUMMARY_CACHE_KEY,
+                    summary,
+                    GenericConstants.DASHBOARD_SUMMARY_CACHE_SECONDS
+                )
+            return summary
 
         except Exception as e:
             self.error = True
             self.set_status_code(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
             return {"message": f"Error retrieving dashboard summary: {str(e)}"}
 
+    @staticmethod
+    def _total(counts, metrics):
+        """Count over the given counter metrics and every severity"""
+        return sum(count for (metric, severity), count in counts.items() if metric in metrics)
+
+    @staticmethod
+    def _by_severity(counts, metrics):
+        """Non-zero counts per severity over the given counter metrics"""
+        by_severity = {
+            severity: sum(counts.get((metric, severity), 0) for metric in metrics)
+            for severity in SEVERITIES
+        }
+        return {severity: count for severity, count in by_severity.items() if count > 0}
+
+    def _build_summary(self):
+        """Compute the summary from the monitoring counters and one aggregate query per small table"""
+        # Get current time for time-based queries
+        now = timezone.now()
+        last_24_hours = now - timedelta(hours=24)
+        last_7_days = now - timedelta(days=7)
+
+        # Baseline Statistics
+        baseline_stats = Baseline.objects.aggregate(
+            total=Count('id', filter=Q(is_active=True))
+        )
+
+        # Monitoring Session Statistics
+        session_stats = MonitoringSession.objects.aggregate(
+            total=Count('id'),
+            completed=Count('id', filter=Q(status='completed')),
+            failed=Count('id', filter=Q(status='failed')),
+            running=Count('id', filter=Q(status='running')),
+            last_24h=Count('id', filter=Q(created_at__gte=last_24_hours)),
+            last_7d=Count('id', filter=Q(created_at__gte=last_7_days)),
+            baselines_monitored=Count('baseline_id', filter=Q(status='completed'), distinct=True)
+        )
+
+        # File change and alert totals come from the counters, time windows from indexed ranges
+        counts = MonitoringCounters.totals_by_metric_and_severity()
+
+        change_metrics = MonitoringCounters.file_change_metrics()
+        change_stats = {
+            'total': self._total(counts, change_metrics),
+            'unacknowledged': self._total(counts, [FILE_CHANGES_OPEN]),
+            'by_severity': self._by_severity(counts, change_metrics),
+            'last_24h': FileChange.objects.filter(detected_at__gte=last_24_hours).count(),
+            'last_7d': FileChange.objects.filter(detected_at__gte=last_7_days).count()
+        }
+
+        alert_metrics = MonitoringCounters.alert_metrics()
+        active_metric = alert_metric(read=False, is_archived=False)
+        alert_stats = {
+            'total': self._total(counts, alert_metrics),
+            'unread': self._total(counts, MonitoringCounters.alert_metrics(read=False)),
+            'archived': self._total(counts, MonitoringCounters.alert_metrics(is_archived=True)),
+            'active': self._total(counts, [active_metric]),
+            'critical': counts.get((active_metric, 'critical'), 0),
+            'by_severity': self._by_severity(counts, alert_metrics),
+            'last_24h': Alert.objects.filter(created_at__gte=last_24_hours).count(),
+            'last_7d': Alert.objects.filter(created_at__gte=last_7_days).count()
+        }
+
+        # Whitelist Rules Statistics
+        rule_stats = WhitelistRule.objects.aggregate(
+            total_rules=Count('id'),
+            active_rules=Count('id', filter=Q(active=True)),
+            inactive_rules=Count('id', filter=Q(active=False))
+        )
+
+        rules_by_baseline = WhitelistRule.objects.values(
+            'baseline__name'
+        ).annotate(count=Count('id'))
+        rules_by_baseline_dict = {
+            item['baseline__name']: item['count']
+            for item in rules_by_baseline
+        }
+
+        # Recent Activity
+        recent_sessions = MonitoringSession.objects.select_related('baseline').order_by(
+            '-created_at'
+        )[:5]
+        recent_sessions_data = []
+        for session in recent_sessions:
+            recent_sessions_data.append({
+                'id': session.id,
+                'baseline_name': session.baseline.name,
+                'status': session.status,
+                'files_scanned': session.files_scanned,
+                'files_changed': session.files_changed,
+                'created_at': session.created_at.isoformat() if session.created_at else None
+            })
+
+        recent_alerts = Alert.objects.order_by('-created_at')[:5]
+        recent_alerts_data = []
+        for alert in recent_alerts:
+            recent_alerts_data.append({
+                'id': alert.id,
+                'severity': alert.severity,
+                'title': alert.title,
+                'read': alert.read,
+                'created_at': alert.created_at.isoformat() if alert.created_at else None
+            })
+
+        # Health Status
+        health_status = self._calculate_health_status(
+            alert_stats['critical'],
+            session_stats['failed'],
+            change_stats['unacknowledged']
+        )
+
+        total_baselines = baseline_stats['total']
+        baselines_monitored = session_stats['baselines_monitored']
+
+        return {
+            "timestamp": now.isoformat(),
+            "health_status": health_status,
+            "baselines": {
+                "total": total_baselines,
+                "monitored": baselines_monitored,
+                "coverage_percentage": (
+                    (baselines_monitored / total_baselines * 100)
+                    if total_baselines > 0 else 0
+                )
+            },
+            "monitoring_sessions": {
+                "total": session_stats['total'],
+                "completed": session_stats['completed'],
+                "failed": session_stats['failed'],
+                "running": session_stats['running'],
+                "last_24h": session_stats['last_24h'],
+                "last_7d": session_stats['last_7d']
+            },
+            "file_changes": {
+                "total": change_stats['total'],
+                "unacknowledged": change_stats['unacknowledged'],
+                "by_severity": change_stats['by_severity'],
+                "last_24h": change_stats['last_24h'],
+                "last_7d": change_stats['last_7d']
+            },
+            "alerts": {
+                "total": alert_stats['total'],
+                "unread": alert_stats['unread'],
+                "archived": alert_stats['archived'],
+                "active": alert_stats['active'],
+                "critical": alert_stats['critical'],
+                "by_severity": alert_stats['by_severity'],
+                "last_24h": alert_stats['last_24h'],
+                "last_7d": alert_stats['last_7d']
+            },
+            "whitelist_rules": {
+                "total": rule_stats['total_rules'],
+                "active": rule_stats['active_rules'],
+                "inactive": rule_stats['inactive_rules'],
+                "by_baseline": rules_by_baseline_dict
+            },
+            "recent_activity": {
+                "recent_sessions": recent_sessions_data,
+                "recent_alerts": recent_alerts_data
+            }
+        }
+
     def _calculate_health_status(self, critical_alerts, failed_sessions, unacknowledged_changes):
         """Calculate overall health status based on key metrics"""
         if critical_alerts > 0 or failed_sessions > 0:
@@ -1,8 +1,11 @@
 from rest_framework import status
+from django.db import transaction
 
 from monitoring.models import FileChange, BaselineFile, Baseline
 from accounts.models import Users
+from monitoring.services.service_helper.block_hasher import BlockHasher
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+from monitoring.services.service_helper.monitoring_counters import MonitoringCounters
 from file_integrity_monitoring.commons.generic_constants import GenericConstants
 from file_integrity_monitoring.commons.commons import Commons
 
@@ -54,22 +57,33 @@ class CreateFileChangesAcknowledgeService(MonitoringServiceHelper):
         old_acknowledged_reason = change.acknowledged_reason
 
         # Acknowledge the change
-        change.acknowledged = True
-        change.user = user
-        change.acknowledged_reason = params.get("acknowledged_reason", "")
-        change.save()
+        with transaction.atomic():
+            # Only the request that flips the flag moves the counters
+            newly_acknowledged = FileChange.objects.filter(
+                id=change.id, acknowledged=False
+            ).update(acknowledged=True, dedup_key=None)
+
+            change.acknowledged = True
+            change.user = user
+            change.acknowledged_reason = params.get("acknowledged_reason", "")
+            change.save()
+
+            if newly_acknowledged:
+                counters = MonitoringCounters()
+                counters.add_file_change(change, -1, acknowledged=False)
+                counters.add_file_change(change)
+                counters.apply()
 
         try:
             baseline_files = BaselineFile.objects.get(id=change.baseline_file.id)
             baseline = Baseline.objects.get(id=baseline_files.baseline.id)
 
-            if baseline.algorithm_type == "sha256":
-                baseline_files.sha256 = change.current_hash
-                baseline_files.save()
+            # Changes found without a whole-file digest, such as an early-exit block check, keep the stored one
+            if change.current_hash:
+                self.set_baseline_hash(baseline_files, baseline.algorithm_type, change.current_hash)
 
-            else:
-                baseline_files.sha512 = change.current_hash
-                baseline_files.save()
+            self.apply_changed_blocks(baseline_files, change.change_details)
+            baseline_files.save()
 
         except BaselineFile.DoesNotExist:
             self.set_status_code(status_code=status.HTTP_404_NOT_FOUND)
@@ -95,4 +109,25 @@ class CreateFileChangesAcknowledgeService(MonitoringServiceHelper):
 
         return {
             "message": GenericConstants.FILE_ACKNOWLEDGE_SUCCESSFUL_MESSAGE,
-        }
\ No newline at end of file
+        }
+
+    @staticmethod
+    def apply_changed_blocks(baseline_file, change_details):
+        """
+            Patch the block digests of a baseline file with those of a complete block comparison
+            @param baseline_file:
+            @param change_details: change_details of the acknowledged change
+            @return: None
+        """
+        change_details = change_details or {}
+        if not change_details.get("complete") or baseline_file.block_size != change_details.get("block_size"):
+            return
+
+        block_count = change_details["block_count"]
+        digests = BlockHasher.decode(baseline_file.block_hashes)[:block_count]
+        digests += [b""] * (block_count - len(digests))
+        for index, digest in change_details["changed_blocks"].items():
+            digests[int(index)] = bytes.fromhex(digest)
+
+        baseline_file.block_hashes = BlockHasher.encode(digests)
+        baseline_file.block_root = change_details["block_root"]
@@ -2,7 +2,12 @@ from rest_framework import status
 
 from monitoring.models import FileChange, Baseline
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+from monitoring.services.service_helper.monitoring_counters import MonitoringCounters
 from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from file_integrity_monitoring.commons.keyset_paginator import KeysetPaginator, InvalidCursor
+
+# Non-null indexed columns that cursor pagination can sort by
+CURSOR_SORT_FIELDS = ("detected_at", "severity", "file_path", "id")
 
 
 class FileChangesGetService(MonitoringServiceHelper):
@@ -28,7 +33,9 @@ class FileChangesGetService(MonitoringServiceHelper):
             "sort_order": data.get("sort_order", "desc"),
             "severity": data.get("severity"),
             "change_type": data.get("change_type"),
-            "acknowledged": data.get("acknowledged")
+            "acknowledged": data.get("acknowledged"),
+            "cursor": data.get("cursor"),
+            "include_total": str(data.get("include_total", "true")).lower() in ['true', '1', 'yes']
         }
 
     def get_data(self, *args, **kwargs):
@@ -57,6 +64,7 @@ class FileChangesGetService(MonitoringServiceHelper):
         if params.get("change_type"):
             queryset = queryset.filter(change_type=params.get("change_type"))
 
+        acknowledged_value = None
         if params.get("acknowledged") is not None:
             acknowledged_value = params.get("acknowledged").lower() in ['true', '1', 'yes']
             queryset = queryset.filter(acknowledged=acknowledged_value)
@@ -69,10 +77,23 @@ class FileChangesGetService(MonitoringServiceHelper):
 
         page = params.get("page")
         page_size = params.get("page_size")
-        start = (page - 1) * page_size
-        end = start + page_size
+        next_cursor = None
 
-        paginated_changes = queryset[start:end]
+        # Cursor pagination unless a later page is requested by number
+        if params.get("cursor") or (page == 1 and params.get("sort_by") in CURSOR_SORT_FIELDS):
+            try:
+                paginator = KeysetPaginator(
+                    queryset, params.get("sort_by"), params.get("sort_order"), CURSOR_SORT_FIELDS
+                )
+                paginated_changes, next_cursor = paginator.get_page(params.get("cursor"), page_size)
+            except InvalidCursor:
+                self.error = True
+                self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+                return {"message": GenericConstants.INVALID_CURSOR_MESSAGE}
+        else:
+            start = (page - 1) * page_size
+            end = start + page_size
+            paginated_changes = queryset[start:end]
 
         changes_data = []
         for change in paginated_changes:
@@ -87,10 +108,24 @@ class FileChangesGetService(MonitoringServiceHelper):
             }
             changes_data.append(change_dict)
 
+        total, total_is_approximate = None, False
+        if params.get("include_total"):
+            # Counters cover every filter except the change type
+            if params.get("change_type"):
+                total, total_is_approximate = KeysetPaginator.capped_count(queryset)
+            else:
+                total = MonitoringCounters.total(
+                    MonitoringCounters.file_change_metrics(acknowledged_value),
+                    baseline_id=params.get("baseline_id"),
+                    severity=params.get("severity")
+                )
+
         return {
             "changes": changes_data,
-            "total": queryset.count(),
+            "total": total,
+            "total_is_approximate": total_is_approximate,
             "page": page,
             "page_size": page_size,
+            "next_cursor": next_cursor,
             "baseline_id": params.get("baseline_id")
         }
\ No newline at end of file
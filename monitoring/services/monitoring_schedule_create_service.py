@@ -0,0 +1,102 @@
+from rest_framework import status
+
+from file_integrity_monitoring.commons.commons import Commons
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.models import Baseline, MonitoringSchedule
+from monitoring.services.service_helper.cron_schedule import CronSchedule
+from monitoring.services.service_helper.monitoring_scheduler import MonitoringScheduler
+from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+
+
+class MonitoringScheduleCreateService(MonitoringServiceHelper):
+    """Service to create a periodic monitoring schedule for a baseline"""
+
+    def __init__(self):
+        super().__init__()
+
+    def get_request_params(self, *args, **kwargs):
+        """Extract schedule parameters"""
+        data = kwargs.get("data")
+        return {
+            "baseline_id": data.get("baseline_id"),
+            "monitor_type": data.get("monitor_type", "full"),
+            "cron_expression": data.get("cron_expression"),
+            "jitter_seconds": data.get("jitter_seconds", GenericConstants.SCHEDULER_DEFAULT_JITTER_SECONDS),
+            "enabled": data.get("enabled", True),
+            "user_id": data.get("user_id")
+        }
+
+    def get_data(self, *args, **kwargs):
+        """Validate the cron expression and create the schedule with its first run time"""
+        params = self.get_request_params(*args, **kwargs)
+
+        if not params.get("baseline_id"):
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.BASELINE_ID_REQUIRED_MESSAGE}
+
+        if not params.get("cron_expression"):
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.CRON_EXPRESSION_REQUIRED_MESSAGE}
+
+        if params.get("monitor_type") not in dict(MonitoringSchedule.MONITOR_TYPE_CHOICES):
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.INVALID_MONITOR_TYPE_MESSAGE}
+
+        try:
+            CronSchedule(params.get("cron_expression"))
+            jitter_seconds = int(params.get("jitter_seconds"))
+            if jitter_seconds < 0:
+                raise ValueError("Jitter seconds must not be negative")
+        except (TypeError, ValueError) as e:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": str(e)}
+
+        try:
+            baseline = Baseline.objects.get(id=params.get("baseline_id"))
+        except Baseline.DoesNotExist:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_404_NOT_FOUND)
+            return {"message": GenericConstants.BASELINE_NOT_FOUND_MESSAGE}
+
+        try:
+            schedule = MonitoringSchedule(
+                baseline=baseline,
+                monitor_type=params.get("monitor_type"),
+                cron_expression=params.get("cron_expression").strip(),
+                jitter_seconds=jitter_seconds,
+                enabled=bool(params.get("enabled")),
+                user_id=params.get("user_id") or baseline.user_id
+            )
+            if schedule.enabled:
+                schedule.next_run_at = MonitoringScheduler.compute_next_run(schedule)
+            schedule.save()
+
+            Commons.create_audit_log(
+                user_id=params.get("user_id"),
+                action="create",
+                resource_type="MonitoringSchedule",
+                resource_id=schedule.id,
+                new_values={
+                    "baseline_id": baseline.id,
+                    "monitor_type": schedule.monitor_type,
+                    "cron_expression": schedule.cron_expression,
+                    "jitter_seconds": schedule.jitter_seconds,
+                    "enabled": schedule.enabled
+                }
+            )
+
+            self.set_status_code(status_code=status.HTTP_201_CREATED)
+            return {
+                "message": GenericConstants.SCHEDULE_CREATE_SUCCESSFUL_MESSAGE,
+                "schedule_id": schedule.id,
+                "next_run_at": schedule.next_run_at.isoformat() if schedule.next_run_at else None
+            }
+
+        except Exception as e:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return {"message": f"Error creating schedule: {str(e)}"}
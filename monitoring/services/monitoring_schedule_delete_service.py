@@ -0,0 +1,66 @@
+from rest_framework import status
+
+from file_integrity_monitoring.commons.commons import Commons
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.models import MonitoringSchedule
+from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+
+
+class MonitoringScheduleDeleteService(MonitoringServiceHelper):
+    """Service to delete a monitoring schedule"""
+
+    def __init__(self):
+        super().__init__()
+
+    def get_request_params(self, *args, **kwargs):
+        """Extract schedule parameters"""
+        data = kwargs.get("data")
+        return {
+            "schedule_id": data.get("schedule_id"),
+            "user_id": data.get("user_id")
+        }
+
+    def get_data(self, *args, **kwargs):
+        """Delete schedule; sessions it already started are kept"""
+        params = self.get_request_params(*args, **kwargs)
+
+        if not params.get("schedule_id"):
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.SCHEDULE_ID_REQUIRED_MESSAGE}
+
+        try:
+            schedule = MonitoringSchedule.objects.get(id=params.get("schedule_id"))
+        except MonitoringSchedule.DoesNotExist:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_404_NOT_FOUND)
+            return {"message": GenericConstants.SCHEDULE_NOT_FOUND_MESSAGE}
+
+        try:
+            schedule_id = schedule.id
+            old_values = {
+                "baseline_id": schedule.baseline_id,
+                "monitor_type": schedule.monitor_type,
+                "cron_expression": schedule.cron_expression,
+                "enabled": schedule.enabled
+            }
+
+            schedule.delete()
+
+            Commons.create_audit_log(
+                user_id=params.get("user_id"),
+                action="delete",
+                resource_type="MonitoringSchedule",
+                resource_id=schedule_id,
+                old_values=old_values
+            )
+
+            self.set_status_code(status_code=status.HTTP_200_OK)
+            return {
+                "message": GenericConstants.SCHEDULE_DELETE_SUCCESSFUL_MESSAGE
+            }
+
+        except Exception as e:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return {"message": f"Error deleting schedule: {str(e)}"}
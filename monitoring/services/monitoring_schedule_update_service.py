@@ -0,0 +1,107 @@
+from rest_framework import status
+
+from file_integrity_monitoring.commons.commons import Commons
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.models import MonitoringSchedule
+from monitoring.services.service_helper.cron_schedule import CronSchedule
+from monitoring.services.service_helper.monitoring_scheduler import MonitoringScheduler
+from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+
+
+class MonitoringScheduleUpdateService(MonitoringServiceHelper):
+    """Service to update a monitoring schedule"""
+
+    def __init__(self):
+        super().__init__()
+
+    def get_request_params(self, *args, **kwargs):
+        """Extract schedule parameters"""
+        data = kwargs.get("data")
+        return {
+            "schedule_id": data.get("schedule_id"),
+            "monitor_type": data.get("monitor_type"),
+            "cron_expression": data.get("cron_expression"),
+            "jitter_seconds": data.get("jitter_seconds"),
+            "enabled": data.get("enabled"),
+            "user_id": data.get("user_id")
+        }
+
+    def get_data(self, *args, **kwargs):
+        """Update the schedule and recompute its next run"""
+        params = self.get_request_params(*args, **kwargs)
+
+        if not params.get("schedule_id"):
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.SCHEDULE_ID_REQUIRED_MESSAGE}
+
+        try:
+            schedule = MonitoringSchedule.objects.get(id=params.get("schedule_id"))
+        except MonitoringSchedule.DoesNotExist:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_404_NOT_FOUND)
+            return {"message": GenericConstants.SCHEDULE_NOT_FOUND_MESSAGE}
+
+        if params.get("monitor_type") is not None and \
+                params.get("monitor_type") not in dict(MonitoringSchedule.MONITOR_TYPE_CHOICES):
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.INVALID_MONITOR_TYPE_MESSAGE}
+
+        try:
+            if params.get("cron_expression") is not None:
+                CronSchedule(params.get("cron_expression"))
+            if params.get("jitter_seconds") is not None and int(params.get("jitter_seconds")) < 0:
+                raise ValueError("Jitter seconds must not be negative")
+        except (TypeError, ValueError) as e:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": str(e)}
+
+        try:
+            old_values = {
+                "monitor_type": schedule.monitor_type,
+                "cron_expression": schedule.cron_expression,
+                "jitter_seconds": schedule.jitter_seconds,
+                "enabled": schedule.enabled
+            }
+
+            if params.get("monitor_type") is not None:
+                schedule.monitor_type = params.get("monitor_type")
+
+            if params.get("cron_expression") is not None:
+                schedule.cron_expression = params.get("cron_expression").strip()
+
+            if params.get("jitter_seconds") is not None:
+                schedule.jitter_seconds = int(params.get("jitter_seconds"))
+
+            if params.get("enabled") is not None:
+                schedule.enabled = bool(params.get("enabled"))
+
+            schedule.next_run_at = MonitoringScheduler.compute_next_run(schedule) if schedule.enabled else None
+            schedule.save()
+
+            Commons.create_audit_log(
+                user_id=params.get("user_id"),
+                action="update",
+                resource_type="MonitoringSchedule",
+                resource_id=schedule.id,
+                old_values=old_values,
+                new_values={
+                    "monitor_type": schedule.monitor_type,
+                    "cron_expression": schedule.cron_expression,
+                    "jitter_seconds": schedule.jitter_seconds,
+                    "enabled": schedule.enabled
+                }
+            )
+
+            self.set_status_code(status_code=status.HTTP_200_OK)
+            return {
+                "message": GenericConstants.SCHEDULE_UPDATE_SUCCESSFUL_MESSAGE,
+                "next_run_at": schedule.next_run_at.isoformat() if schedule.next_run_at else None
+            }
+
+        except Exception as e:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return {"message": f"Error updating schedule: {str(e)}"}
@@ -0,0 +1,86 @@
+from django.db.models import Q
+from rest_framework import status
+
+from monitoring.models import MonitoringSchedule
+from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+
+
+class MonitoringSchedulesGetService(MonitoringServiceHelper):
+    """Service to get monitoring schedules with pagination and filtering"""
+
+    def __init__(self):
+        super().__init__()
+
+    def get_request_params(self, *args, **kwargs):
+        """Extract schedule list parameters"""
+        data = kwargs.get("data")
+        return {
+            "page": data.get("page", "1"),
+            "page_size": data.get("page_size", "10"),
+            "baseline_id": data.get("baseline_id"),
+            "enabled": data.get("enabled")
+        }
+
+    def get_data(self, *args, **kwargs):
+        """Get schedules with their next run and last session"""
+        params = self.get_request_params(*args, **kwargs)
+
+        try:
+            filters = Q()
+
+            if params.get("baseline_id"):
+                filters &= Q(baseline_id=params.get("baseline_id"))
+
+            if params.get("enabled") is not None:
+                enabled = params.get("enabled")
+                if isinstance(enabled, str):
+                    enabled = enabled.lower() == 'true'
+                filters &= Q(enabled=enabled)
+
+            total_count = MonitoringSchedule.objects.filter(filters).count()
+
+            page = int(params.get("page", 1))
+            page_size = int(params.get("page_size", 10))
+            start = (page - 1) * page_size
+            end = start + page_size
+
+            schedules = MonitoringSchedule.objects.filter(filters).select_related(
+                'baseline', 'last_session'
+            )[start:end]
+
+            schedules_data = []
+            for schedule in schedules:
+                schedules_data.append({
+                    'id': schedule.id,
+                    'baseline_id': schedule.baseline_id,
+                    'baseline_name': schedule.baseline.name,
+                    'monitor_type': schedule.monitor_type,
+                    'cron_expression': schedule.cron_expression,
+                    'jitter_seconds': schedule.jitter_seconds,
+                    'enabled': schedule.enabled,
+                    'next_run_at': schedule.next_run_at.isoformat() if schedule.next_run_at else None,
+                    'last_run_at': schedule.last_run_at.isoformat() if schedule.last_run_at else None,
+                    'last_session_id': schedule.last_session_id,
+                    'last_session_status': schedule.last_session.status if schedule.last_session else None,
+                    'skipped_runs': schedule.skipped_runs,
+                    'last_skipped_at': schedule.last_skipped_at.isoformat() if schedule.last_skipped_at else None,
+                    'user_id': schedule.user_id,
+                    'created_at': schedule.created_at.isoformat() if schedule.created_at else None,
+                    'updated_at': schedule.updated_at.isoformat() if schedule.updated_at else None,
+                })
+
+            total_pages = (total_count + page_size - 1) // page_size
+
+            self.set_status_code(status_code=status.HTTP_200_OK)
+            return {
+                "total_count": total_count,
+                "page": page,
+                "page_size": page_size,
+                "total_pages": total_pages,
+                "schedules": schedules_data
+            }
+
+        except Exception as e:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            return {"message": f"Error retrieving schedules: {str(e)}"}
@@ -0,0 +1,77 @@
+from django.utils import timezone
+from rest_framework import status
+
+from file_integrity_monitoring.commons.commons import Commons
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.models import MonitoringJob, MonitoringSession
+from monitoring.services.dashboard_summary_get_service import DashboardSummaryGetService
+from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+
+
+class MonitoringSessionCancelService(MonitoringServiceHelper):
+    """Service to cancel a queued or running monitoring session"""
+
+    def __init__(self):
+        super().__init__()
+
+    def get_request_params(self, *args, **kwargs):
+        """
+        Extract session cancel parameters
+        @params args: positional parameters
+        @params kwargs: keyword parameters
+        @return request parameters
+        """
+        data = kwargs.get("data")
+        return {
+            "monitor_session_id": data.get("monitor_session_id"),
+            "user_id": data.get("user_id")
+        }
+
+    def get_data(self, *args, **kwargs):
+        """
+        Mark the session cancelled; a running scan stops at its next progress update
+        @params args: positional parameters
+        @params kwargs: keyword parameters
+        @return response data
+        """
+        params = self.get_request_params(*args, **kwargs)
+
+        if not params.get("monitor_session_id"):
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.SESSION_ID_REQUIRED_MESSAGE}
+
+        if not MonitoringSession.objects.filter(id=params.get("monitor_session_id")).exists():
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_404_NOT_FOUND)
+            return {"message": GenericConstants.MONITORING_SESSION_NOT_FOUND_MESSAGE}
+
+        cancelled = MonitoringSession.objects.filter(
+            id=params.get("monitor_session_id"),
+            status__in=[GenericConstants.SESSION_STATUS_QUEUED, GenericConstants.SESSION_STATUS_RUNNING]
+        ).update(status=GenericConstants.SESSION_STATUS_CANCELLED, end_time=timezone.now())
+
+        if not cancelled:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.MONITORING_SESSION_NOT_CANCELLABLE_MESSAGE}
+
+        DashboardSummaryGetService.invalidate_cache()
+
+        # Queued jobs are dropped here, running ones finish as cancelled in the runner
+        MonitoringJob.objects.filter(
+            session_id=params.get("monitor_session_id"),
+            status=GenericConstants.SESSION_STATUS_QUEUED
+        ).update(status=GenericConstants.SESSION_STATUS_CANCELLED, finished_at=timezone.now())
+
+        Commons.create_audit_log(
+            user_id=params.get("user_id"),
+            action="update",
+            resource_type="MonitoringSession",
+            resource_id=params.get("monitor_session_id"),
+            new_values={"status": GenericConstants.SESSION_STATUS_CANCELLED}
+        )
+
+        return {
+            "message": GenericConstants.MONITORING_SESSION_CANCEL_SUCCESSFUL_MESSAGE
+        }
@@ -1,33 +1,55 @@
 import os
+import stat
 
+from django.db import transaction
+from django.db.models import F
 from django.utils import timezone
 from rest_framework import status
 
 from file_integrity_monitoring.commons.commons import Commons
 from file_integrity_monitoring.commons.generic_constants import GenericConstants
-from monitoring.models import MonitoringSession, Baseline, FileChange, BaselineFile
-from monitoring.services.alert_create_service import AlertCreateService
+from monitoring.models import MonitoringSession, Baseline, BaselineFile
+from monitoring.services.dashboard_summary_get_service import DashboardSummaryGetService
+from monitoring.services.service_helper.block_hasher import BlockHasher
+from monitoring.services.service_helper.file_change_recorder import FileChangeRecorder
+from monitoring.services.service_helper.exclude_matcher import ExcludeMatcher
+from monitoring.services.service_helper.incremental_directory_walker import IncrementalDirectoryWalker
+from monitoring.services.service_helper.io_governor import IoGovernor
+from monitoring.services.service_helper.monitoring_job_runner import MonitoringJobRunner
+from monitoring.services.service_helper.monitoring_session_reaper import SessionHeartbeat
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+from monitoring.services.service_helper.rolling_slice import RollingSlice
+from monitoring.services.service_helper.session_checkpoint import ScanWatermark
+
+
+class MonitoringSessionCancelled(Exception):
+    """Raised inside a scan once its session has been cancelled"""
 
 
 class MonitoringSessionCreateService(MonitoringServiceHelper):
-    """Service to orchestrate monitoring session, scan files, compare hashes, and create alerts"""
+    """Service to queue and run monitoring sessions: scan files, compare hashes, and create alerts"""
 
     def __init__(self):
         super().__init__()
+        # Prefilter checksums of unchanged baseline files, written in batches
+        self._checksum_updates = []
+        # Job attempt running the session: session writes are conditional on it
+        self._attempt = 0
 
     def get_request_params(self, *args, **kwargs):
         """Extract monitoring session parameters"""
         data = kwargs.get("data")
         return {
             "baseline_id": data.get("baseline_id"),
-            "monitor_type": data.get("monitor_type", "full"),  # full, incremental, quick
+            "monitor_type": data.get("monitor_type", "full"),  # full, incremental, structural, quick, rolling
             "description": data.get("description", ""),
-            "user_id": data.get("user_id")
+            "user_id": data.get("user_id"),
+            # Read a sample of the files the hash cache would skip, to check the cache
+            "paranoid": data.get("paranoid", False)
         }
 
     def get_data(self, *args, **kwargs):
-        """Execute monitoring session: scan files, compare hashes, create file changes and alerts"""
+        """Queue a monitoring session for the job runner and return its id"""
         params = self.get_request_params(*args, **kwargs)
 
         # Validate baseline_id
@@ -45,37 +67,95 @@ class MonitoringSessionCreateService(MonitoringServiceHelper):
             return {"message": GenericConstants.BASELINE_NOT_FOUND_MESSAGE}
 
         # Validate baseline has files scanned
-        if baseline.baseline_files.count() == 0:
+        if not baseline.baseline_files.exists():
             self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
             return {"message": GenericConstants.BASELINE_FILES_COUNT_ERROR_MESSAGE}
 
-        # Create monitoring session
+        # Create monitoring session and hand it to the job runner
         session = MonitoringSession(
             baseline=baseline,
             monitor_type=params.get("monitor_type"),
             description=params.get("description"),
-            status='running',
+            status=GenericConstants.SESSION_STATUS_QUEUED,
             user_id=params.get("user_id")
         )
         session.save()
 
+        paranoid = params.get("paranoid")
+        if isinstance(paranoid, str):
+            paranoid = paranoid.lower() == 'true'
+
+        MonitoringJobRunner.enqueue(session, {
+            "monitor_type": params.get("monitor_type"),
+            "user_id": params.get("user_id"),
+            "paranoid": bool(paranoid)
+        })
+
+        self.set_status_code(status_code=status.HTTP_202_ACCEPTED)
+        return {
+            "message": GenericConstants.MONITORING_SESSION_QUEUED_MESSAGE,
+            "session_id": session.id,
+            "status": session.status
+        }
+
+    def run_session(self, session_id, params, attempt=0):
+        """
+        Execute a queued monitoring session: scan files, compare hashes, create file changes and alerts
+        @param session_id:
+        @param params: Job parameters (monitor_type, user_id, paranoid, and max_bytes_per_second for scheduled runs)
+        @param attempt: Attempt of the job; a later attempt takes the session over from this one
+        @return: Final session status
+        """
+        session = MonitoringSession.objects.select_related('baseline').get(id=session_id)
+        baseline = session.baseline
+
+        self.io_throttle = IoGovernor.for_baseline(baseline, params.get("max_bytes_per_second") or 0)
+        if params.get("paranoid"):
+            self.paranoid_sample = GenericConstants.HASH_CACHE_PARANOID_SAMPLE
+
+        # A session cancelled while queued is never started; a resumed session keeps its start time
+        checkpoint = (session.metadata or {}).get("checkpoint")
+        now = timezone.now()
+        start_fields = {"status": GenericConstants.SESSION_STATUS_RUNNING, "attempt": attempt, "updated_at": now}
+        if not checkpoint:
+            start_fields["start_time"] = now
+        started = MonitoringSession.objects.filter(
+            id=session.id, status=GenericConstants.SESSION_STATUS_QUEUED
+        ).update(**start_fields)
+        if not started:
+            return GenericConstants.SESSION_STATUS_CANCELLED
+        self._attempt = attempt
+        DashboardSummaryGetService.invalidate_cache()
+        session.refresh_from_db()
+
+        heartbeat = SessionHeartbeat(session.id, attempt)
+        heartbeat.start()
+        is_finished = False
         try:
             # Scan directory and compare hashes
             scan_results = self._scan_and_compare(
                 baseline,
                 params.get("monitor_type"),
-                params.get("user_id")
+                params.get("user_id"),
+                session,
+                checkpoint
             )
 
             # Update session statistics
-            session.files_monitored = scan_results['files_scanned']
-            session.changes_detected = scan_results['changes_found']
-            session.files_added = scan_results['files_added']
-            session.files_deleted = scan_results['files_deleted']
-            session.files_modified = scan_results['files_modified']
-            session.status = 'completed'
+            self._apply_results(session, scan_results)
+            session.metadata.pop("checkpoint", None)
             session.end_time = timezone.now()
-            session.save()
+            if scan_results['cancelled']:
+                session.status = GenericConstants.SESSION_STATUS_CANCELLED
+            else:
+                session.status = GenericConstants.SESSION_STATUS_COMPLETED
+            if not self._finish_session(session):
+                # Reaped as abandoned and queued again; the next run owns the session
+                return GenericConstants.SESSION_STATUS_QUEUED
+            is_finished = True
+            self._record_last_scan(baseline, session)
+            if params.get("monitor_type") == 'rolling' and session.status == GenericConstants.SESSION_STATUS_COMPLETED:
+                RollingSlice.for_session(baseline, session).record_verified(baseline.id, session.start_time)
 
             # Create audit log
             Commons.create_audit_log(
@@ -86,184 +166,655 @@ class MonitoringSessionCreateService(MonitoringServiceHelper):
                 new_values={
                     "baseline_id": baseline.id,
                     "monitor_type": params.get("monitor_type"),
-                    "files_monitored": session.files_monitored,
-                    "changes_detected": session.changes_detected,
+                    "status": session.status,
+                    "files_scanned": session.files_scanned,
+                    "files_changed": session.files_changed,
                     "alerts_created": scan_results['alerts_created']
                 }
             )
 
-            self.set_status_code(status_code=status.HTTP_201_CREATED)
-            return {
-                "message": GenericConstants.MONITORING_SESSION_CREATE_SUCCESSFUL_MESSAGE,
-            }
-
         except Exception as e:
+            if is_finished:
+                # The session's outcome is stored; only its follow-up writes failed
+                print(f"Error finishing monitoring session {session.id}: {str(e)}")
+                return session.status
+
             # Handle errors
-            session.status = 'failed'
+            session.status = GenericConstants.SESSION_STATUS_FAILED
             session.error_message = str(e)
+            session.metadata.pop("checkpoint", None)
             session.end_time = timezone.now()
-            session.save()
+            if not self._finish_session(session):
+                return GenericConstants.SESSION_STATUS_QUEUED
+            self._record_last_scan(baseline, session)
 
-            self.error = True
-            self.set_status_code(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            return {
-                "message": f"Monitoring session failed: {str(e)}",
-                "session_id": session.id,
-                "status": "failed"
-            }
-
-    def _scan_and_compare(self, baseline, monitor_type, user_id):
+        finally:
+            heartbeat.stop()
+            self.io_throttle.close()
+
+        return session.status
+
+    def _finish_session(self, session):
+        """
+        Write the session's final status and counters, unless it was reaped and queued again or
+        taken over by a later attempt meanwhile
+        @param session:
+        @return: True when written
+        """
+        return MonitoringSession.objects.filter(
+            id=session.id,
+            attempt=self._attempt,
+            status__in=(GenericConstants.SESSION_STATUS_RUNNING, GenericConstants.SESSION_STATUS_CANCELLED)
+        ).update(
+            status=session.status,
+            error_message=session.error_message,
+            end_time=session.end_time,
+            files_scanned=session.files_scanned,
+            files_changed=session.files_changed,
+            files_critical=session.files_critical,
+            files_added=session.files_added,
+            files_deleted=session.files_deleted,
+            metadata=session.metadata,
+            updated_at=timezone.now()
+        ) > 0
+
+    @staticmethod
+    def _record_last_scan(baseline, session):
+        """Copy the finished session's outcome onto its baseline"""
+        Baseline.objects.filter(id=baseline.id).update(
+            last_scan_at=session.end_time,
+            last_scan_status=session.status,
+            last_scan_files_changed=session.files_changed
+        )
+
+    def _apply_results(self, session, results):
+        """Copy scan counters, and the read throughput when a governor paces the scan, onto the session"""
+        session.files_scanned = results['files_scanned']
+        session.files_changed = results['changes_found']
+        session.files_critical = results['files_critical']
+        session.files_added = results['files_added']
+        session.files_deleted = results['files_deleted']
+        session.metadata = {
+            **session.metadata,
+            "files_modified": results['files_modified'],
+            "files_expected": results['files_expected'],
+            "directories_skipped": results['directories_skipped'],
+            "changes_whitelisted": results['changes_whitelisted'],
+            "hash_cache_hits": results['hash_cache_hits'],
+            "hash_cache_mismatches": results['hash_cache_mismatches'],
+            "checksum_mismatches": results['checksum_mismatches'],
+            "alerts_created": results['alerts_created'],
+            "errors": results['errors']
+        }
+        if isinstance(self.io_throttle, IoGovernor):
+            session.metadata["io"] = self.io_throttle.describe()
+
+    def _report_progress(self, session, results, force=False):
+        """
+        Write scan counters to the session every SESSION_PROGRESS_INTERVAL_FILES calls or
+        SESSION_PROGRESS_INTERVAL_SECONDS seconds, and stop the scan once it has been cancelled
+        """
+        if session is None:
+            return
+
+        self._progress_ticks += 1
+        now = timezone.now()
+        seconds_since = (now - self._progress_time).total_seconds()
+        if not force and self._progress_ticks < GenericConstants.SESSION_PROGRESS_INTERVAL_FILES \
+                and seconds_since < GenericConstants.SESSION_PROGRESS_INTERVAL_SECONDS:
+            return
+
+        self._progress_ticks = 0
+        self._progress_time = now
+
+        self._apply_results(session, results)
+        session.metadata['progress_updated_at'] = now.isoformat()
+
+        if self._checkpoint is not None and (force or (now - self._checkpoint_time).total_seconds() >=
+                                             GenericConstants.SESSION_CHECKPOINT_INTERVAL_SECONDS):
+            self._checkpoint_time = now
+            session.metadata['checkpoint'] = self._build_checkpoint(results)
+
+        # The cancel endpoint and the reaper move the session out of running, and a later attempt
+        # takes it over; the conditional update notices both
+        updated = MonitoringSession.objects.filter(
+            id=session.id, status=GenericConstants.SESSION_STATUS_RUNNING, attempt=self._attempt
+        ).update(
+            files_scanned=session.files_scanned,
+            files_changed=session.files_changed,
+            files_critical=session.files_critical,
+            files_added=session.files_added,
+            files_deleted=session.files_deleted,
+            metadata=session.metadata,
+            updated_at=now
+        )
+        if not updated:
+            raise MonitoringSessionCancelled(session.id)
+
+    def _build_checkpoint(self, results):
+        """
+        Snapshot the scan so a new run can resume it: every path up to last_path is compared and
+        its changes, deletions included, are written. The resumed run merges the walk and the
+        baseline from last_path on, so files this session added past it are found like any other.
+        Change counters may include the few files that finished hashing past last_path; their
+        changes are counted again on resume.
+        """
+        state = self._checkpoint
+        # Changes of every compared path must be stored before the checkpoint claims them
+        self.change_recorder.flush()
+
+        return {
+            "last_path": state["watermark"].last_path,
+            "results": {
+                **{key: value for key, value in results.items() if key != 'cancelled'},
+                "files_scanned": state["watermark"].completed,
+                "alerts_created": state["offsets"]["alerts_created"] + self.change_recorder.alerts_created,
+                "changes_whitelisted": (
+                    state["offsets"]["changes_whitelisted"] + self.change_recorder.changes_whitelisted
+                ),
+                "errors": results['errors'] + self.change_recorder.errors
+            },
+            "updated_at": timezone.now().isoformat()
+        }
+
+    def _scan_and_compare(self, baseline, monitor_type, user_id, session=None, checkpoint=None):
         """
         Scan directory and compare files against baseline.
 
         Scan Types:
         - full: Scan all files, calculate hashes, detect all changes
-        - incremental: Scan only recently modified files
+        - incremental: Stat all files, hash those whose mtime or size moved
+        - structural: As incremental, over the directories whose fingerprint changed only; files of
+          unchanged directories are not stat'ed, so in-place edits there go unseen
         - quick: Compare file size and mtime only (no hashing)
+        - rolling: Stat-check all files, hash those whose size or mtime moved and the
+          files of the baseline's next RollingSlice, so rolling_slices sessions verify every file
+
+        Files that need hashing are fed to the baseline's hashing engine and
+        compared as their digests come back, in completion order.
+        Changes and their alerts are written in batches by a FileChangeRecorder.
+        When a session is given, progress is written to it periodically and a
+        cancelled session stops the scan.
+
+        The walk and the baseline's files are both streamed in path order and merge-joined,
+        loading only the compared columns chunk by chunk, so memory does not grow with the
+        baseline: a baseline path the walk passes without finding is deleted.
+
+        Baselines with checksum_prefilter hash with the prefilter checksum only and digest
+        the files whose checksum differs, except in a full session due for verification.
+
+        Files of at least the baseline's block_hash_threshold that need hashing are compared
+        block by block on the BlockHasher's threads instead, and the changed byte ranges are
+        recorded in the change's change_details.
+
+        Full and quick scans of a session also write a checkpoint every
+        SESSION_CHECKPOINT_INTERVAL_SECONDS; given one, both streams skip the paths
+        the checkpoint covers.
+        Structural scans are short and start over.
         """
-        results = {
-            'files_scanned': 0,
-            'changes_found': 0,
-            'files_added': 0,
-            'files_deleted': 0,
-            'files_modified': 0,
-            'alerts_created': 0,
-            'errors': 0
-        }
+        results = self._empty_results()
+
+        self.change_recorder = FileChangeRecorder(baseline, user_id)
+        self._progress_ticks = 0
+        self._progress_time = timezone.now()
+        self._checkpoint = None
+        self._checkpoint_time = self._progress_time
+        offsets = {'alerts_created': 0, 'changes_whitelisted': 0}
 
         try:
-            # Get baseline files for comparison
-            baseline_files = {bf.file_path: bf for bf in baseline.baseline_files.all()}
-
-            # Track which baseline files we found (for detecting deletions)
-            found_baseline_files = set()
-
-            # Walk directory and scan files based on type
-            for root, dirs, files in os.walk(baseline.path):
-                # Filter excluded directories
-                dirs[:] = [d for d in dirs if not self.should_exclude(
-                    os.path.join(root, d),
-                    baseline.exclude_patterns
-                )]
-
-                # Process files
-                for file in files:
-                    file_path = os.path.join(root, file)
-
-                    # Skip excluded files
-                    if self.should_exclude(file_path, baseline.exclude_patterns):
-                        continue
+            watermark = None
+            if session is not None and monitor_type != 'structural':
+                if checkpoint:
+                    results.update(checkpoint["results"])
+                    watermark = ScanWatermark(checkpoint["last_path"], results['files_scanned'])
+                    offsets = {key: results[key] for key in offsets}
+                else:
+                    watermark = ScanWatermark()
+                self._checkpoint = {"watermark": watermark, "offsets": offsets}
+
+            # A resumed scan keeps the count it started with, without the files it added since
+            if not checkpoint or watermark is None:
+                results['files_expected'] = BaselineFile.objects.filter(baseline_id=baseline.id).count()
+
+            rolling_slice = RollingSlice.for_session(baseline, session) if monitor_type == 'rolling' else None
+
+            # Structural scans skip the files of directories whose fingerprint is unchanged
+            walker = None
+            start_after = watermark.last_path if watermark else None
+            if monitor_type == 'structural':
+                walker = IncrementalDirectoryWalker.for_baseline(self, baseline)
+                scanned_files = walker.walk()
+            else:
+                scanned_files = self.walk_files(baseline.path, baseline.exclude_patterns, start_after=start_after)
+
+            # New files need every stored digest, existing ones only the compared one; both come from one read
+            engine = self.get_hashing_engine(baseline)
+            if rolling_slice is not None:
+                # Verifying the slice means reading it, whatever the hash cache holds
+                engine.bypass_cache = rolling_slice.contains
+            algorithms, checksum_verification = self._get_scan_algorithms(baseline, monitor_type, session)
+            self.block_hasher = self.get_block_hasher(baseline)
+            self._checksum_updates = []
+
+            # Both streams are in ascending path order: a baseline row the walk has passed is gone from disk
+            baseline_rows = self.iter_baseline_file_rows(baseline, start_after=start_after)
+            next_row = next(baseline_rows, None)
+            # Rows of the files out for hashing, until their digests come back
+            hashing_rows = {}
+
+            def record_deleted(baseline_file):
+                self._report_progress(session, results)
+                # The walker has visited the directory of every path it has passed
+                if walker is not None and walker.is_unchanged(baseline_file.file_path):
+                    return
+                change = self._create_file_change(
+                    file_path=baseline_file.file_path,
+                    baseline=baseline,
+                    baseline_file=baseline_file,
+                    change_type='deleted',
+                    current_hash=None,
+                    severity='high',
+                    user_id=user_id
+                )
+                self._count_change(results, change, 'files_deleted')
 
+            def files_to_hash():
+                # Walk directory once, run the stat-only checks inline and yield paths that need a digest
+                nonlocal next_row
+                for file_path, stat_info in scanned_files:
                     results['files_scanned'] += 1
+                    self._report_progress(session, results)
+                    if watermark is not None:
+                        watermark.started(file_path)
+
+                    while next_row is not None and next_row.file_path < file_path:
+                        record_deleted(next_row)
+                        next_row = next(baseline_rows, None)
 
-                    if file_path in baseline_files:
+                    if next_row is not None and next_row.file_path == file_path:
                         # File exists in baseline - check for modifications
-                        found_baseline_files.add(file_path)
-                        baseline_file = baseline_files[file_path]
-
-                        change = self._compare_file(
-                            file_path,
-                            baseline_file,
-                            baseline,
-                            monitor_type,
-                            user_id
-                        )
+                        baseline_file, next_row = next_row, next(baseline_rows, None)
 
-                        if change:
-                            results['changes_found'] += 1
-                            results['files_modified'] += 1
-                            results['alerts_created'] += 1
-                    else:
-                        stat_info = os.stat(file_path)
-                        file_size = stat_info.st_size
-                        permissions = stat_info.st_mode
-                        uid = stat_info.st_uid
-                        gid = stat_info.st_gid
-                        inode = stat_info.st_ino
-                        hard_links = stat_info.st_nlink
-                        mtime = stat_info.st_mtime
-                        atime = stat_info.st_atime
-                        ctime = stat_info.st_ctime
-
-                        sha512, sha256 = None, None
-                        if baseline.algorithm_type == GenericConstants.ALGORITHM_SHA512:
-                            is_success, sha512 = self.calculate_hash(file_path, baseline.algorithm_type)
-                        else:
-                            is_success, sha256 = self.calculate_hash(file_path, baseline.algorithm_type)
-                        baseline_file = BaselineFile.objects.create(
-                            baseline=baseline,
-                            file_path=file_path,
-                            file_name=os.path.basename(file_path),
-                            sha256=sha256,
-                            sha512=sha512,
-                            file_size=file_size,
-                            permissions=permissions,
-                            uid=uid,
-                            gid=gid,
-                            inode=inode,
-                            hard_links=hard_links,
-                            mtime=mtime,
-                            atime=atime,
-                            ctime=ctime,
-                            metadata={}
+                        needs_hash = self._needs_hash(stat_info, baseline_file, monitor_type) or (
+                            rolling_slice is not None and rolling_slice.contains(file_path)
                         )
+                        if not needs_hash:
+                            change = self._compare_file(
+                                file_path, baseline_file, baseline, monitor_type, user_id, stat_info
+                            )
+                            self._count_change(results, change, 'files_modified')
+                            if watermark is not None:
+                                watermark.finished(file_path)
+                            continue
+
+                        if self.uses_block_hashes(baseline, stat_info):
+                            is_compared, change = self._compare_blocks(
+                                engine, file_path, baseline_file, baseline, monitor_type, user_id, stat_info
+                            )
+                            if is_compared:
+                                self._count_change(results, change, 'files_modified')
+                                if watermark is not None:
+                                    watermark.finished(file_path)
+                                continue
+
+                        hashing_rows[file_path] = baseline_file
+
+                    yield file_path, stat_info
+
+            for file_path, stat_info, is_success, digests in engine.hash_files(files_to_hash(), algorithms):
+                self._report_progress(session, results)
+                baseline_file = hashing_rows.pop(file_path, None)
+                if not is_success:
+                    print(f"Error hashing file {file_path}")
+                    results['errors'] += 1
+                else:
+                    self._compare_hashed_file(
+                        results, file_path, stat_info, digests, baseline_file, baseline, monitor_type, user_id
+                    )
+                if watermark is not None:
+                    watermark.finished(file_path)
+
+            results['hash_cache_hits'] += engine.cache_hits
+            results['hash_cache_mismatches'] += engine.cache_mismatches
+
+            # Detect deleted files past the last walked path
+            while next_row is not None:
+                record_deleted(next_row)
+                next_row = next(baseline_rows, None)
+
+            # Changes that failed to write must be found again: only a clean scan moves the watermarks
+            self.change_recorder.flush()
+            is_clean = not results['errors'] and not self.change_recorder.errors
+
+            if walker is not None:
+                results['directories_skipped'] = len(walker.unchanged_dirs)
+                if is_clean:
+                    walker.save(baseline)
+
+            results['alerts_created'] = offsets['alerts_created'] + self.change_recorder.alerts_created
+            results['changes_whitelisted'] = offsets['changes_whitelisted'] + self.change_recorder.changes_whitelisted
+            self._report_progress(session, results, force=True)
+
+            if checksum_verification and is_clean:
+                # Every file got its digests: checksum matches are trusted until the next interval
+                Baseline.objects.filter(id=baseline.id).update(
+                    checksum_verified_at=session.start_time if session is not None else timezone.now()
+                )
+
+        except MonitoringSessionCancelled:
+            results['cancelled'] = True
+
+        except Exception as e:
+            print(f"Error during scan and compare: {str(e)}")
+            results['errors'] += 1
+
+        finally:
+            self.change_recorder.flush()
+            self._flush_checksums()
+            self._close_block_hasher()
+
+        results['alerts_created'] = offsets['alerts_created'] + self.change_recorder.alerts_created
+        results['changes_whitelisted'] = offsets['changes_whitelisted'] + self.change_recorder.changes_whitelisted
+        results['errors'] += self.change_recorder.errors
+
+        return results
+
+    def check_files(self, baseline, file_paths, user_id, monitor_type='full', change_recorder=None):
+        """
+        Compare only the given paths against the baseline: the path of the watcher daemon,
+        which hashes the files touched since its last check instead of walking the tree.
+
+        Paths that exist are compared, or added to the baseline; paths that are gone are
+        recorded as deleted when the baseline has them.
+        @param baseline:
+        @param file_paths: Absolute paths under the baseline
+        @param user_id: User the changes are attributed to
+        @param monitor_type: full hashes every existing file, incremental only those whose size or mtime moved
+        @param change_recorder: FileChangeRecorder kept by the caller across checks, a new one when None
+        @return: Results dict, as for a scan
+        """
+        results = self._empty_results()
+        self.change_recorder = change_recorder or FileChangeRecorder(baseline, user_id)
+        # A recorder kept across checks carries its counters along
+        alerts_before = self.change_recorder.alerts_created
+        whitelisted_before = self.change_recorder.changes_whitelisted
+        errors_before = self.change_recorder.errors
+        exclude_matcher = ExcludeMatcher.compile(baseline.exclude_patterns)
+        # Budgets live in the shared governor files, so a governor per check keeps the watcher within them
+        self.io_throttle = IoGovernor.for_baseline(baseline)
+
+        try:
+            file_paths = sorted(set(file_paths))
+            baseline_files = self.get_baseline_file_rows(baseline, file_paths)
+            results['files_expected'] = len(baseline_files)
+
+            engine = self.get_hashing_engine(baseline)
+            algorithms, _ = self._get_scan_algorithms(baseline, monitor_type)
+            self.block_hasher = self.get_block_hasher(baseline)
+            self._checksum_updates = []
+
+            to_hash = []
+            for file_path in file_paths:
+                if exclude_matcher.matches_under(file_path, baseline.path):
+                    continue
+
+                baseline_file = baseline_files.get(file_path)
+                try:
+                    stat_info = os.stat(file_path)
+                except FileNotFoundError:
+                    stat_info = None
+                except OSError as e:
+                    print(f"Error processing file {file_path}: {str(e)}")
+                    results['errors'] += 1
+                    continue
+
+                if stat_info is None:
+                    if baseline_file is not None:
                         change = self._create_file_change(
                             file_path=file_path,
                             baseline=baseline,
                             baseline_file=baseline_file,
-                            change_type='added',
-                            current_hash=self.calculate_hash(file_path, baseline.algorithm_type)[1],
-                            severity='medium',
+                            change_type='deleted',
+                            current_hash=None,
+                            severity='high',
                             user_id=user_id
                         )
+                        self._count_change(results, change, 'files_deleted')
+                    continue
 
-                        if change:
-                            results['changes_found'] += 1
-                            results['files_added'] += 1
-                            results['alerts_created'] += 1
+                if stat.S_ISDIR(stat_info.st_mode):
+                    continue
 
-            # Detect deleted files (in baseline but not found during scan)
-            for file_path, baseline_file in baseline_files.items():
-                if file_path not in found_baseline_files:
-                    # File exists in baseline but NOT on disk - it was deleted
-                    change = self._create_file_change(
-                        file_path=file_path,
-                        baseline=baseline,
-                        baseline_file=baseline_file,
-                        change_type='deleted',
-                        current_hash=None,
-                        severity='high',
-                        user_id=user_id
+                results['files_scanned'] += 1
+                if baseline_file is not None and not self._needs_hash(stat_info, baseline_file, monitor_type):
+                    change = self._compare_file(file_path, baseline_file, baseline, monitor_type, user_id, stat_info)
+                    self._count_change(results, change, 'files_modified')
+                    continue
+
+                if baseline_file is not None and self.uses_block_hashes(baseline, stat_info):
+                    is_compared, change = self._compare_blocks(
+                        engine, file_path, baseline_file, baseline, monitor_type, user_id, stat_info
                     )
+                    if is_compared:
+                        self._count_change(results, change, 'files_modified')
+                        continue
+
+                to_hash.append((file_path, stat_info))
 
-                    if change:
-                        results['changes_found'] += 1
-                        results['files_deleted'] += 1
-                        results['alerts_created'] += 1
+            for file_path, stat_info, is_success, digests in engine.hash_files(iter(to_hash), algorithms):
+                if not is_success:
+                    print(f"Error hashing file {file_path}")
+                    results['errors'] += 1
+                    continue
+
+                self._compare_hashed_file(
+                    results, file_path, stat_info, digests, baseline_files.get(file_path),
+                    baseline, monitor_type, user_id
+                )
+
+            results['hash_cache_hits'] += engine.cache_hits
+            results['hash_cache_mismatches'] += engine.cache_mismatches
 
         except Exception as e:
-            print(f"Error during scan and compare: {str(e)}")
+            print(f"Error checking files of baseline {baseline.id}: {str(e)}")
             results['errors'] += 1
 
+        finally:
+            self.change_recorder.flush()
+            self._flush_checksums()
+            self._close_block_hasher()
+            self.io_throttle.close()
+            self.io_throttle = None
+
+        results['alerts_created'] = self.change_recorder.alerts_created - alerts_before
+        results['changes_whitelisted'] = self.change_recorder.changes_whitelisted - whitelisted_before
+        results['errors'] += self.change_recorder.errors - errors_before
         return results
 
-    def _compare_file(self, file_path, baseline_file, baseline, monitor_type, user_id):
+    @staticmethod
+    def _empty_results():
+        """Counters collected by a scan"""
+        return {
+            'files_scanned': 0,
+            'changes_found': 0,
+            'files_added': 0,
+            'files_deleted': 0,
+            'files_modified': 0,
+            'files_critical': 0,
+            'files_expected': 0,
+            'directories_skipped': 0,
+            'changes_whitelisted': 0,
+            'hash_cache_hits': 0,
+            'hash_cache_mismatches': 0,
+            'checksum_mismatches': 0,
+            'alerts_created': 0,
+            'errors': 0,
+            'cancelled': False
+        }
+
+    def _get_scan_algorithms(self, baseline, monitor_type, session=None):
+        """
+        Algorithms the hashing engine computes for a scan: only the prefilter checksum when the
+        baseline has checksum_prefilter, unless this is a full session due for verification,
+        which computes every digest and the checksum. The decision is kept in the session
+        metadata so a resumed session makes the same one.
+
+        Returns (algorithms, is_checksum_verification).
+        """
+        stored = (session.metadata or {}).get("checksum_verification") if session is not None else None
+        if stored is not None:
+            verification = stored
+        else:
+            verified_at = baseline.checksum_verified_at
+            verification = baseline.checksum_prefilter and monitor_type == 'full' and (
+                verified_at is None or (timezone.now() - verified_at).total_seconds()
+                >= GenericConstants.CHECKSUM_VERIFY_INTERVAL_SECONDS
+            )
+            if session is not None and baseline.checksum_prefilter:
+                session.metadata = {**(session.metadata or {}), "checksum_verification": verification}
+
+        if baseline.checksum_prefilter and not verification:
+            return (GenericConstants.CHECKSUM_PREFILTER_ALGORITHM,), False
+        return self.get_hash_algorithms(baseline.algorithm_type, with_checksum=baseline.checksum_prefilter), \
+            verification
+
+    def _compare_hashed_file(self, results, file_path, stat_info, digests, baseline_file, baseline,
+                             monitor_type, user_id):
+        """
+        Compare a freshly hashed file with its baseline entry, or add it to the baseline.
+
+        Digests holding only the prefilter checksum come from a prefiltered scan: a match with the
+        stored checksum is the baseline's content; a mismatch, or a new file, is read again for
+        its digests. A matching digest with a missing or stale stored checksum updates it.
+        """
+        if baseline.algorithm_type not in digests:
+            if baseline_file is not None and \
+                    digests.get(GenericConstants.CHECKSUM_PREFILTER_ALGORITHM) == baseline_file.checksum:
+                change = self._compare_file(file_path, baseline_file, baseline, monitor_type, user_id, stat_info)
+                self._count_change(results, change, 'files_modified')
+                return
+
+            if baseline_file is not None:
+                results['checksum_mismatches'] += 1
+            if self.io_throttle is not None:
+                self.io_throttle.consume(stat_info.st_size)
+            is_success, digests = self.calculate_hashes(
+                file_path, self.get_hash_algorithms(baseline.algorithm_type, with_checksum=True)
+            )
+            if not is_success:
+                print(f"Error hashing file {file_path}")
+                results['errors'] += 1
+                return
+
+        if baseline_file is not None:
+            current_hash = digests.get(baseline.algorithm_type)
+            change = self._compare_file(
+                file_path, baseline_file, baseline, monitor_type, user_id, stat_info, current_hash
+            )
+            self._count_change(results, change, 'files_modified')
+
+            checksum = digests.get(GenericConstants.CHECKSUM_PREFILTER_ALGORITHM)
+            if baseline.checksum_prefilter and checksum and checksum != baseline_file.checksum \
+                    and current_hash == self.get_baseline_hash(baseline_file, baseline.algorithm_type):
+                self._checksum_updates.append(BaselineFile(id=baseline_file.id, checksum=checksum))
+                if len(self._checksum_updates) >= GenericConstants.BASELINE_INSERT_BATCH_SIZE:
+                    self._flush_checksums()
+        else:
+            change = self._record_added_file(file_path, baseline, user_id, stat_info, digests)
+            self._count_change(results, change, 'files_added')
+
+    @staticmethod
+    def _count_change(results, change, counter):
+        """Account a recorded change in the scan results"""
+        if change:
+            results['changes_found'] += 1
+            results[counter] += 1
+            if change.severity == 'critical':
+                results['files_critical'] += 1
+
+    @staticmethod
+    def _needs_hash(stat_info, baseline_file, monitor_type):
+        """
+        Decide whether a baseline file has to be hashed for this monitor type.
+
+        - full: always
+        - incremental, structural, rolling: only when size or mtime moved (rolling also hashes its slice)
+        - quick: never
+        """
+        if monitor_type == 'quick':
+            return False
+        if monitor_type in ('incremental', 'structural', 'rolling'):
+            return stat_info.st_mtime != baseline_file.mtime or stat_info.st_size != baseline_file.file_size
+        return True
+
+    def _flush_checksums(self):
+        """Write the prefilter checksums collected for unchanged baseline files"""
+        updates, self._checksum_updates = self._checksum_updates, []
+        if not updates:
+            return
+        try:
+            BaselineFile.objects.bulk_update(updates, ['checksum'])
+        except Exception as e:
+            print(f"Error updating baseline file checksums: {str(e)}")
+
+    def _record_added_file(self, file_path, baseline, user_id, stat_info, digests):
+        """Add a newly discovered file to the baseline and record the change"""
+        try:
+            baseline_file = BaselineFile(
+                baseline=baseline,
+                file_path=file_path,
+                file_name=os.path.basename(file_path),
+                **self.get_baseline_file_hashes(baseline.algorithm_type, digests),
+                file_size=stat_info.st_size,
+                permissions=stat_info.st_mode,
+                uid=stat_info.st_uid,
+                gid=stat_info.st_gid,
+                inode=stat_info.st_ino,
+                hard_links=stat_info.st_nlink,
+                mtime=stat_info.st_mtime,
+                atime=stat_info.st_atime,
+                ctime=stat_info.st_ctime,
+                metadata={}
+            )
+            self.add_block_hashes(baseline_file, baseline, stat_info)
+
+            with transaction.atomic():
+                baseline_file.save()
+                Baseline.objects.filter(id=baseline.id).update(
+                    total_files=F('total_files') + 1,
+                    total_bytes=F('total_bytes') + stat_info.st_size
+                )
+            return self._create_file_change(
+                file_path=file_path,
+                baseline=baseline,
+                baseline_file=baseline_file,
+                change_type='added',
+                current_hash=digests.get(baseline.algorithm_type),
+                severity='medium',
+                user_id=user_id
+            )
+
+        except Exception as e:
+            print(f"Error adding file {file_path}: {str(e)}")
+            return None
+
+    def _compare_file(self, file_path, baseline_file, baseline, monitor_type, user_id, stat_info,
+                      current_hash=None):
         """
         Compare current file against baseline file.
 
         monitor_type determines what we check:
         - full: Complete hash comparison
-        - incremental: Hash + mtime check
+        - incremental, structural: Hash + mtime check
         - quick: Only size and mtime (no hashing)
+        - rolling: As full, with current_hash only for hashed files
+
+        current_hash is supplied by the hashing engine whenever the file was hashed.
         """
         try:
-            stat_info = os.stat(file_path)
             current_size = stat_info.st_size
             current_mtime = stat_info.st_mtime
             current_permissions = stat_info.st_mode
-            current_uid = stat_info.st_uid
-            current_gid = stat_info.st_gid
-            current_inode = stat_info.st_ino
 
             # QUICK SCAN: Only check size and mtime
             if monitor_type == 'quick':
@@ -284,17 +835,9 @@ class MonitoringSessionCreateService(MonitoringServiceHelper):
                     )
                     return change
 
-            # INCREMENTAL SCAN: Check mtime first, hash if changed
-            elif monitor_type == 'incremental':
-                # First check timestamp - skip if unchanged
-                if current_mtime == baseline_file.mtime and current_size == baseline_file.file_size:
-                    # File hasn't been modified, skip hashing
-                    return None
-
-                # File modified - calculate hash and compare
-                is_success, current_hash = self.calculate_hash(file_path, baseline.algorithm_type)
-
-                if current_hash and current_hash != baseline_file.sha256:
+            # INCREMENTAL SCAN: Hash only reaches here when mtime or size changed
+            elif monitor_type in ('incremental', 'structural'):
+                if current_hash and current_hash != self.get_baseline_hash(baseline_file, baseline.algorithm_type):
                     change = self._create_file_change(
                         file_path=file_path,
                         baseline=baseline,
@@ -306,12 +849,10 @@ class MonitoringSessionCreateService(MonitoringServiceHelper):
                     )
                     return change
 
-            # FULL SCAN: Always calculate hash and compare
-            else:  # monitor_type == 'full'
-                is_success, current_hash = self.calculate_hash(file_path, baseline.algorithm_type)
-
+            # FULL SCAN: Always calculate hash and compare; ROLLING: only the files that were hashed
+            else:  # monitor_type in ('full', 'rolling')
                 # Check for hash change
-                if current_hash and current_hash != baseline_file.sha256:
+                if current_hash and current_hash != self.get_baseline_hash(baseline_file, baseline.algorithm_type):
                     change = self._create_file_change(
                         file_path=file_path,
                         baseline=baseline,
@@ -341,44 +882,87 @@ class MonitoringSessionCreateService(MonitoringServiceHelper):
 
         return None
 
-    def _create_file_change(self, file_path, baseline, baseline_file, change_type, current_hash, severity, user_id):
-        """Create FileChange record and associated alert"""
+    def _compare_blocks(self, engine, file_path, baseline_file, baseline, monitor_type, user_id, stat_info):
+        """
+        Compare a large file block by block against the block digests of its baseline entry.
+
+        A hash cache hit is compared by its whole-file digest without reading the file.
+        Incremental checks stop at the first changed block when BLOCK_HASH_EARLY_EXIT is set:
+        the change then has one changed range and no current_hash. A complete comparison reads
+        a changed file once more for the whole-file digest that acknowledging the change stores.
+
+        Returns (is_compared, change); is_compared is False when the baseline entry has no
+        usable block digests, and the file is left to the hashing engine.
+        """
+        digests = engine.lookup(file_path, stat_info, self.get_hash_algorithms(baseline.algorithm_type))
+        if digests is not None:
+            return True, self._compare_file(
+                file_path, baseline_file, baseline, monitor_type, user_id, stat_info,
+                digests.get(baseline.algorithm_type)
+            )
+
+        block_size, block_hashes = BaselineFile.objects.filter(id=baseline_file.id).values_list(
+            'block_size', 'block_hashes'
+        ).first() or (None, None)
+        if not block_hashes or block_size != self.block_hasher.block_size:
+            return False, None
+
+        expected = BlockHasher.decode(block_hashes)
+        early_exit = GenericConstants.BLOCK_HASH_EARLY_EXIT and monitor_type in ('incremental', 'structural')
+        is_success, block_digests, complete = self.block_hasher.hash_blocks(file_path, expected, early_exit)
+        if not is_success:
+            return False, None
+
+        changed = BlockHasher.changed_blocks(expected, block_digests) if complete else [len(block_digests) - 1]
+        if not changed:
+            # Same content; a full comparison still checks the permissions
+            return True, self._compare_file(file_path, baseline_file, baseline, monitor_type, user_id, stat_info)
+
+        change_details = {
+            "block_size": block_size,
+            "changed_ranges": BlockHasher.changed_ranges(
+                changed, block_size, max(stat_info.st_size, baseline_file.file_size)
+            ),
+            "complete": complete
+        }
+        current_hash = None
+        if complete:
+            change_details.update({
+                "block_count": len(block_digests),
+                "block_root": BlockHasher.root_of(block_digests),
+                "changed_blocks": {
+                    str(index): block_digests[index].hex() for index in changed if index < len(block_digests)
+                }
+            })
+            if self.io_throttle is not None:
+                self.io_throttle.consume(stat_info.st_size)
+            is_success, current_hash = self.calculate_hash(file_path, baseline.algorithm_type)
+            current_hash = current_hash if is_success else None
+
+        return True, self._create_file_change(
+            file_path=file_path,
+            baseline=baseline,
+            baseline_file=baseline_file,
+            change_type='modified',
+            current_hash=current_hash,
+            severity='critical',
+            user_id=user_id,
+            change_details=change_details
+        )
+
+    def _create_file_change(self, file_path, baseline, baseline_file, change_type, current_hash, severity, user_id,
+                            change_details=None):
+        """Queue a FileChange record and its alert on the scan's recorder"""
         try:
-            # Check if FileChange already exists for this file
-            existing_change = FileChange.objects.filter(
-                baseline=baseline,
+            return self.change_recorder.record(
                 file_path=file_path,
+                baseline_file=baseline_file,
                 change_type=change_type,
-                acknowledged=False
-            ).first()
-
-            if existing_change:
-                # Update existing change
-                existing_change.current_hash = current_hash or existing_change.current_hash
-                existing_change.severity = severity
-                existing_change.save()
-                file_change = existing_change
-            else:
-                # Create new FileChange
-                file_change = FileChange.objects.create(
-                    baseline=baseline,
-                    baseline_file=baseline_file,
-                    file_path=file_path,
-                    change_type=change_type,
-                    current_hash=current_hash,
-                    severity=severity,
-                    acknowledged=False,
-                    user_id=user_id
-                )
-
-            # Create alert for this change
-            alert_service = AlertCreateService()
-            status_code, response = alert_service.execute_service(
-                data={'change_id': file_change.id, 'user_id': user_id}
+                current_hash=current_hash,
+                severity=severity,
+                change_details=change_details
             )
 
-            return file_change
-
         except Exception as e:
             print(f"Error creating file change for {file_path}: {str(e)}")
-            return None
\ No newline at end of file
+            return None
@@ -0,0 +1,73 @@
+from rest_framework import status
+
+from monitoring.models import MonitoringSession
+from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+
+
+class MonitoringSessionProgressGetService(MonitoringServiceHelper):
+    """Service to report the progress counters of a queued or running monitoring session"""
+
+    def __init__(self):
+        super().__init__()
+
+    def get_request_params(self, *args, **kwargs):
+        """
+        Extract and validate session ID parameter
+        @params args: positional parameters
+        @params kwargs: keyword parameters
+        @return request parameters
+        """
+        data = kwargs.get("data")
+        return {
+            "monitor_session_id": data.get("monitor_session_id")
+        }
+
+    def get_data(self, *args, **kwargs):
+        """
+        Fetch monitoring session progress and return response
+        @params args: positional parameters
+        @params kwargs: keyword parameters
+        @return response data
+        """
+        params = self.get_request_params(*args, **kwargs)
+
+        # Validate session_id
+        if not params.get("monitor_session_id"):
+            self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+            return {"message": GenericConstants.SESSION_ID_REQUIRED_MESSAGE}
+
+        # Get monitoring session
+        try:
+            session = MonitoringSession.objects.get(id=params.get("monitor_session_id"))
+        except MonitoringSession.DoesNotExist:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_404_NOT_FOUND)
+            return {"message": GenericConstants.MONITORING_SESSION_NOT_FOUND_MESSAGE}
+
+        # The baseline size is only an estimate of the files the scan will visit
+        files_expected = session.metadata.get("files_expected") or 0
+        if session.status == GenericConstants.SESSION_STATUS_COMPLETED:
+            percent = 100
+        elif files_expected:
+            percent = min(99, int(session.files_scanned * 100 / files_expected))
+        else:
+            percent = 0
+
+        return {
+            "progress": {
+                "monitor_session_id": session.id,
+                "status": session.status,
+                "percent": percent,
+                "files_scanned": session.files_scanned,
+                "files_expected": files_expected,
+                "files_changed": session.files_changed,
+                "files_critical": session.files_critical,
+                "files_added": session.files_added,
+                "files_deleted": session.files_deleted,
+                "start_time": session.start_time.isoformat() if session.start_time else None,
+                "end_time": session.end_time.isoformat() if session.end_time else None,
+                "updated_at": session.updated_at.isoformat(),
+                "error_message": session.error_message
+            }
+        }
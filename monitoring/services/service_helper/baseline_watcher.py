@@ -0,0 +1,407 @@
+import errno
+import heapq
+import os
+import threading
+import time
+
+from django.db import close_old_connections
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.models import Baseline, BaselineFile
+from monitoring.services.monitoring_session_create_service import MonitoringSessionCreateService
+from monitoring.services.service_helper.exclude_matcher import ExcludeMatcher
+from monitoring.services.service_helper.file_change_recorder import FileChangeRecorder
+from monitoring.services.service_helper import inotify
+
+
+def _is_under(path, root):
+    """
+        @param path:
+        @param root: Directory
+        @return: True when path is root or inside it
+    """
+    root = root.rstrip("/") or "/"
+    return path == root or path.startswith(root if root == "/" else root + "/")
+
+
+class BaselineWatcher:
+    """
+        Real-time change detection for baselines with monitoring enabled, on Linux inotify.
+
+        Every non-excluded directory of an active baseline gets a watch. Events are coalesced
+        per path: a path is checked once no event arrived for it during WATCHER_DEBOUNCE_SECONDS,
+        or WATCHER_MAX_DELAY_SECONDS after its first event while it keeps changing. Only those
+        paths are hashed and compared with their BaselineFile rows, through
+        MonitoringSessionCreateService.check_files.
+
+        When the watch limit is reached (ENOSPC, fs.inotify.max_user_watches, or
+        WATCHER_MAX_WATCHES), the directory that could not be watched becomes an overflow
+        subtree: it is walked and compared incrementally every WATCHER_OVERFLOW_SCAN_SECONDS,
+        and watching it is retried at each refresh. A kernel queue overflow rescans every
+        baseline once the same way.
+
+        Baselines are reloaded every WATCHER_REFRESH_SECONDS, so enabling or disabling
+        monitoring takes effect without a restart. Changes are attributed to the baseline owner.
+    """
+
+    def __init__(self, monitor_type='full',
+                 debounce_seconds=GenericConstants.WATCHER_DEBOUNCE_SECONDS,
+                 max_watches=GenericConstants.WATCHER_MAX_WATCHES):
+        """
+            @param monitor_type: Comparison of touched files, full hashes every one of them
+            @param debounce_seconds: Quiet time before a touched path is checked
+            @param max_watches: Watches this watcher may hold, None for the kernel limit
+        """
+        self.monitor_type = monitor_type
+        self.debounce_seconds = debounce_seconds
+        self.max_watches = max_watches
+
+        self.session_service = MonitoringSessionCreateService()
+
+        self._inotify = None
+        self._baselines = {}
+        self._baseline_keys = None
+        self._recorders = {}
+
+        self._dir_by_wd = {}
+        self._wd_by_dir = {}
+        self._overflow_roots = set()
+        self._rescan_roots = set()
+
+        # path -> (first event time, last event time)
+        self._pending = {}
+
+        self._next_refresh = 0.0
+        self._next_overflow_scan = 0.0
+        self._stop_event = threading.Event()
+
+    @property
+    def watch_count(self):
+        return len(self._wd_by_dir)
+
+    @property
+    def overflow_roots(self):
+        return set(self._overflow_roots)
+
+    def start(self):
+        """
+            Open the inotify instance and watch every monitored baseline
+            @return: None
+        """
+        self._inotify = inotify.Inotify()
+        self._stop_event.clear()
+        self.refresh()
+
+    def stop(self):
+        """
+            Ask run_forever to return after checking the paths still pending
+            @return: None
+        """
+        self._stop_event.set()
+
+    def run_forever(self):
+        """
+            Watch and check until stopped
+            @return: None
+        """
+        if self._inotify is None:
+            self.start()
+
+        try:
+            while not self._stop_event.is_set():
+                self.poll(self._next_wakeup())
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._check_pending(force=True)
+            self.close()
+
+    def poll(self, timeout):
+        """
+            Handle the events arriving within timeout, then run whatever is due
+            @param timeout: Seconds to wait for events
+            @return: None
+        """
+        for wd, mask, cookie, name in self._inotify.read_events(timeout):
+            self._handle_event(wd, mask, name)
+
+        try:
+            now = time.monotonic()
+            if now >= self._next_refresh:
+                self.refresh()
+            if self._rescan_roots or (self._overflow_roots and now >= self._next_overflow_scan):
+                self._scan_overflow()
+            self._check_pending()
+        finally:
+            close_old_connections()
+
+    def close(self):
+        if self._inotify is not None:
+            self._inotify.close()
+            self._inotify = None
+        self._dir_by_wd.clear()
+        self._wd_by_dir.clear()
+
+    def refresh(self):
+        """
+            Reload the monitored baselines, rewatch when they changed, retry overflow subtrees
+            @return: None
+        """
+        self._next_refresh = time.monotonic() + GenericConstants.WATCHER_REFRESH_SECONDS
+
+        baselines = {
+            baseline.id: baseline
+            for baseline in Baseline.objects.filter(is_active=True, monitoring_enabled=True).order_by('id')
+        }
+        keys = {
+            baseline.id: (baseline.path, tuple(baseline.exclude_patterns or ()), baseline.algorithm_type)
+            for baseline in baselines.values()
+        }
+
+        self._baselines = baselines
+        # New recorders see open changes acknowledged since the last refresh
+        self._recorders = {}
+
+        if keys != self._baseline_keys:
+            self._baseline_keys = keys
+            self._unwatch_all()
+            self._overflow_roots.clear()
+            for baseline in baselines.values():
+                self._watch_tree(baseline.path)
+            return
+
+        for root in sorted(self._overflow_roots):
+            self._overflow_roots.discard(root)
+            self._watch_tree(root)
+
+    def _next_wakeup(self):
+        now = time.monotonic()
+        deadlines = [self._next_refresh, now + 1.0]
+        if self._pending:
+            deadlines.append(min(self._due_at(first, last) for first, last in self._pending.values()))
+        if self._overflow_roots:
+            deadlines.append(self._next_overflow_scan)
+        return max(min(deadlines) - now, 0)
+
+    def _due_at(self, first, last):
+        return min(last + self.debounce_seconds, first + GenericConstants.WATCHER_MAX_DELAY_SECONDS)
+
+    def _excluded(self, dir_path):
+        """A directory is watched unless every baseline containing it excludes it"""
+        return all(
+            ExcludeMatcher.compile(baseline.exclude_patterns).matches_under(dir_path, baseline.path, is_dir=True)
+            for baseline in self._covering_baselines(dir_path)
+        )
+
+    def _watch_tree(self, root):
+        """
+            Watch root and its subdirectories; a directory that cannot be watched for lack of
+            watches becomes an overflow subtree
+            @param root:
+            @return: None
+        """
+        pending_dirs = [root]
+        while pending_dirs:
+            dir_path = pending_dirs.pop()
+            if dir_path in self._wd_by_dir:
+                continue
+
+            if not self._add_watch(dir_path):
+                continue
+
+            for entry, is_dir in self.session_service.sorted_dir_entries(dir_path):
+                if is_dir and not entry.is_symlink() and not self._excluded(entry.path):
+                    pending_dirs.append(entry.path)
+
+    def _add_watch(self, dir_path):
+        if self.max_watches is not None and len(self._wd_by_dir) >= self.max_watches:
+            self._add_overflow_root(dir_path)
+            return False
+
+        try:
+            wd = self._inotify.add_watch(dir_path)
+        except OSError as e:
+            if e.errno in (errno.ENOSPC, errno.ENOMEM):
+                self._add_overflow_root(dir_path)
+            elif e.errno not in (errno.ENOENT, errno.ENOTDIR):
+                print(f"Error watching directory {dir_path}: {str(e)}")
+            return False
+
+        self._dir_by_wd[wd] = dir_path
+        self._wd_by_dir[dir_path] = wd
+        return True
+
+    def _add_overflow_root(self, dir_path):
+        if not self._overflow_roots:
+            print(f"Watch limit reached at {dir_path}, scanning unwatched directories "
+                  f"every {GenericConstants.WATCHER_OVERFLOW_SCAN_SECONDS}s")
+            self._next_overflow_scan = time.monotonic() + GenericConstants.WATCHER_OVERFLOW_SCAN_SECONDS
+        if not any(_is_under(dir_path, root) for root in self._overflow_roots):
+            self._overflow_roots = {root for root in self._overflow_roots if not _is_under(root, dir_path)}
+            self._overflow_roots.add(dir_path)
+
+    def _unwatch(self, dir_path):
+        """Drop the watches of dir_path and everything below it"""
+        for path in [path for path in self._wd_by_dir if _is_under(path, dir_path)]:
+            wd = self._wd_by_dir.pop(path)
+            self._dir_by_wd.pop(wd, None)
+            self._inotify.rm_watch(wd)
+
+    def _unwatch_all(self):
+        for wd in list(self._dir_by_wd):
+            self._inotify.rm_watch(wd)
+        self._dir_by_wd.clear()
+        self._wd_by_dir.clear()
+
+    def _handle_event(self, wd, mask, name):
+        if mask & inotify.IN_Q_OVERFLOW:
+            print("inotify event queue overflowed, rescanning every baseline")
+            self._rescan_roots.update(baseline.path for baseline in self._baselines.values())
+            return
+
+        dir_path = self._dir_by_wd.get(wd)
+        if dir_path is None:
+            return
+
+        if mask & inotify.IN_IGNORED:
+            # Watched directory deleted or unmounted; the kernel already dropped the watch
+            self._dir_by_wd.pop(wd, None)
+            if self._wd_by_dir.get(dir_path) == wd:
+                del self._wd_by_dir[dir_path]
+            return
+
+        if not name:
+            if mask & (inotify.IN_DELETE_SELF | inotify.IN_MOVE_SELF) and \
+                    any(dir_path == baseline.path for baseline in self._baselines.values()):
+                # A baseline root went away; its parent is not watched
+                self._touch_removed_dir(dir_path)
+            return
+
+        path = os.path.join(dir_path, name)
+
+        if mask & inotify.IN_ISDIR:
+            if mask & (inotify.IN_CREATE | inotify.IN_MOVED_TO):
+                if not self._excluded(path):
+                    self._watch_tree(path)
+                    # Files written before the watch was in place have no events of their own
+                    for baseline in self._covering_baselines(path):
+                        for file_path, _ in self.session_service.walk_files(path, baseline.exclude_patterns):
+                            self._touch(file_path)
+            elif mask & (inotify.IN_DELETE | inotify.IN_MOVED_FROM):
+                self._unwatch(path)
+                self._touch_removed_dir(path)
+            return
+
+        self._touch(path)
+
+    def _touch(self, path):
+        now = time.monotonic()
+        first, _ = self._pending.get(path, (now, now))
+        self._pending[path] = (first, now)
+
+    def _touch_removed_dir(self, dir_path):
+        """Every baseline file below a removed directory is checked, and found deleted"""
+        for baseline in self._covering_baselines(dir_path):
+            for file_path in self._baseline_file_paths(baseline, dir_path):
+                self._touch(file_path)
+
+    def _covering_baselines(self, path):
+        return [baseline for baseline in self._baselines.values() if _is_under(path, baseline.path)]
+
+    @staticmethod
+    def _baseline_file_paths(baseline, dir_path):
+        """
+            Stream the baseline's paths below dir_path in ascending order, keyset-paginated so no
+            cursor stays open while the changes they lead to are written
+            @param baseline:
+            @param dir_path:
+            @return: Generator of file paths
+        """
+        prefix = dir_path.rstrip("/") + "/"
+        last_path = None
+        while True:
+            queryset = BaselineFile.objects.filter(baseline=baseline, file_path__startswith=prefix)
+            if last_path is not None:
+                queryset = queryset.filter(file_path__gt=last_path)
+
+            file_paths = list(
+                queryset.order_by('file_path').values_list('file_path', flat=True)[:GenericConstants.DB_STREAM_CHUNK_SIZE]
+            )
+            if not file_paths:
+                return
+
+            yield from file_paths
+            last_path = file_paths[-1]
+
+    def _check_pending(self, force=False):
+        """
+            Check the paths whose debounce window has passed
+            @param force: Check every pending path
+            @return: None
+        """
+        if not self._pending:
+            return
+
+        now = time.monotonic()
+        due = [
+            path for path, (first, last) in self._pending.items()
+            if force or self._due_at(first, last) <= now
+        ]
+        for path in due:
+            del self._pending[path]
+
+        by_baseline = {}
+        for path in due:
+            for baseline in self._covering_baselines(path):
+                by_baseline.setdefault(baseline.id, []).append(path)
+
+        for baseline_id, paths in by_baseline.items():
+            self._check_files(self._baselines[baseline_id], paths, self.monitor_type)
+
+    def _scan_overflow(self):
+        """
+            Walk the unwatched subtrees, and the roots queued for a one-off rescan, comparing
+            their files incrementally
+            @return: None
+        """
+        roots = self._overflow_roots | self._rescan_roots
+        self._rescan_roots = set()
+        self._next_overflow_scan = time.monotonic() + GenericConstants.WATCHER_OVERFLOW_SCAN_SECONDS
+
+        for root in sorted(roots):
+            for baseline in self._covering_baselines(root):
+                self._scan_overflow_root(baseline, root)
+
+    def _scan_overflow_root(self, baseline, root):
+        """
+            Check the walked and the stored paths under root, merged in path order and handed to
+            check_files WATCHER_OVERFLOW_CHECK_SIZE at a time, so a large subtree is never held whole
+            @param baseline:
+            @param root:
+            @return: None
+        """
+        walked = (file_path for file_path, _ in self.session_service.walk_files(root, baseline.exclude_patterns))
+        chunk = []
+        previous = None
+        for file_path in heapq.merge(walked, self._baseline_file_paths(baseline, root)):
+            if file_path == previous:
+                continue
+            previous = file_path
+            chunk.append(file_path)
+            if len(chunk) >= GenericConstants.WATCHER_OVERFLOW_CHECK_SIZE:
+                self._check_files(baseline, chunk, 'incremental')
+                chunk = []
+
+        if chunk:
+            self._check_files(baseline, chunk, 'incremental')
+
+    def _check_files(self, baseline, paths, monitor_type):
+        recorder = self._recorders.get(baseline.id)
+        if recorder is None:
+            recorder = self._recorders[baseline.id] = FileChangeRecorder(baseline, baseline.user_id)
+
+        try:
+            self.session_service.check_files(baseline, paths, baseline.user_id, monitor_type, recorder)
+        except Exception as e:
+            print(f"Error checking {len(paths)} files of baseline {baseline.id}: {str(e)}")
+            self._recorders.pop(baseline.id, None)
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+
+
+class BlockHasher:
+    """
+        Hash a large file as fixed-size SHA-256 blocks on a thread pool.
+
+        Each block is read with pread at its own offset, so the blocks of one file are hashed
+        in parallel (hashlib releases the GIL on large buffers), and a changed region can be
+        told apart from the rest of the file. The root digest is the SHA-256 of the raw block
+        digests in order: equal roots mean equal block lists.
+    """
+
+    def __init__(self, block_size=GenericConstants.BLOCK_HASH_SIZE, workers=1, throttle=None):
+        """
+            @param block_size: Bytes per block
+            @param workers: Blocks hashed at once
+            @param throttle: Optional IoThrottle paced with the size of every block read, and told how
+            long each block took
+        """
+        self.block_size = block_size
+        self.workers = max(int(workers or 1), 1)
+        self.throttle = throttle
+        self._executor = None
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    @staticmethod
+    def encode(digests):
+        """
+            @param digests: Raw block digests
+            @return: Concatenated hex, as stored in BaselineFile.block_hashes
+        """
+        return b"".join(digests).hex()
+
+    @staticmethod
+    def decode(block_hashes):
+        """
+            @param block_hashes: Concatenated hex
+            @return: List of raw block digests
+        """
+        data = bytes.fromhex(block_hashes or "")
+        size = hashlib.sha256().digest_size
+        return [data[offset:offset + size] for offset in range(0, len(data), size)]
+
+    @staticmethod
+    def root_of(digests):
+        """
+            @param digests: Raw block digests
+            @return: Hex root digest
+        """
+        return hashlib.sha256(b"".join(digests)).hexdigest()
+
+    @staticmethod
+    def changed_blocks(expected, digests):
+        """
+            @param expected: Baseline block digests
+            @param digests: Current block digests
+            @return: Indexes of the blocks that differ, including blocks only one of the lists has
+        """
+        return [
+            index for index in range(max(len(expected), len(digests)))
+            if index >= len(expected) or index >= len(digests) or expected[index] != digests[index]
+        ]
+
+    @staticmethod
+    def changed_ranges(indexes, block_size, file_size):
+        """
+            Merge changed blocks into byte ranges
+            @param indexes: Ascending block indexes
+            @param block_size:
+            @param file_size: Larger of the baseline and current sizes, ranges end there at the latest
+            @return: List of [start, end) byte offsets
+        """
+        ranges = []
+        for index in indexes:
+            start, end = index * block_size, min((index + 1) * block_size, file_size)
+            if ranges and ranges[-1][1] == start:
+                ranges[-1][1] = end
+            else:
+                ranges.append([start, end])
+        return ranges
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fim-block-hash")
+        return self._executor
+
+    def _hash_block(self, fd, index):
+        hash_obj = hashlib.sha256()
+        started = time.perf_counter()
+        offset = index * self.block_size
+        end = offset + self.block_size
+        while offset < end:
+            data = os.pread(fd, min(end - offset, GenericConstants.BLOCK_HASH_READ_SIZE), offset)
+            if not data:
+                break
+            hash_obj.update(data)
+            offset += len(data)
+        if self.throttle is not None:
+            self.throttle.observe(offset - index * self.block_size, time.perf_counter() - started)
+        return hash_obj.digest()
+
+    def hash_blocks(self, file_path, expected=None, early_exit=False):
+        """
+            Hash every block of a file, in order, keeping workers * 2 blocks in flight
+            @param file_path:
+            @param expected: Baseline block digests, needed for early_exit
+            @param early_exit: Stop at the first block that differs from expected
+            @return: (is_success, digests, complete); complete is False when early_exit stopped the read
+        """
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError as e:
+            print(f"Error opening {file_path} for block hashing: {str(e)}")
+            return False, [], False
+
+        in_flight = deque()
+        try:
+            block_count = -(-os.fstat(fd).st_size // self.block_size)
+            executor = self._get_executor()
+            digests = []
+            next_index = 0
+
+            while next_index < block_count or in_flight:
+                while next_index < block_count and len(in_flight) < self.workers * 2:
+                    if self.throttle is not None:
+                        # The file counts once against a files/sec budget, with its first block
+                        self.throttle.consume(self.block_size, files=1 if next_index == 0 else 0)
+                    in_flight.append(executor.submit(self._hash_block, fd, next_index))
+                    next_index += 1
+
+                index = len(digests)
+                digests.append(in_flight.popleft().result())
+                if early_exit and expected is not None and (
+                        index >= len(expected) or expected[index] != digests[index]
+                ):
+                    return True, digests, False
+
+            # A file that shrank leaves trailing baseline blocks unmatched, which is a change too
+            return True, digests, True
+
+        except Exception as e:
+            print(f"Error block hashing {file_path}: {str(e)}")
+            return False, [], False
+
+        finally:
+            # Blocks already running still read from fd
+            for future in in_flight:
+                future.cancel()
+            wait(in_flight)
+            os.close(fd)
@@ -0,0 +1,133 @@
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+
+_ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+}
+
+_MONTH_NAMES = {name: index for index, name in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+_DAY_NAMES = {name: index for index, name in enumerate(["sun", "mon", "tue", "wed", "thu", "fri", "sat"])}
+
+# (name, lowest, highest, names)
+_FIELDS = (
+    ("minute", 0, 59, {}),
+    ("hour", 0, 23, {}),
+    ("day of month", 1, 31, {}),
+    ("month", 1, 12, _MONTH_NAMES),
+    ("day of week", 0, 7, _DAY_NAMES),
+)
+
+# Longest gap between two runs of a valid expression (29 February comes back within 8 years)
+_SEARCH_DAYS = 366 * 8 + 2
+
+
+class CronSchedule:
+    """
+        Standard 5-field cron expression: minute, hour, day of month, month, day of week.
+
+        Fields take "*", numbers, ranges "a-b", steps "*/n" or "a-b/n", comma lists, and
+        jan-dec / sun-sat names; day of week 7 is Sunday too. As in cron, when both day
+        fields are restricted a day matches either of them. @hourly, @daily, @weekly,
+        @monthly and @yearly are accepted. Times are evaluated in the current time zone.
+    """
+
+    def __init__(self, expression):
+        """
+            @param expression:
+            @raise ValueError: When the expression is not valid
+        """
+        self.expression = (expression or "").strip()
+        fields = _ALIASES.get(self.expression.lower(), self.expression).split()
+        if len(fields) != 5:
+            raise ValueError("Cron expression needs 5 fields: minute hour day-of-month month day-of-week")
+
+        parsed = [self._parse_field(value, *spec) for value, spec in zip(fields, _FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {day % 7 for day in weekdays}
+
+        self.days_restricted = fields[2] != "*"
+        self.weekdays_restricted = fields[4] != "*"
+
+        if not any(day <= self._month_length(month) for month in self.months for day in self.days):
+            raise ValueError("Cron expression never matches a date")
+
+    @staticmethod
+    def _month_length(month):
+        return 29 if month == 2 else 30 if month in (4, 6, 9, 11) else 31
+
+    @staticmethod
+    def _parse_field(value, name, lowest, highest, names):
+        def to_number(token):
+            token = token.lower()
+            if token in names:
+                return names[token]
+            if not token.isdigit():
+                raise ValueError(f"Invalid {name} value: {token}")
+            number = int(token)
+            if not lowest <= number <= highest:
+                raise ValueError(f"{name.capitalize()} {number} is outside {lowest}-{highest}")
+            return number
+
+        values = set()
+        for part in value.split(","):
+            if not part:
+                raise ValueError(f"Empty item in {name} field")
+
+            part, _, step = part.partition("/")
+            step = to_number(step) if step else 1
+            if step < 1:
+                raise ValueError(f"Invalid {name} step")
+
+            if part == "*":
+                start, end = lowest, highest
+            elif "-" in part:
+                start, _, end = part.partition("-")
+                start, end = to_number(start), to_number(end)
+                if start > end:
+                    raise ValueError(f"Invalid {name} range: {part}")
+            else:
+                start = end = to_number(part)
+                if step > 1:
+                    end = highest
+
+            values.update(range(start, end + 1, step))
+
+        return values
+
+    def _day_matches(self, day):
+        day_match = day.day in self.days
+        weekday_match = (day.weekday() + 1) % 7 in self.weekdays
+        if self.days_restricted and self.weekdays_restricted:
+            return day_match or weekday_match
+        return day_match and weekday_match
+
+    def next_after(self, after):
+        """
+            @param after: Aware datetime
+            @return: First matching minute strictly after `after`, as an aware datetime
+        """
+        local = timezone.localtime(after).replace(tzinfo=None, second=0, microsecond=0) + timedelta(minutes=1)
+        day, start = local.date(), local.time()
+
+        for _ in range(_SEARCH_DAYS):
+            if day.month in self.months and self._day_matches(day):
+                for hour in sorted(self.hours):
+                    if hour < start.hour:
+                        continue
+                    for minute in sorted(self.minutes):
+                        if hour == start.hour and minute < start.minute:
+                            continue
+                        return timezone.make_aware(datetime.combine(day, time(hour, minute)))
+            day += timedelta(days=1)
+            start = time(0, 0)
+
+        raise ValueError(f"Cron expression {self.expression} has no run in the next {_SEARCH_DAYS} days")
@@ -0,0 +1,50 @@
+import threading
+
+
+class DigestCache:
+    """
+        In-scan digest cache keyed by stat identity.
+
+        Only files with more than one hard link are kept: every other file is visited once per scan,
+        so caching it would only cost memory. Hard-linked paths share an inode and are read once.
+    """
+
+    def __init__(self):
+        self._digests = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(stat_info):
+        """
+            @param stat_info: os.stat_result
+            @return: Identity tuple that changes whenever the file content may have changed
+        """
+        return stat_info.st_dev, stat_info.st_ino, stat_info.st_size, stat_info.st_mtime_ns, stat_info.st_ctime_ns
+
+    def get(self, stat_info, algorithms):
+        """
+            @param stat_info:
+            @param algorithms: Algorithms the caller needs
+            @return: Digest dict covering every algorithm, or None
+        """
+        if stat_info.st_nlink <= 1:
+            return None
+
+        with self._lock:
+            digests = self._digests.get(self.get_key(stat_info))
+
+        if digests and all(algorithm in digests for algorithm in algorithms):
+            return digests
+        return None
+
+    def put(self, stat_info, digests):
+        """
+            @param stat_info:
+            @param digests: Digest dict to remember
+            @return: None
+        """
+        if stat_info.st_nlink <= 1:
+            return
+
+        with self._lock:
+            self._digests.setdefault(self.get_key(stat_info), {}).update(digests)
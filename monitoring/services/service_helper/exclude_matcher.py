@@ -0,0 +1,168 @@
+import functools
+import os
+import re
+
+# Only "*" is a wildcard: "?" and "[" are literal file name characters. The per-pattern loop this
+# replaced handed patterns with an inner "*" ("core.*.dump") to fnmatch, where "?" and "[...]" were
+# wildcards as well; such patterns now match those characters literally. It also took a "*suffix" or
+# "prefix*" pattern's other "*" as a literal character, which is now a wildcard
+GLOB_CHARACTERS = frozenset("*")
+
+
+def translate(pattern):
+    """
+        @param pattern: Glob whose only wildcard is "*", matching any run of characters
+        @return: Regex source matching the whole string
+    """
+    return "(?s:" + ".*".join(re.escape(part) for part in pattern.split("*")) + r")\Z"
+
+
+class _NameRules:
+    """
+        Basename rules: exact names, "*suffix", "prefix*" and a combined regex for every other glob
+    """
+
+    def __init__(self):
+        self.exact_names = set()
+        self.suffixes = set()
+        self.suffix_lengths = ()
+        self.prefix_trie = {}
+        self.globs = []
+        self.glob_regex = None
+
+    def add(self, pattern):
+        if not GLOB_CHARACTERS & set(pattern):
+            self.exact_names.add(pattern)
+        elif pattern.startswith("*") and not GLOB_CHARACTERS & set(pattern[1:]):
+            self.suffixes.add(pattern[1:])
+        elif pattern.endswith("*") and not GLOB_CHARACTERS & set(pattern[:-1]):
+            node = self.prefix_trie
+            for character in pattern[:-1]:
+                node = node.setdefault(character, {})
+            node[None] = True
+        else:
+            self.globs.append(pattern)
+
+    def compile(self):
+        self.suffix_lengths = tuple(sorted({len(suffix) for suffix in self.suffixes}))
+        if self.globs:
+            self.glob_regex = re.compile("|".join(translate(glob) for glob in self.globs))
+
+    def matches(self, name):
+        if name in self.exact_names:
+            return True
+
+        for length in self.suffix_lengths:
+            if (name[-length:] if length else "") in self.suffixes:
+                return True
+
+        node = self.prefix_trie
+        if node:
+            if None in node:
+                return True
+            for character in name:
+                node = node.get(character)
+                if node is None:
+                    break
+                if None in node:
+                    return True
+
+        return self.glob_regex is not None and self.glob_regex.match(name) is not None
+
+
+class ExcludeMatcher:
+    """
+        Exclude patterns compiled once per pattern list.
+
+        - "name", "*.ext", "prefix*" and other globs without "/" match the basename
+        - "/abs/path/*" matches the full path, "dir/sub/*.tmp" matches the trailing path components
+        - A trailing "/" ("node_modules/", "/var/cache/") restricts a pattern to directories
+    """
+
+    def __init__(self, patterns):
+        """
+            @param patterns: Exclude patterns of a baseline
+        """
+        self.patterns = tuple(patterns or ())
+
+        self._names = _NameRules()
+        self._dir_names = _NameRules()
+        path_globs = []
+        dir_path_globs = []
+
+        for pattern in self.patterns:
+            if not pattern:
+                continue
+
+            directory_only = pattern.endswith("/") and len(pattern) > 1
+            if directory_only:
+                pattern = pattern.rstrip("/")
+
+            if "/" in pattern:
+                # Relative path patterns are anchored at any directory boundary
+                regex = translate(pattern) if pattern.startswith("/") else "(?:.*/)?" + translate(pattern)
+                (dir_path_globs if directory_only else path_globs).append(regex)
+            else:
+                (self._dir_names if directory_only else self._names).add(pattern)
+
+        self._names.compile()
+        self._dir_names.compile()
+        self._path_regex = re.compile("|".join(path_globs)) if path_globs else None
+        self._dir_path_regex = re.compile("|".join(dir_path_globs)) if dir_path_globs else None
+
+    @staticmethod
+    @functools.lru_cache(maxsize=128)
+    def _compile_cached(patterns):
+        return ExcludeMatcher(patterns)
+
+    @staticmethod
+    def compile(patterns):
+        """
+            @param patterns: Exclude patterns of a baseline
+            @return: Shared ExcludeMatcher for this pattern list
+        """
+        return ExcludeMatcher._compile_cached(tuple(patterns or ()))
+
+    def matches(self, path, is_dir=False):
+        """
+            @param path: Full path of a file or directory
+            @param is_dir: Whether the path is a directory
+            @return: True when the path is excluded
+        """
+        name = os.path.basename(path)
+
+        if self._names.matches(name):
+            return True
+        if self._path_regex is not None and self._path_regex.match(path):
+            return True
+
+        if is_dir:
+            if self._dir_names.matches(name):
+                return True
+            if self._dir_path_regex is not None and self._dir_path_regex.match(path):
+                return True
+
+        return False
+
+    def matches_under(self, path, root, is_dir=False):
+        """
+            Same decision as a walk from root: the path is excluded when it, or any directory
+            between root and it, is excluded
+            @param path: Full path under root
+            @param root: Directory the walk starts from, never itself excluded
+            @param is_dir: Whether the path is a directory
+            @return: True when the path is excluded
+        """
+        root = root.rstrip("/") or "/"
+        if path.rstrip("/") == root:
+            return False
+        if self.matches(path, is_dir=is_dir):
+            return True
+
+        directory = os.path.dirname(path)
+        while len(directory) > len(root) and directory.startswith(root):
+            if self.matches(directory, is_dir=True):
+                return True
+            directory = os.path.dirname(directory)
+
+        return False
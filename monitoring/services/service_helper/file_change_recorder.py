@@ -0,0 +1,238 @@
+from django.db import transaction
+
+from file_integrity_monitoring.commons.commons import Commons
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.models import Alert, FileChange
+from monitoring.services.alert_create_service import AlertCreateService
+from monitoring.services.dashboard_summary_get_service import DashboardSummaryGetService
+from monitoring.services.service_helper.monitoring_counters import MonitoringCounters
+from monitoring.services.service_helper.whitelist_rule_engine import WhitelistRuleEngine
+
+
+class FileChangeRecorder:
+    """
+        Collect the file changes of a scan in memory and write them, with their alerts
+        and audit logs, in chunks of FILE_CHANGE_BATCH_SIZE inside one transaction per chunk.
+
+        Changes matching a whitelist rule are marked expected and get no alert, or are dropped
+        when WHITELIST_SUPPRESS_MATCHES is set.
+    """
+
+    def __init__(self, baseline, user_id, batch_size=GenericConstants.FILE_CHANGE_BATCH_SIZE):
+        """
+            @param baseline:
+            @param user_id: User the changes and audit logs are attributed to
+            @param batch_size: Changes per chunk
+        """
+        self.baseline = baseline
+        self.user_id = user_id
+        self.batch_size = batch_size
+
+        self.changes_created = 0
+        self.changes_updated = 0
+        self.alerts_created = 0
+        self.changes_whitelisted = 0
+        self.errors = 0
+
+        self.whitelist = WhitelistRuleEngine.for_baseline(baseline)
+
+        # Changes of the current chunk by dedup_key, so a path recorded twice is written once
+        self._pending = {}
+
+    def record(self, file_path, baseline_file, change_type, current_hash, severity, change_details=None):
+        """
+            Queue a change: update the open change for this file and type, or create a new one
+            @param file_path:
+            @param baseline_file: BaselineFile or BaselineFileRow, None when the baseline has no such file
+            @param change_type:
+            @param current_hash:
+            @param severity:
+            @param change_details: Details of the latest detection, such as the changed block ranges
+            @return: FileChange (saved on the next flush), or None when a whitelist rule suppressed it
+        """
+        whitelist_rule_id = self.whitelist.match(file_path, change_type)
+        if whitelist_rule_id is not None:
+            self.changes_whitelisted += 1
+            if GenericConstants.WHITELIST_SUPPRESS_MATCHES:
+                return None
+
+        dedup_key = FileChange.build_dedup_key(self.baseline.id, file_path, change_type)
+        change = self._pending.get(dedup_key)
+
+        if change is not None:
+            change.current_hash = current_hash or change.current_hash
+            change.severity = severity
+            change.change_details = change_details or {}
+            self._apply_whitelist(change, whitelist_rule_id)
+        else:
+            change = FileChange(
+                baseline=self.baseline,
+                baseline_file_id=baseline_file.id if baseline_file is not None else None,
+                file_path=file_path,
+                change_type=change_type,
+                change_details=change_details or {},
+                current_hash=current_hash,
+                severity=severity,
+                acknowledged=False,
+                user_id=self.user_id,
+                dedup_key=dedup_key
+            )
+            self._apply_whitelist(change, whitelist_rule_id)
+            self._pending[dedup_key] = change
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+        return change
+
+    @staticmethod
+    def _apply_whitelist(change, whitelist_rule_id):
+        change.expected = whitelist_rule_id is not None
+        if whitelist_rule_id is not None:
+            change.metadata = {**(change.metadata or {}), "whitelist_rule_id": whitelist_rule_id}
+        elif change.metadata and "whitelist_rule_id" in change.metadata:
+            change.metadata = {key: value for key, value in change.metadata.items() if key != "whitelist_rule_id"}
+
+    def flush(self):
+        """
+            Write queued changes, missing alerts and their audit logs in one transaction.
+            A change whose (file_path, change_type) is already open updates that change: the
+            chunk is written with one upsert on dedup_key, after one lookup of the open changes
+            it hits for the counters and alerts
+            @return: None
+        """
+        pending, self._pending = list(self._pending.values()), {}
+
+        if not pending:
+            return
+
+        try:
+            with transaction.atomic():
+                stored_changes = {
+                    dedup_key: rest for dedup_key, *rest in FileChange.objects.filter(
+                        dedup_key__in=[change.dedup_key for change in pending]
+                    ).values_list('dedup_key', 'id', 'severity', 'current_hash', 'metadata', 'detected_at')
+                }
+
+                new_changes = []
+                updated_changes = []
+                stored_severities = {}
+                for change in pending:
+                    stored = stored_changes.get(change.dedup_key)
+                    if stored is None:
+                        new_changes.append(change)
+                        continue
+
+                    change_id, stored_severities[change_id], stored_hash, stored_metadata, _ = stored
+                    change.current_hash = change.current_hash or stored_hash
+                    change.metadata = {
+                        **{key: value for key, value in (stored_metadata or {}).items() if key != "whitelist_rule_id"},
+                        **change.metadata
+                    }
+                    updated_changes.append(change)
+
+                FileChange.objects.bulk_create(
+                    pending,
+                    update_conflicts=True,
+                    unique_fields=['dedup_key'],
+                    update_fields=['current_hash', 'change_details', 'severity', 'expected', 'metadata', 'updated_at']
+                )
+                # Not every backend returns the ids of rows updated on conflict. pre_save stamped
+                # detected_at with now, while the row keeps its first detection, which the counters key on
+                for change in updated_changes:
+                    change.id = stored_changes[change.dedup_key][0]
+                    change.detected_at = stored_changes[change.dedup_key][4]
+
+                alerts = self._create_alerts(new_changes, updated_changes)
+                self._count(new_changes, updated_changes, alerts, stored_severities)
+
+            DashboardSummaryGetService.invalidate_cache()
+
+            self.changes_created += len(new_changes)
+            self.changes_updated += len(updated_changes)
+            self.alerts_created += len(alerts)
+
+        except Exception as e:
+            print(f"Error writing file changes for baseline {self.baseline.id}: {str(e)}")
+            self.errors += len(pending)
+
+    def _count(self, new_changes, updated_changes, alerts, stored_severities):
+        """
+            Update the monitoring counters for a written chunk
+            @param new_changes:
+            @param updated_changes:
+            @param alerts: Alerts created for the chunk
+            @param stored_severities: Severity each updated change was counted under, by id
+            @return: None
+        """
+        counters = MonitoringCounters()
+
+        for change in new_changes:
+            counters.add_file_change(change)
+
+        for change in updated_changes:
+            stored_severity = stored_severities.get(change.id)
+            if stored_severity and stored_severity != change.severity:
+                counters.add_file_change(change, -1, severity=stored_severity)
+                counters.add_file_change(change)
+
+        for alert in alerts:
+            counters.add_alert(alert, self.baseline.id)
+
+        counters.apply()
+
+    def _create_alerts(self, new_changes, updated_changes):
+        """
+            Create one alert per unexpected change that has none yet
+            @param new_changes:
+            @param updated_changes:
+            @return: Created alerts
+        """
+        alerted_change_ids = set()
+        if updated_changes:
+            alerted_change_ids = set(
+                Alert.objects.filter(
+                    file_change_id__in=[change.id for change in updated_changes]
+                ).values_list('file_change_id', flat=True)
+            )
+
+        alerts = [
+            Alert(
+                file_change_id=change.id,
+                severity=change.severity,
+                title=AlertCreateService.generate_title(change),
+                message=AlertCreateService.generate_message(change),
+                file_path=change.file_path,
+                change_type=change.change_type,
+                alert_channels=['in_app'],
+                read=False,
+                is_archived=False,
+                metadata={
+                    'baseline_id': self.baseline.id,
+                    'detection_method': 'auto_scan'
+                }
+            )
+            for change in new_changes + updated_changes
+            if change.id not in alerted_change_ids and not change.expected
+        ]
+        if not alerts:
+            return alerts
+
+        Alert.objects.bulk_create(alerts)
+
+        Commons.create_audit_logs(
+            user_id=self.user_id,
+            action="create",
+            resource_type="Alert",
+            entries=[
+                (alert.id, {
+                    "file_change_id": alert.file_change_id,
+                    "severity": alert.severity,
+                    "title": alert.title,
+                    "file_path": alert.file_path,
+                    "change_type": alert.change_type
+                })
+                for alert in alerts
+            ]
+        )
+        return alerts
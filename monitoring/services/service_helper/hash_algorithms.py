@@ -0,0 +1,92 @@
+import hashlib
+import zlib
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+
+class _Checksum:
+    """hashlib-style wrapper of a zlib running checksum"""
+
+    def __init__(self, function, initial):
+        self._function = function
+        self._value = initial
+
+    def update(self, data):
+        self._value = self._function(data, self._value)
+
+    def hexdigest(self):
+        return f"{self._value:08x}"
+
+
+class HashAlgorithms:
+    """
+        Registry of the algorithms a file can be digested with, by name.
+
+        Digests identify content for baselines and changes. Checksums (crc32, adler32) are only
+        a cheap screen: an attacker can keep one while changing the file, so a checksum match is
+        never the last word on a baseline's content. BLAKE3 is offered when the blake3 package
+        is installed.
+    """
+
+    _factories = {}
+    _checksums = set()
+
+    @classmethod
+    def register(cls, name, factory, checksum=False):
+        """
+            @param name: Algorithm name, as stored in Baseline.algorithm_type
+            @param factory: Callable returning an object with update() and hexdigest()
+            @param checksum: True for non-cryptographic checksums
+            @return: None
+        """
+        cls._factories[name] = factory
+        if checksum:
+            cls._checksums.add(name)
+
+    @classmethod
+    def new(cls, name):
+        """
+            @param name:
+            @return: Fresh hash object; raises ValueError for an unknown algorithm
+        """
+        factory = cls._factories.get(name)
+        if factory is None:
+            raise ValueError(f"Unsupported hash algorithm: {name}")
+        return factory()
+
+    @classmethod
+    def is_digest(cls, name):
+        """
+            @param name:
+            @return: True if name is a registered cryptographic digest, usable as a baseline algorithm
+        """
+        return name in cls._factories and name not in cls._checksums
+
+    @classmethod
+    def digests(cls):
+        """
+            @return: Names of the registered cryptographic digests
+        """
+        return [name for name in cls._factories if name not in cls._checksums]
+
+    @classmethod
+    def checksums(cls):
+        """
+            @return: Names of the registered checksums
+        """
+        return [name for name in cls._factories if name in cls._checksums]
+
+
+HashAlgorithms.register(GenericConstants.ALGORITHM_SHA256, hashlib.sha256)
+HashAlgorithms.register(GenericConstants.ALGORITHM_SHA512, hashlib.sha512)
+HashAlgorithms.register(GenericConstants.ALGORITHM_BLAKE2B, hashlib.blake2b)
+HashAlgorithms.register(GenericConstants.ALGORITHM_BLAKE2S, hashlib.blake2s)
+if blake3 is not None:
+    HashAlgorithms.register(GenericConstants.ALGORITHM_BLAKE3, blake3.blake3)
+HashAlgorithms.register(GenericConstants.CHECKSUM_CRC32, lambda: _Checksum(zlib.crc32, 0), checksum=True)
+HashAlgorithms.register(GenericConstants.CHECKSUM_ADLER32, lambda: _Checksum(zlib.adler32, 1), checksum=True)
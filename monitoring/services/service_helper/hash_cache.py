@@ -0,0 +1,179 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from django.conf import settings
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+
+
+class HashCache:
+    """
+        Digests kept across sessions and baselines in a local SQLite file, keyed by stat identity.
+
+        One row per (st_dev, st_ino) holds the size, mtime_ns and ctime_ns the digests were taken at;
+        a lookup only hits while all five still match. Writes change the ctime, and utime cannot set it
+        back, so a file is read again as soon as its content may have moved.
+
+        Writes and last-use times are batched in memory and written every HASH_CACHE_WRITE_BATCH_SIZE
+        entries. Past HASH_CACHE_MAX_ENTRIES rows, the least recently used are evicted.
+        The file is shared by every process using the same path.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path, max_entries=GenericConstants.HASH_CACHE_MAX_ENTRIES,
+                 write_batch_size=GenericConstants.HASH_CACHE_WRITE_BATCH_SIZE):
+        """
+            @param path: SQLite file, created when missing
+            @param max_entries: Rows kept before the least recently used are evicted
+            @param write_batch_size: Pending writes that trigger a flush
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.write_batch_size = write_batch_size
+
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._touched = set()
+
+        self._connection = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS digests ("
+            " dev INTEGER NOT NULL, ino INTEGER NOT NULL, size INTEGER NOT NULL,"
+            " mtime_ns INTEGER NOT NULL, ctime_ns INTEGER NOT NULL, digests TEXT NOT NULL, used_at REAL NOT NULL,"
+            " PRIMARY KEY (dev, ino))"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS digests_used_at ON digests (used_at)")
+        self._entries = self._connection.execute("SELECT COUNT(*) FROM digests").fetchone()[0]
+
+    @classmethod
+    def get_instance(cls):
+        """
+            @return: Cache shared by the current process, None when HASH_CACHE_ENABLED is off
+        """
+        if not GenericConstants.HASH_CACHE_ENABLED:
+            return None
+
+        with cls._instance_lock:
+            if cls._instance is None:
+                path = GenericConstants.HASH_CACHE_PATH or os.path.join(settings.BASE_DIR, "hash_cache.sqlite3")
+                try:
+                    cls._instance = cls(path)
+                except sqlite3.Error as e:
+                    print(f"Error opening hash cache {path}: {str(e)}")
+                    return None
+            return cls._instance
+
+    def get(self, stat_info, algorithms):
+        """
+            @param stat_info: os.stat_result
+            @param algorithms: Algorithms the caller needs
+            @return: Digest dict covering every algorithm, or None
+        """
+        key = (stat_info.st_dev, stat_info.st_ino)
+        identity = (stat_info.st_size, stat_info.st_mtime_ns, stat_info.st_ctime_ns)
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None:
+                stored_identity, digests = pending
+            else:
+                try:
+                    row = self._connection.execute(
+                        "SELECT size, mtime_ns, ctime_ns, digests FROM digests WHERE dev = ? AND ino = ?", key
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    print(f"Error reading hash cache: {str(e)}")
+                    return None
+                if row is None:
+                    return None
+                stored_identity, digests = tuple(row[:3]), json.loads(row[3])
+
+            if stored_identity != identity:
+                return None
+
+            if not all(algorithm in digests for algorithm in algorithms):
+                return None
+
+            self._touched.add(key)
+
+        return digests
+
+    def put(self, stat_info, digests):
+        """
+            @param stat_info:
+            @param digests: Digest dict to remember, merged with those stored for the same identity
+            @return: None
+        """
+        key = (stat_info.st_dev, stat_info.st_ino)
+        identity = (stat_info.st_size, stat_info.st_mtime_ns, stat_info.st_ctime_ns)
+
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is not None and pending[0] == identity:
+                digests = {**pending[1], **digests}
+            self._pending[key] = (identity, dict(digests))
+
+            if len(self._pending) + len(self._touched) >= self.write_batch_size:
+                self._flush()
+
+    def flush(self):
+        """
+            Write pending digests and last-use times, then evict past max_entries
+            @return: None
+        """
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        pending, self._pending = self._pending, {}
+        touched, self._touched = self._touched, set()
+        if not pending and not touched:
+            return
+
+        now = time.time()
+        try:
+            with self._connection:
+                self._connection.execute("BEGIN")
+                self._connection.executemany(
+                    "UPDATE digests SET used_at = ? WHERE dev = ? AND ino = ?",
+                    [(now, dev, ino) for dev, ino in touched - pending.keys()]
+                )
+                self._connection.executemany(
+                    "INSERT INTO digests (dev, ino, size, mtime_ns, ctime_ns, digests, used_at)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)"
+                    " ON CONFLICT (dev, ino) DO UPDATE SET size = excluded.size, mtime_ns = excluded.mtime_ns,"
+                    " ctime_ns = excluded.ctime_ns, used_at = excluded.used_at,"
+                    " digests = CASE WHEN size = excluded.size AND mtime_ns = excluded.mtime_ns"
+                    " AND ctime_ns = excluded.ctime_ns THEN json_patch(digests, excluded.digests)"
+                    " ELSE excluded.digests END",
+                    [
+                        (dev, ino, *identity, json.dumps(digests, sort_keys=True), now)
+                        for (dev, ino), (identity, digests) in pending.items()
+                    ]
+                )
+            self._entries += len(pending)
+
+            if self._entries > self.max_entries:
+                self._entries = self._connection.execute("SELECT COUNT(*) FROM digests").fetchone()[0]
+                if self._entries > self.max_entries:
+                    self._evict(self._entries - self.max_entries)
+        except sqlite3.Error as e:
+            print(f"Error writing hash cache: {str(e)}")
+
+    def _evict(self, count):
+        # Down to 90% of the bound, so eviction does not run on every flush
+        count += self.max_entries // 10
+        with self._connection:
+            self._connection.execute("BEGIN")
+            self._connection.execute(
+                "DELETE FROM digests WHERE rowid IN (SELECT rowid FROM digests ORDER BY used_at LIMIT ?)", (count,)
+            )
+        self._entries = max(self._entries - count, 0)
+
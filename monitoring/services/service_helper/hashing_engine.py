@@ -0,0 +1,185 @@
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+
+
+def _timed_hash(hash_function, file_path, algorithms):
+    """
+        Run hash_function in a worker and time it there, so queueing in the pool is left out
+        @return: (is_success, {algorithm: digest}, seconds)
+    """
+    started = time.perf_counter()
+    is_success, digests = hash_function(file_path, algorithms)
+    return is_success, digests, time.perf_counter() - started
+
+
+class HashingEngine:
+    """
+        Fan file hashing out to a worker pool and stream the results back.
+
+        Thread pools suit I/O-bound disks (hashlib releases the GIL while digesting large buffers),
+        process pools suit CPU-bound algorithms such as SHA-512 on fast storage.
+    """
+
+    def __init__(self, hash_function, workers=1, executor_type=GenericConstants.HASH_EXECUTOR_THREAD,
+                 digest_cache=None, throttle=None, hash_cache=None, paranoid_sample=0.0,
+                 bypass_cache=None):
+        """
+            @param hash_function: Picklable callable (file_path, algorithms) -> (is_success, {algorithm: digest})
+            @param workers: Number of workers; 1 or less hashes inline in the caller's thread
+            @param executor_type: thread or process
+            @param digest_cache: Optional DigestCache consulted before a file is read
+            @param throttle: Optional IoThrottle paced with the size of every file read, and told how long
+            each read took
+            @param hash_cache: Optional HashCache kept across scans, consulted after digest_cache
+            @param paranoid_sample: Fraction of hash_cache hits read anyway and checked against the cache
+            @param bypass_cache: Optional predicate on file paths that are read without consulting hash_cache
+        """
+        self.hash_function = hash_function
+        self.workers = max(int(workers or 1), 1)
+        self.executor_type = executor_type
+        self.digest_cache = digest_cache
+        self.throttle = throttle
+        self.hash_cache = hash_cache
+        self.paranoid_sample = paranoid_sample
+        self.bypass_cache = bypass_cache
+
+        self.cache_hits = 0
+        self.cache_mismatches = 0
+        # Cached digests of the files picked for a paranoid read, by path
+        self._verifying = {}
+
+    def _create_executor(self):
+        if self.executor_type == GenericConstants.HASH_EXECUTOR_PROCESS:
+            return ProcessPoolExecutor(max_workers=self.workers)
+        return ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fim-hash")
+
+    def _cached(self, file_path, stat_info, algorithms):
+        if stat_info is None:
+            return None
+
+        if self.digest_cache is not None:
+            digests = self.digest_cache.get(stat_info, algorithms)
+            if digests is not None:
+                return digests
+
+        if self.hash_cache is None or (self.bypass_cache is not None and self.bypass_cache(file_path)):
+            return None
+
+        digests = self.hash_cache.get(stat_info, algorithms)
+        if digests is None:
+            return None
+        if self.paranoid_sample and random.random() < self.paranoid_sample:
+            self._verifying[file_path] = digests
+            return None
+
+        self.cache_hits += 1
+        return digests
+
+    def lookup(self, file_path, stat_info, algorithms):
+        """
+            Digests the caches hold for a file the caller reads by other means
+            @param file_path:
+            @param stat_info:
+            @param algorithms:
+            @return: Digest dict, or None when the file has to be read
+        """
+        digests = self._cached(file_path, stat_info, algorithms)
+        # A paranoid pick is read by the caller, not checked here
+        self._verifying.pop(file_path, None)
+        return digests
+
+    def _pace(self, stat_info):
+        if self.throttle is not None and stat_info is not None:
+            self.throttle.consume(stat_info.st_size)
+
+    def _observe(self, stat_info, is_success, seconds):
+        if self.throttle is not None and stat_info is not None and is_success:
+            self.throttle.observe(stat_info.st_size, seconds)
+
+    def _remember(self, file_path, stat_info, is_success, digests):
+        cached_digests = self._verifying.pop(file_path, None)
+        if stat_info is None or not is_success:
+            return
+
+        if cached_digests is not None and any(
+                cached_digests.get(algorithm) != digest for algorithm, digest in digests.items()
+        ):
+            # Content changed without moving the stat identity: the clock was set back, or the disk written raw
+            self.cache_mismatches += 1
+            print(f"Hash cache mismatch for {file_path}: content changed with an unchanged stat identity")
+
+        if self.digest_cache is not None:
+            self.digest_cache.put(stat_info, digests)
+        if self.hash_cache is not None:
+            self.hash_cache.put(stat_info, digests)
+
+    def hash_files(self, files, algorithms):
+        """
+            Hash every file from an iterable and yield results as they complete.
+            Each file is read once for all requested algorithms.
+            @param files: Iterable of (file_path, stat_info), consumed lazily
+            @param algorithms: Tuple of hash algorithm names
+            @return: Generator of (file_path, stat_info, is_success, {algorithm: digest}) in completion order
+        """
+        try:
+            yield from self._hash_files(files, algorithms)
+        finally:
+            if self.hash_cache is not None:
+                self.hash_cache.flush()
+
+    def _hash_files(self, files, algorithms):
+        if self.workers <= 1:
+            for file_path, stat_info in files:
+                digests = self._cached(file_path, stat_info, algorithms)
+                if digests is not None:
+                    yield file_path, stat_info, True, digests
+                    continue
+
+                self._pace(stat_info)
+                is_success, digests, seconds = _timed_hash(self.hash_function, file_path, algorithms)
+                self._observe(stat_info, is_success, seconds)
+                self._remember(file_path, stat_info, is_success, digests)
+                yield file_path, stat_info, is_success, digests
+            return
+
+        max_in_flight = self.workers * GenericConstants.HASH_QUEUE_DEPTH_PER_WORKER
+        files = iter(files)
+
+        with self._create_executor() as executor:
+            in_flight = {}
+            exhausted = False
+
+            while True:
+                # Keep the pool fed without materialising the whole walk
+                while not exhausted and len(in_flight) < max_in_flight:
+                    try:
+                        file_path, stat_info = next(files)
+                    except StopIteration:
+                        exhausted = True
+                        break
+
+                    digests = self._cached(file_path, stat_info, algorithms)
+                    if digests is not None:
+                        yield file_path, stat_info, True, digests
+                        continue
+
+                    self._pace(stat_info)
+                    future = executor.submit(_timed_hash, self.hash_function, file_path, algorithms)
+                    in_flight[future] = (file_path, stat_info)
+
+                if not in_flight:
+                    return
+
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path, stat_info = in_flight.pop(future)
+                    try:
+                        is_success, digests, seconds = future.result()
+                    except Exception:
+                        is_success, digests, seconds = False, {}, 0.0
+                    self._observe(stat_info, is_success, seconds)
+                    self._remember(file_path, stat_info, is_success, digests)
+                    yield file_path, stat_info, is_success, digests
@@ -0,0 +1,183 @@
+import hashlib
+import os
+
+from django.db import transaction
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.models import DirectoryFingerprint
+from monitoring.services.service_helper.exclude_matcher import ExcludeMatcher
+
+
+class IncrementalDirectoryWalker:
+    """
+        Walk a baseline tree and list the files of changed directories only.
+
+        A directory is fingerprinted by its mtime, its entry count and a rolling hash of
+        (name, inode, type) over its entries. When the stored mtime still matches, the directory
+        is not listed and its files are neither stat'ed nor yielded. Its subdirectories are
+        still visited from the stored child list, at the cost of one stat each.
+
+        Creating, deleting or renaming a file updates its directory's mtime, but rewriting a
+        file in place does not. The walker serves the opt-in structural monitor type only, and
+        in-place edits in unchanged directories are left to the other types, which stat every file.
+    """
+
+    def __init__(self, helper, root, exclude_patterns, fingerprints):
+        """
+            @param helper: MonitoringServiceHelper providing directory listing
+            @param root: Baseline path
+            @param exclude_patterns:
+            @param fingerprints: Stored fingerprints, {dir_path: {mtime_ns, entry_count, fingerprint, child_dirs}}
+        """
+        self.helper = helper
+        self.root = root
+        self.exclude_matcher = ExcludeMatcher.compile(exclude_patterns)
+        self.fingerprints = fingerprints
+
+        self.updated = {}
+        self.visited_dirs = set()
+        self.unchanged_dirs = set()
+
+    @classmethod
+    def for_baseline(cls, helper, baseline):
+        """
+            @param helper:
+            @param baseline:
+            @return: Walker seeded with the baseline's stored fingerprints
+        """
+        fingerprints = {
+            fingerprint.dir_path: {
+                "mtime_ns": fingerprint.mtime_ns,
+                "entry_count": fingerprint.entry_count,
+                "fingerprint": fingerprint.fingerprint,
+                "child_dirs": fingerprint.child_dirs
+            }
+            for fingerprint in DirectoryFingerprint.objects.filter(baseline=baseline)
+        }
+        return cls(helper, baseline.path, baseline.exclude_patterns, fingerprints)
+
+    @staticmethod
+    def fingerprint_entries(items):
+        """
+            @param items: (DirEntry, is_dir) pairs of one directory
+            @return: Hex digest over the entries' (name, inode, type)
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        for entry, is_dir in items:
+            entry_type = "l" if entry.is_symlink() else "d" if is_dir else "f"
+            digest.update(f"{entry.name}\0{entry.inode()}\0{entry_type}\n".encode("utf-8", "surrogateescape"))
+        return digest.hexdigest()
+
+    def is_unchanged(self, file_path):
+        """
+            @param file_path:
+            @return: True when the file sits in a directory that was skipped as unchanged
+        """
+        return os.path.dirname(file_path) in self.unchanged_dirs
+
+    def walk(self):
+        """
+            Depth-first walk in ascending path order, like MonitoringServiceHelper.walk_files
+            @return: Generator of (file_path, stat_info) for the files of changed directories
+        """
+        # Children are (path, DirEntry) for files and (path, None) for directories
+        pending = [iter([(self.root, None)])]
+
+        while pending:
+            item = next(pending[-1], None)
+            if item is None:
+                pending.pop()
+                continue
+
+            path, entry = item
+            if entry is None:
+                pending.append(iter(self._visit_directory(path)))
+                continue
+
+            try:
+                stat_info = entry.stat()
+            except OSError as e:
+                print(f"Error processing file {path}: {str(e)}")
+                continue
+
+            yield path, stat_info
+
+    def _visit_directory(self, dir_path):
+        try:
+            mtime_ns = os.stat(dir_path).st_mtime_ns
+        except OSError as e:
+            print(f"Error reading directory {dir_path}: {str(e)}")
+            return []
+
+        self.visited_dirs.add(dir_path)
+
+        stored = self.fingerprints.get(dir_path)
+        if stored is not None and stored["mtime_ns"] == mtime_ns:
+            self.unchanged_dirs.add(dir_path)
+            return [(os.path.join(dir_path, name), None) for name in stored["child_dirs"]]
+
+        items = self.helper.sorted_dir_entries(dir_path)
+        fingerprint = self.fingerprint_entries(items)
+
+        children = []
+        child_dirs = []
+        for entry, is_dir in items:
+            if is_dir:
+                # Same as walk_files: symlinked directories are not descended into
+                if not entry.is_symlink() and not self.exclude_matcher.matches(entry.path, is_dir=True):
+                    child_dirs.append(entry.name)
+                    children.append((entry.path, None))
+            elif not self.exclude_matcher.matches(entry.path):
+                children.append((entry.path, entry))
+
+        self.updated[dir_path] = {
+            "mtime_ns": mtime_ns,
+            "entry_count": len(items),
+            "fingerprint": fingerprint,
+            "child_dirs": child_dirs
+        }
+
+        # Only the mtime moved, e.g. a file was created and removed again
+        if stored is not None and stored["fingerprint"] == fingerprint and stored["entry_count"] == len(items):
+            self.unchanged_dirs.add(dir_path)
+            return [child for child in children if child[1] is None]
+
+        return children
+
+    def save(self, baseline):
+        """
+            Store the fingerprints refreshed by a completed walk and drop those of vanished directories
+            @param baseline:
+            @return: None
+        """
+        stale_dirs = [dir_path for dir_path in self.fingerprints if dir_path not in self.visited_dirs]
+        replaced_dirs = stale_dirs + [dir_path for dir_path in self.updated if dir_path in self.fingerprints]
+
+        with transaction.atomic():
+            for start in range(0, len(replaced_dirs), GenericConstants.DIRECTORY_FINGERPRINT_BATCH_SIZE):
+                DirectoryFingerprint.objects.filter(
+                    baseline=baseline,
+                    dir_path__in=replaced_dirs[start:start + GenericConstants.DIRECTORY_FINGERPRINT_BATCH_SIZE]
+                ).delete()
+
+            DirectoryFingerprint.objects.bulk_create(
+                [
+                    DirectoryFingerprint(baseline=baseline, dir_path=dir_path, **record)
+                    for dir_path, record in self.updated.items()
+                ],
+                batch_size=GenericConstants.DIRECTORY_FINGERPRINT_BATCH_SIZE
+            )
+
+        self.apply_updates()
+
+    def apply_updates(self):
+        """
+            Fold the fingerprints refreshed by a completed walk into the in-memory set
+            @return: None
+        """
+        for dir_path in [dir_path for dir_path in self.fingerprints if dir_path not in self.visited_dirs]:
+            del self.fingerprints[dir_path]
+        self.fingerprints.update(self.updated)
+        self.updated = {}
+        self.visited_dirs = set()
+        self.unchanged_dirs = set()
@@ -0,0 +1,162 @@
+import os
+import tempfile
+import threading
+import time
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.services.service_helper.io_throttle import IoThrottle, SharedIoThrottle
+
+
+class IoGovernor:
+    """
+        Read budgets of one scan, used wherever an IoThrottle is: every read books its bytes and
+        files on each budget and waits for the slowest one.
+
+        Global and per-baseline budgets are SharedIoThrottles, shared by every scanning thread and
+        process on the host; a session may add a budget of its own. Each allows IO_BURST_SECONDS
+        of idle time as credit.
+
+        Read latency is followed as a moving average of seconds per IO_LATENCY_UNIT_BYTES, smaller
+        reads counting as one unit. While it stays IO_BACKOFF_LATENCY_RATIO times above the lowest
+        average seen, the rate factor is halved every IO_BACKOFF_INTERVAL_SECONDS, down to
+        IO_BACKOFF_MIN_RATE_FACTOR, and otherwise grows back by IO_BACKOFF_RATE_STEP. Reads book
+        1 / factor times their size, which slows the shared budgets for every process, since the
+        latency belongs to the disk. Without a budget nothing is paced, reads are only counted.
+    """
+
+    # Weight of a new sample in the latency average
+    LATENCY_SMOOTHING = 0.2
+    # Samples before the average may become the reference
+    LATENCY_WARMUP_SAMPLES = 8
+
+    def __init__(self, byte_budgets=(), file_budgets=()):
+        """
+            @param byte_budgets: IoThrottles booked with the bytes of each read
+            @param file_budgets: IoThrottles booked with the files of each read
+        """
+        self.byte_budgets = [budget for budget in byte_budgets if budget.rate > 0]
+        self.file_budgets = [budget for budget in file_budgets if budget.rate > 0]
+
+        self.rate_factor = 1.0
+        self.min_rate_factor = 1.0
+        self.bytes_read = 0
+        self.files_read = 0
+        self.throttled_seconds = 0.0
+
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._latency = None
+        self._reference_latency = None
+        self._samples = 0
+        self._adjusted_at = self._started
+
+    @classmethod
+    def for_baseline(cls, baseline, session_bytes_per_second=0):
+        """
+            @param baseline:
+            @param session_bytes_per_second: Budget of this scan alone, 0 for none
+            @return: IoGovernor with the global, baseline and session budgets
+        """
+        directory = GenericConstants.IO_GOVERNOR_DIR or os.path.join(tempfile.gettempdir(), "fim-io-governor")
+        burst = GenericConstants.IO_BURST_SECONDS
+
+        def shared(name, rate):
+            return SharedIoThrottle(os.path.join(directory, name), rate, burst)
+
+        return cls(
+            byte_budgets=(
+                shared("global-bytes", GenericConstants.IO_GLOBAL_BYTES_PER_SECOND),
+                shared(f"baseline-{baseline.id}-bytes", baseline.io_bytes_per_second),
+                IoThrottle(session_bytes_per_second, burst)
+            ),
+            file_budgets=(
+                shared("global-files", GenericConstants.IO_GLOBAL_FILES_PER_SECOND),
+                shared(f"baseline-{baseline.id}-files", baseline.io_files_per_second)
+            )
+        )
+
+    def consume(self, nbytes, files=1):
+        """
+            Wait until a read of nbytes over files files fits every budget
+            @param nbytes:
+            @param files: 0 for a further read of a file already counted, such as a block
+            @return: Seconds waited
+        """
+        factor = self.rate_factor
+        delay = max(
+            [budget.reserve(nbytes / factor) for budget in self.byte_budgets if nbytes > 0] +
+            [budget.reserve(files / factor) for budget in self.file_budgets if files > 0] +
+            [0.0]
+        )
+
+        with self._lock:
+            self.bytes_read += nbytes
+            self.files_read += files
+            self.throttled_seconds += delay
+
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def observe(self, nbytes, seconds):
+        """
+            Report how long a read took and adapt the rate factor
+            @param nbytes:
+            @param seconds:
+            @return: None
+        """
+        sample = seconds / max(nbytes / GenericConstants.IO_LATENCY_UNIT_BYTES, 1.0)
+
+        with self._lock:
+            self._samples += 1
+            if self._latency is None:
+                self._latency = sample
+            else:
+                self._latency += self.LATENCY_SMOOTHING * (sample - self._latency)
+
+            if self._samples < self.LATENCY_WARMUP_SAMPLES:
+                return
+            if self._reference_latency is None or self._latency < self._reference_latency:
+                self._reference_latency = self._latency
+
+            now = time.monotonic()
+            if now - self._adjusted_at < GenericConstants.IO_BACKOFF_INTERVAL_SECONDS:
+                return
+            self._adjusted_at = now
+
+            if self._latency > self._reference_latency * GenericConstants.IO_BACKOFF_LATENCY_RATIO:
+                self.rate_factor = max(self.rate_factor / 2, GenericConstants.IO_BACKOFF_MIN_RATE_FACTOR)
+            else:
+                self.rate_factor = min(self.rate_factor + GenericConstants.IO_BACKOFF_RATE_STEP, 1.0)
+            self.min_rate_factor = min(self.min_rate_factor, self.rate_factor)
+
+    def describe(self):
+        """
+            @return: Effective throughput and pacing of the scan so far, for session metadata
+        """
+        with self._lock:
+            seconds = max(time.monotonic() - self._started, 1e-6)
+            return {
+                "bytes_read": self.bytes_read,
+                "files_read": self.files_read,
+                "seconds": round(seconds, 3),
+                "bytes_per_second": int(self.bytes_read / seconds),
+                "files_per_second": round(self.files_read / seconds, 1),
+                "throttled_seconds": round(self.throttled_seconds, 3),
+                "bytes_per_second_budget": min(
+                    (budget.rate for budget in self.byte_budgets), default=None
+                ),
+                "files_per_second_budget": min(
+                    (budget.rate for budget in self.file_budgets), default=None
+                ),
+                "rate_factor": round(self.rate_factor, 3),
+                "min_rate_factor": round(self.min_rate_factor, 3),
+                "latency_ms": round(self._latency * 1000, 3) if self._latency is not None else None,
+                "reference_latency_ms": (
+                    round(self._reference_latency * 1000, 3) if self._reference_latency is not None else None
+                )
+            }
+
+    def close(self):
+        for budget in self.byte_budgets + self.file_budgets:
+            budget.close()
@@ -0,0 +1,126 @@
+import os
+import struct
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class IoThrottle:
+    """
+        Pace file reads to a byte rate, shared by every hashing worker of a scan.
+
+        Each file reserves st_size / rate seconds of read time; a caller waits until the
+        reservations made before it have elapsed, so the average rate stays at or below
+        bytes_per_second while one file may be read as a burst. Time left unused is kept
+        as credit for up to burst_seconds, which makes this a token bucket of
+        bytes_per_second * burst_seconds bytes that may go into debt.
+    """
+
+    def __init__(self, bytes_per_second, burst_seconds=0.0):
+        """
+            @param bytes_per_second: Read budget; 0 or None disables pacing
+            @param burst_seconds: Idle time kept as credit
+        """
+        # Units per second: bytes, or files for a files/sec budget
+        self.rate = bytes_per_second or 0
+        self.burst_seconds = burst_seconds
+        self._next_free = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, nbytes):
+        """
+            Book nbytes of read time without waiting
+            @param nbytes:
+            @return: Seconds the caller has to wait before reading
+        """
+        if self.rate <= 0 or nbytes <= 0:
+            return 0.0
+
+        with self._lock:
+            now = time.monotonic()
+            self._next_free, delay = self._book(self._next_free, now, nbytes)
+        return delay
+
+    def _book(self, next_free, now, nbytes):
+        start = max(next_free, now - self.burst_seconds)
+        return start + nbytes / self.rate, max(start - now, 0.0)
+
+    def consume(self, nbytes, files=1):
+        """
+            Wait until nbytes may be read
+            @param nbytes:
+            @param files: Files the read counts for; a byte throttle ignores it
+            @return: Seconds waited
+        """
+        delay = self.reserve(nbytes)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def observe(self, nbytes, seconds):
+        """
+            Report how long a read took; a fixed-rate throttle does not adapt
+            @param nbytes:
+            @param seconds:
+            @return: None
+        """
+
+    def close(self):
+        pass
+
+
+class SharedIoThrottle(IoThrottle):
+    """
+        IoThrottle whose reservations are kept in a file under flock, so every process
+        reading with the same path shares one budget. The file holds the monotonic time the
+        budget is booked until; CLOCK_MONOTONIC is host-wide. Without fcntl, or when the file
+        cannot be opened, the budget is only shared within the process.
+    """
+
+    # A booking further ahead than this was made before a reboot reset the monotonic clock
+    MAX_BOOKED_SECONDS = 24 * 3600
+
+    def __init__(self, path, rate, burst_seconds=0.0):
+        """
+            @param path: State file, created when missing
+            @param rate: Units per second; 0 or None disables pacing
+            @param burst_seconds:
+        """
+        super().__init__(rate, burst_seconds)
+        self.path = path
+        self._fd = None
+        if fcntl is not None and self.rate > 0:
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+            except OSError as e:
+                print(f"Error opening I/O budget {path}, pacing this process only: {str(e)}")
+
+    def reserve(self, nbytes):
+        if self._fd is None:
+            return super().reserve(nbytes)
+        if self.rate <= 0 or nbytes <= 0:
+            return 0.0
+
+        with self._lock:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+            try:
+                now = time.monotonic()
+                data = os.pread(self._fd, 8, 0)
+                next_free = struct.unpack("d", data)[0] if len(data) == 8 else now
+                if next_free > now + self.MAX_BOOKED_SECONDS:
+                    next_free = now
+                next_free, delay = self._book(next_free, now, nbytes)
+                os.pwrite(self._fd, struct.pack("d", next_free), 0)
+            finally:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+        return delay
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,234 @@
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.models import Alert, FileChange, MonitoringCounter
+
+FILE_CHANGES_OPEN = "file_changes.open"
+FILE_CHANGES_ACKNOWLEDGED = "file_changes.acknowledged"
+
+
+def file_change_metric(acknowledged):
+    """
+        @param acknowledged:
+        @return: Metric counting file changes in this state
+    """
+    return FILE_CHANGES_ACKNOWLEDGED if acknowledged else FILE_CHANGES_OPEN
+
+
+def alert_metric(read, is_archived):
+    """
+        @param read:
+        @param is_archived:
+        @return: Metric counting alerts in this state
+    """
+    return f"alerts.{'read' if read else 'unread'}.{'archived' if is_archived else 'inbox'}"
+
+
+def build_counter_rows(file_change_model, alert_model, counter_model, baseline_id=None):
+    """
+        Recompute counters from the file change and alert tables. Migration 0011 keeps a frozen
+        copy of this aggregation; change both when the metrics change.
+        @param file_change_model:
+        @param alert_model:
+        @param counter_model:
+        @param baseline_id: Restrict to one baseline
+        @return: Unsaved counter rows, daily and all-time
+    """
+    counts = defaultdict(int)
+
+    changes = file_change_model.objects.all()
+    alerts = alert_model.objects.all()
+    if baseline_id is not None:
+        changes = changes.filter(baseline_id=baseline_id)
+        alerts = alerts.filter(file_change__baseline_id=baseline_id)
+
+    change_rows = changes.order_by().values(
+        'baseline_id', 'severity', 'acknowledged', day=TruncDate('detected_at')
+    ).annotate(total=Count('id'))
+    for row in change_rows:
+        key = (file_change_metric(row['acknowledged']), row['baseline_id'], row['severity'])
+        counts[key + (row['day'],)] += row['total']
+        counts[key + (None,)] += row['total']
+
+    alert_rows = alerts.order_by().values(
+        'severity', 'read', 'is_archived',
+        change_baseline_id=F('file_change__baseline_id'), day=TruncDate('created_at')
+    ).annotate(total=Count('id'))
+    for row in alert_rows:
+        key = (alert_metric(row['read'], row['is_archived']), row['change_baseline_id'], row['severity'])
+        counts[key + (row['day'],)] += row['total']
+        counts[key + (None,)] += row['total']
+
+    return [
+        counter_model(metric=metric, baseline_id=row_baseline_id, severity=severity, day=day, count=count)
+        for (metric, row_baseline_id, severity, day), count in counts.items()
+    ]
+
+
+class MonitoringCounters:
+    """
+        Per-baseline, per-severity and per-day counts of file changes and alerts.
+
+        Each file change is counted under one metric by acknowledgement and each alert under
+        one metric by read and archived state, on the day the row was created. A state change
+        moves one count between metrics, so totals for any combination of those flags are a sum
+        over a handful of counter rows. Every delta also lands on the all-time row (day null).
+
+        Deltas are collected on an instance and written by apply(), which callers run in the
+        transaction that writes the counted rows. `manage.py rebuild_monitoring_counters`
+        recomputes them from the tables.
+    """
+
+    def __init__(self):
+        self._deltas = defaultdict(int)
+
+    def add(self, metric, baseline_id, severity, created_at, count=1):
+        """
+            @param metric:
+            @param baseline_id:
+            @param severity:
+            @param created_at: Creation time of the counted row
+            @param count: Delta, negative to uncount
+            @return: None
+        """
+        day = timezone.localdate(created_at) if created_at else timezone.localdate()
+        self._deltas[(metric, baseline_id, severity, day)] += count
+        self._deltas[(metric, baseline_id, severity, None)] += count
+
+    def add_file_change(self, change, count=1, acknowledged=None, severity=None):
+        """
+            @param change: Saved FileChange
+            @param count: 1 to count the change, -1 to uncount it
+            @param acknowledged: State to count under instead of the change's current one
+            @param severity: Severity to count under instead of the change's current one
+            @return: None
+        """
+        self.add(
+            file_change_metric(change.acknowledged if acknowledged is None else acknowledged),
+            change.baseline_id,
+            severity or change.severity,
+            change.detected_at,
+            count
+        )
+
+    def add_alert(self, alert, baseline_id, count=1, read=None, is_archived=None):
+        """
+            @param alert: Saved Alert
+            @param baseline_id: Baseline of the alert's file change
+            @param count: 1 to count the alert, -1 to uncount it
+            @param read: State to count under instead of the alert's current one
+            @param is_archived: State to count under instead of the alert's current one
+            @return: None
+        """
+        self.add(
+            alert_metric(
+                alert.read if read is None else read,
+                alert.is_archived if is_archived is None else is_archived
+            ),
+            baseline_id,
+            alert.severity,
+            alert.created_at,
+            count
+        )
+
+    def apply(self):
+        """
+            Write the collected deltas
+            @return: None
+        """
+        deltas, self._deltas = self._deltas, defaultdict(int)
+
+        with transaction.atomic():
+            for (metric, baseline_id, severity, day), delta in deltas.items():
+                if delta:
+                    self._increment(metric, baseline_id, severity, day, delta)
+
+    @staticmethod
+    def _increment(metric, baseline_id, severity, day, delta):
+        counters = MonitoringCounter.objects.filter(
+            metric=metric, baseline_id=baseline_id, severity=severity, day=day
+        )
+        if counters.update(count=F('count') + delta):
+            return
+
+        try:
+            with transaction.atomic():
+                MonitoringCounter.objects.create(
+                    metric=metric, baseline_id=baseline_id, severity=severity, day=day, count=delta
+                )
+        except IntegrityError:
+            # Created concurrently by another writer
+            counters.update(count=F('count') + delta)
+
+    @staticmethod
+    def file_change_metrics(acknowledged=None):
+        """
+            @param acknowledged: None for both states
+            @return: Metrics covering file changes in the given state
+        """
+        return [
+            file_change_metric(state) for state in (False, True)
+            if acknowledged is None or state == acknowledged
+        ]
+
+    @staticmethod
+    def alert_metrics(read=None, is_archived=None):
+        """
+            @param read: None for both states
+            @param is_archived: None for both states
+            @return: Metrics covering alerts in the given states
+        """
+        return [
+            alert_metric(read_state, archived_state)
+            for read_state in (False, True)
+            for archived_state in (False, True)
+            if (read is None or read_state == read) and (is_archived is None or archived_state == is_archived)
+        ]
+
+    @staticmethod
+    def total(metrics, baseline_id=None, severity=None):
+        """
+            @param metrics: Metrics to add up
+            @param baseline_id:
+            @param severity:
+            @return: All-time count over the metrics
+        """
+        counters = MonitoringCounter.objects.filter(metric__in=metrics, day__isnull=True)
+        if baseline_id is not None:
+            counters = counters.filter(baseline_id=baseline_id)
+        if severity:
+            counters = counters.filter(severity=severity)
+        return counters.aggregate(total=Sum('count'))['total'] or 0
+
+    @staticmethod
+    def totals_by_metric_and_severity():
+        """
+            @return: All-time counts over every baseline, {(metric, severity): count}
+        """
+        rows = MonitoringCounter.objects.filter(day__isnull=True).order_by().values(
+            'metric', 'severity'
+        ).annotate(total=Sum('count'))
+        return {(row['metric'], row['severity']): row['total'] for row in rows}
+
+    @staticmethod
+    def rebuild(baseline_id=None):
+        """
+            Replace the stored counters with counts recomputed from the tables
+            @param baseline_id: Restrict to one baseline
+            @return: Number of counter rows written
+        """
+        with transaction.atomic():
+            counters = MonitoringCounter.objects.all()
+            if baseline_id is not None:
+                counters = counters.filter(baseline_id=baseline_id)
+            counters.delete()
+
+            rows = build_counter_rows(FileChange, Alert, MonitoringCounter, baseline_id)
+            MonitoringCounter.objects.bulk_create(rows, batch_size=GenericConstants.FILE_CHANGE_BATCH_SIZE)
+
+        return len(rows)
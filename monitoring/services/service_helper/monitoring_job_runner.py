@@ -0,0 +1,188 @@
+import os
+import socket
+import threading
+import time
+
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.models import MonitoringJob
+from monitoring.services.service_helper.monitoring_session_reaper import MonitoringSessionReaper
+
+
+class MonitoringJobRunner:
+    """
+        Pool of worker threads executing queued monitoring jobs from the MonitoringJob table.
+
+        Jobs are claimed with a conditional UPDATE on their status, so any number of runners
+        (the web process and `manage.py run_monitoring_jobs`) can share the same queue.
+        Idle workers run the MonitoringSessionReaper every SESSION_REAP_INTERVAL_SECONDS, so
+        sessions of a dead runner are resumed or failed.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, workers=GenericConstants.JOB_RUNNER_WORKERS, poll_seconds=GenericConstants.JOB_POLL_SECONDS):
+        """
+            @param workers: Number of jobs executed concurrently
+            @param poll_seconds: Idle wait between queue polls
+        """
+        self.workers = max(int(workers or 1), 1)
+        self.poll_seconds = poll_seconds
+        self.worker_name = f"{socket.gethostname()}:{os.getpid()}"
+
+        self._threads = []
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._next_reap = 0.0
+
+    @classmethod
+    def get_instance(cls):
+        """
+            @return: Runner shared by the current process
+        """
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @staticmethod
+    def enqueue(session, params):
+        """
+            Queue a monitoring session and wake the in-process runner once the job is committed
+            @param session: MonitoringSession in queued status
+            @param params: Parameters handed to the session run
+            @return: MonitoringJob
+        """
+        job = MonitoringJob.objects.create(session=session, params=params)
+
+        if GenericConstants.JOB_RUNNER_IN_PROCESS:
+            # Inside a transaction, workers woken now could not see the job or its session yet
+            transaction.on_commit(lambda: MonitoringJobRunner.get_instance().start())
+
+        return job
+
+    def start(self):
+        """
+            Start the worker threads if they are not running and wake idle workers
+            @return: None
+        """
+        with self._lock:
+            self._threads = [thread for thread in self._threads if thread.is_alive()]
+            self._stop_event.clear()
+
+            for index in range(len(self._threads), self.workers):
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f"fim-monitoring-job-{index}",
+                    daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+        self._wake_event.set()
+
+    def stop(self, timeout=None):
+        """
+            Ask workers to exit once their current job is done
+            @param timeout: Seconds to wait for each worker
+            @return: None
+        """
+        self._stop_event.set()
+        self._wake_event.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def run_forever(self):
+        """
+            Start the workers and block until stopped
+            @return: None
+        """
+        self.start()
+        try:
+            while any(thread.is_alive() for thread in self._threads):
+                for thread in self._threads:
+                    thread.join(self.poll_seconds)
+        except KeyboardInterrupt:
+            self.stop()
+
+    def claim_next_job(self):
+        """
+            Atomically move the oldest queued job to running
+            @return: MonitoringJob or None when the queue is empty
+        """
+        candidate_ids = MonitoringJob.objects.filter(
+            status=GenericConstants.SESSION_STATUS_QUEUED
+        ).order_by('created_at').values_list('id', flat=True)[:self.workers]
+
+        for job_id in candidate_ids:
+            claimed = MonitoringJob.objects.filter(
+                id=job_id, status=GenericConstants.SESSION_STATUS_QUEUED
+            ).update(
+                status=GenericConstants.SESSION_STATUS_RUNNING,
+                worker=self.worker_name,
+                started_at=timezone.now(),
+                attempts=F('attempts') + 1
+            )
+            if claimed:
+                return MonitoringJob.objects.get(id=job_id)
+
+        return None
+
+    def run_job(self, job):
+        """
+            Execute a claimed job and record its final status
+            @param job: MonitoringJob in running status
+            @return: Final job status
+        """
+        # Imported here: the session service enqueues through this module
+        from monitoring.services.monitoring_session_create_service import MonitoringSessionCreateService
+
+        try:
+            job_status = MonitoringSessionCreateService().run_session(job.session_id, job.params, job.attempts)
+        except Exception as e:
+            print(f"Error running monitoring job {job.id}: {str(e)}")
+            job_status = GenericConstants.SESSION_STATUS_FAILED
+
+        # A job reaped and queued again meanwhile belongs to its next run
+        MonitoringJob.objects.filter(
+            id=job.id, status=GenericConstants.SESSION_STATUS_RUNNING, attempts=job.attempts
+        ).update(status=job_status, finished_at=timezone.now())
+        return job_status
+
+    def reap_if_due(self):
+        """
+            Run the session reaper when SESSION_REAP_INTERVAL_SECONDS have passed since the last run
+            @return: None
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_reap:
+                return
+            self._next_reap = now + GenericConstants.SESSION_REAP_INTERVAL_SECONDS
+
+        stats = MonitoringSessionReaper().reap()
+        if stats["requeued"]:
+            self._wake_event.set()
+
+    def _work(self):
+        while not self._stop_event.is_set():
+            job = None
+            try:
+                close_old_connections()
+                self.reap_if_due()
+                job = self.claim_next_job()
+                if job is not None:
+                    self.run_job(job)
+            except Exception as e:
+                print(f"Error in monitoring job worker: {str(e)}")
+            finally:
+                close_old_connections()
+
+            if job is None:
+                self._wake_event.wait(self.poll_seconds)
+                self._wake_event.clear()
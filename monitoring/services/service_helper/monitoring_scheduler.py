@@ -0,0 +1,191 @@
+import threading
+import zlib
+from datetime import timedelta
+
+from django.db import close_old_connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.models import BaselineFile, MonitoringSchedule, MonitoringSession
+from monitoring.services.service_helper.cron_schedule import CronSchedule
+from monitoring.services.service_helper.monitoring_job_runner import MonitoringJobRunner
+
+ACTIVE_SESSION_STATUSES = (GenericConstants.SESSION_STATUS_QUEUED, GenericConstants.SESSION_STATUS_RUNNING)
+
+
+class MonitoringScheduler:
+    """
+        Queue monitoring sessions for due MonitoringSchedule rows.
+
+        - Each baseline runs at a fixed offset of up to jitter_seconds after the cron time,
+          derived from its id, so schedules sharing a cron expression are spread out instead of
+          all starting at the top of the hour
+        - At most max_concurrent sessions are queued or running at once, manual ones included.
+          Due schedules beyond that wait for a free slot, oldest due first
+        - Every scheduled session reads at most max_bytes_per_second / max_concurrent, so
+          scheduled scans together stay within max_bytes_per_second
+        - A run is skipped, and counted in skipped_runs, while the previous session of the
+          baseline is still queued or running
+
+        Schedules are claimed with a conditional UPDATE on next_run_at, so several schedulers
+        can share the table. Sessions are executed by the MonitoringJobRunner.
+    """
+
+    def __init__(self, max_concurrent=GenericConstants.SCHEDULER_MAX_CONCURRENT_SESSIONS,
+                 max_bytes_per_second=GenericConstants.SCHEDULER_MAX_BYTES_PER_SECOND,
+                 poll_seconds=GenericConstants.SCHEDULER_POLL_SECONDS):
+        """
+            @param max_concurrent: Sessions queued or running at once
+            @param max_bytes_per_second: Read budget of scheduled sessions together, 0 for unlimited
+            @param poll_seconds: Wait between two looks at the schedule table
+        """
+        self.max_concurrent = max(int(max_concurrent or 1), 1)
+        self.max_bytes_per_second = max_bytes_per_second or 0
+        self.poll_seconds = poll_seconds
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def jitter_offset(schedule):
+        """
+            @param schedule:
+            @return: Seconds the baseline's runs start after the cron time
+        """
+        if not schedule.jitter_seconds:
+            return 0
+        return zlib.crc32(str(schedule.baseline_id).encode()) % (schedule.jitter_seconds + 1)
+
+    @classmethod
+    def compute_next_run(cls, schedule, after=None):
+        """
+            @param schedule:
+            @param after: Defaults to now
+            @return: Next run strictly after `after`, jitter included
+            @raise ValueError: When the cron expression is not valid
+        """
+        after = after or timezone.now()
+        offset = timedelta(seconds=cls.jitter_offset(schedule))
+        return CronSchedule(schedule.cron_expression).next_after(after - offset) + offset
+
+    @property
+    def session_bytes_per_second(self):
+        return self.max_bytes_per_second // self.max_concurrent if self.max_bytes_per_second else 0
+
+    def run_once(self, now=None):
+        """
+            Queue sessions for every schedule due at `now`, within the concurrency cap
+            @param now: Defaults to now
+            @return: {"started": n, "skipped": n, "deferred": n}
+        """
+        now = now or timezone.now()
+        stats = {"started": 0, "skipped": 0, "deferred": 0}
+
+        for schedule in MonitoringSchedule.objects.filter(enabled=True, next_run_at__isnull=True):
+            self._set_next_run(schedule, now)
+
+        due = list(
+            MonitoringSchedule.objects.filter(enabled=True, next_run_at__lte=now).select_related(
+                'baseline'
+            ).order_by('next_run_at', 'id')
+        )
+        if not due:
+            return stats
+
+        active_sessions = MonitoringSession.objects.filter(status__in=ACTIVE_SESSION_STATUSES)
+        busy_baseline_ids = set(
+            active_sessions.filter(baseline_id__in={schedule.baseline_id for schedule in due}).values_list(
+                'baseline_id', flat=True
+            )
+        )
+        free_slots = self.max_concurrent - active_sessions.count()
+
+        for schedule in due:
+            baseline = schedule.baseline
+            try:
+                next_run_at = self.compute_next_run(schedule, now)
+            except ValueError as e:
+                print(f"Disabling schedule {schedule.id}: {str(e)}")
+                MonitoringSchedule.objects.filter(id=schedule.id).update(enabled=False, next_run_at=None)
+                continue
+
+            if not baseline.is_active or not baseline.monitoring_enabled:
+                self._claim(schedule, next_run_at)
+                continue
+
+            if baseline.id in busy_baseline_ids or not BaselineFile.objects.filter(baseline=baseline).exists():
+                if self._claim(schedule, next_run_at, skipped_runs=F('skipped_runs') + 1, last_skipped_at=now):
+                    stats["skipped"] += 1
+                continue
+
+            if free_slots <= 0:
+                stats["deferred"] += 1
+                continue
+
+            if self._start(schedule, next_run_at, now):
+                busy_baseline_ids.add(baseline.id)
+                free_slots -= 1
+                stats["started"] += 1
+
+        return stats
+
+    def run_forever(self):
+        """
+            Run due schedules every poll_seconds until stopped
+            @return: None
+        """
+        self._stop_event.clear()
+        try:
+            while not self._stop_event.is_set():
+                try:
+                    self.run_once()
+                except Exception as e:
+                    print(f"Error running monitoring schedules: {str(e)}")
+                finally:
+                    close_old_connections()
+                self._stop_event.wait(self.poll_seconds)
+        except KeyboardInterrupt:
+            pass
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _set_next_run(self, schedule, now):
+        try:
+            next_run_at = self.compute_next_run(schedule, now)
+        except ValueError as e:
+            print(f"Disabling schedule {schedule.id}: {str(e)}")
+            MonitoringSchedule.objects.filter(id=schedule.id).update(enabled=False)
+            return
+        MonitoringSchedule.objects.filter(id=schedule.id, next_run_at__isnull=True).update(next_run_at=next_run_at)
+
+    @staticmethod
+    def _claim(schedule, next_run_at, **updates):
+        """Move a due schedule to its next run; False when another scheduler got there first"""
+        return MonitoringSchedule.objects.filter(
+            id=schedule.id, next_run_at=schedule.next_run_at
+        ).update(next_run_at=next_run_at, **updates) > 0
+
+    def _start(self, schedule, next_run_at, now):
+        params = {
+            "monitor_type": schedule.monitor_type,
+            "user_id": schedule.user_id
+        }
+        if self.session_bytes_per_second:
+            params["max_bytes_per_second"] = self.session_bytes_per_second
+
+        with transaction.atomic():
+            if not self._claim(schedule, next_run_at, last_run_at=now):
+                return False
+
+            session = MonitoringSession.objects.create(
+                baseline=schedule.baseline,
+                monitor_type=schedule.monitor_type,
+                description=f"Scheduled {schedule.monitor_type} scan ({schedule.cron_expression})",
+                status=GenericConstants.SESSION_STATUS_QUEUED,
+                user_id=schedule.user_id,
+                metadata={"schedule_id": schedule.id}
+            )
+            MonitoringSchedule.objects.filter(id=schedule.id).update(last_session=session)
+            MonitoringJobRunner.enqueue(session, params)
+
+        return True
@@ -1,19 +1,47 @@
-import fnmatch
-import hashlib
+import mmap
 import os
+import queue
+import stat
+import threading
 from abc import ABC
+from collections import namedtuple
 
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
 from rest_framework import status
 
 from file_integrity_monitoring.commons.commons import Commons
 from file_integrity_monitoring.commons.generic_constants import GenericConstants
 from file_integrity_monitoring.services.base_service import BaseService
-from monitoring.models import BaselineFile
+from monitoring.models import Baseline, BaselineFile
+from monitoring.services.service_helper.block_hasher import BlockHasher
+from monitoring.services.service_helper.digest_cache import DigestCache
+from monitoring.services.service_helper.exclude_matcher import ExcludeMatcher
+from monitoring.services.service_helper.hash_algorithms import HashAlgorithms
+from monitoring.services.service_helper.hash_cache import HashCache
+from monitoring.services.service_helper.hashing_engine import HashingEngine
+from monitoring.services.service_helper.io_governor import IoGovernor
+
+# Per-thread read buffers reused by read_into_hashes
+_read_buffers = threading.local()
+
+# The BaselineFile columns a comparison reads, loaded with values_list instead of full model instances
+BaselineFileRow = namedtuple(
+    "BaselineFileRow",
+    ("file_path", "id", "file_size", "mtime", "permissions", "sha256", "sha512", "content_hash", "checksum")
+)
 
 
 class MonitoringServiceHelper(BaseService, ABC):
     def __init__(self):
         super().__init__()
+        # IoThrottle or IoGovernor applied to the hashing engines this service builds, None for unpaced reads
+        self.io_throttle = None
+        # Fraction of persistent hash cache hits read again and verified
+        self.paranoid_sample = 0.0
+        # BlockHasher of the running scan, None when its baseline does not block hash
+        self.block_hasher = None
 
     def set_status_code(self, *args, **kwargs):
         """
@@ -32,124 +60,578 @@ class MonitoringServiceHelper(BaseService, ABC):
             @return: Count of files in directory
         """
         try:
-            count = 0
-            for root, dirs, files in os.walk(path):
-                dirs[:] = [d for d in dirs if not self.should_exclude(os.path.join(root, d), exclude_patterns)]
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if not self.should_exclude(file_path, exclude_patterns):
-                        count += 1
+            count = sum(1 for _ in self.walk_files(path, exclude_patterns))
             return True, count
         except Exception as e:
             return False, 0
 
-    def scan_baseline_files_sync(self, baseline, params):
+    def walk_files(self, path, exclude_patterns, start_after=None):
         """
-            Scan baseline files
+            Walk directory tree in a single pass, reusing os.scandir entries for stat data.
+            Files are yielded in ascending file_path order, the same order the database sorts them in.
+            @param path:
+            @param exclude_patterns:
+            @param start_after: Only yield paths after this one; directories sorting wholly before it are not listed
+            @return: Generator of (file_path, stat_info) for every non-excluded file
+        """
+        exclude_matcher = ExcludeMatcher.compile(exclude_patterns)
+        pending_entries = [iter(self.sorted_dir_entries(path))]
+
+        while pending_entries:
+            item = next(pending_entries[-1], None)
+            if item is None:
+                pending_entries.pop()
+                continue
+
+            entry, is_dir = item
+            if is_dir:
+                # Same as os.walk(followlinks=False): symlinked directories are not descended into
+                if entry.is_symlink() or exclude_matcher.matches(entry.path, is_dir=True):
+                    continue
+                prefix = entry.path + "/"
+                if start_after is not None and prefix < start_after and not start_after.startswith(prefix):
+                    continue
+                pending_entries.append(iter(self.sorted_dir_entries(entry.path)))
+                continue
+
+            if start_after is not None and entry.path <= start_after:
+                continue
+
+            if exclude_matcher.matches(entry.path):
+                continue
+
+            try:
+                stat_info = entry.stat()
+            except OSError as e:
+                print(f"Error processing file {entry.path}: {str(e)}")
+                continue
+
+            yield entry.path, stat_info
+
+    @staticmethod
+    def sorted_dir_entries(dir_path):
+        """
+            List a directory as (entry, is_dir) pairs sorted so a depth-first walk visits paths in string order
+            @param dir_path:
+            @return: List of (DirEntry, is_dir)
+        """
+        try:
+            with os.scandir(dir_path) as it:
+                entries = list(it)
+        except OSError as e:
+            print(f"Error reading directory {dir_path}: {str(e)}")
+            return []
+
+        items = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            items.append((entry, is_dir))
+
+        # "name/" sorts a directory's subtree exactly where its paths fall among its sibling files
+        items.sort(key=lambda item: item[0].name + "/" if item[1] else item[0].name)
+        return items
+
+    @staticmethod
+    def _iter_baseline_file_values(baseline, fields, start_after=None):
+        """
+            Keyset-paginated values_list stream over a baseline's files in ascending file_path order.
+            file_path must be the first field; the order is the database's binary string order,
+            which is the order the walkers produce
+            @param baseline:
+            @param fields: Columns to load
+            @param start_after: Only paths greater than this one
+            @return: Generator of value tuples
+        """
+        last_path = start_after
+        while True:
+            queryset = BaselineFile.objects.filter(baseline_id=baseline.id)
+            if last_path is not None:
+                queryset = queryset.filter(file_path__gt=last_path)
+
+            rows = list(queryset.order_by("file_path").values_list(*fields)[:GenericConstants.DB_STREAM_CHUNK_SIZE])
+            if not rows:
+                return
+
+            yield from rows
+            last_path = rows[-1][0]
+
+    @classmethod
+    def iter_baseline_file_paths(cls, baseline):
+        """
+            Stream the stored file paths of a baseline in ascending order, one chunk at a time
+            @param baseline:
+            @return: Generator of file paths
+        """
+        for file_path, in cls._iter_baseline_file_values(baseline, ("file_path",)):
+            yield file_path
+
+    @classmethod
+    def iter_baseline_file_rows(cls, baseline, start_after=None):
+        """
+            Stream the columns a comparison needs, in ascending path order, one chunk at a time
+            @param baseline:
+            @param start_after: Only paths greater than this one
+            @return: Generator of BaselineFileRow
+        """
+        for values in cls._iter_baseline_file_values(baseline, BaselineFileRow._fields, start_after):
+            yield BaselineFileRow(*values)
+
+    @staticmethod
+    def get_baseline_file_rows(baseline, file_paths):
+        """
+            @param baseline:
+            @param file_paths: Paths to look up
+            @return: Dict of file path to BaselineFileRow, for the paths the baseline has
+        """
+        rows = {}
+        for start in range(0, len(file_paths), GenericConstants.DB_STREAM_CHUNK_SIZE):
+            for values in BaselineFile.objects.filter(
+                baseline_id=baseline.id, file_path__in=file_paths[start:start + GenericConstants.DB_STREAM_CHUNK_SIZE]
+            ).values_list(*BaselineFileRow._fields):
+                row = BaselineFileRow(*values)
+                rows[row.file_path] = row
+        return rows
+
+    @staticmethod
+    def skip_existing_files(entries, existing_paths):
+        """
+            Drop walk entries whose path is already stored, merging two path-sorted streams
+            @param entries: (file_path, stat_info) pairs in path order
+            @param existing_paths: Stored file paths in path order
+            @return: Generator of entries not yet stored
+        """
+        existing_paths = iter(existing_paths)
+        existing_path = next(existing_paths, None)
+
+        for file_path, stat_info in entries:
+            while existing_path is not None and existing_path < file_path:
+                existing_path = next(existing_paths, None)
+
+            if existing_path == file_path:
+                continue
+
+            yield file_path, stat_info
+
+    def scan_baseline_files_sync(self, baseline, params, entries=None):
+        """
+            Scan baseline files.
+            A producer thread walks and hashes while this thread commits fixed-size batches,
+            so memory stays bounded by BASELINE_SCAN_MAX_BUFFERED_FILES and progress survives a crash.
             @param baseline
             @param params
+            @param entries: (file_path, stat_info) pairs already produced by walk_files, walks path when None
             return Message
         """
         path = params.get("path")
         algorithm_type = params.get("algorithm_type")
         exclude_patterns = params.get("exclude_patterns", [])
 
-        baseline_files = []
+        if entries is None:
+            entries = self.walk_files(path, exclude_patterns)
 
-        for root, dirs, files in os.walk(path):
-            dirs[:] = [d for d in dirs if not self.should_exclude(os.path.join(root, d), exclude_patterns)]
+        progress = {
+            "files_processed": 0,
+            "bytes_processed": 0,
+            "last_file_path": None,
+        }
+        if params.get("resume"):
+            # Files committed before an interruption are kept, only the rest is hashed again
+            entries = self.skip_existing_files(entries, self.iter_baseline_file_paths(baseline))
+            progress.update(baseline.scan_progress or {})
 
-            for file in files:
-                file_path = os.path.join(root, file)
-                if self.should_exclude(file_path, exclude_patterns):
+        records = queue.Queue(maxsize=GenericConstants.BASELINE_SCAN_MAX_BUFFERED_FILES)
+        stop_event = threading.Event()
+        producer = threading.Thread(
+            target=self._produce_baseline_files,
+            args=(baseline, algorithm_type, entries, records, stop_event),
+            daemon=True
+        )
+        producer.start()
+
+        baseline_files = []
+        try:
+            while True:
+                record_type, record = records.get()
+
+                if record_type == GenericConstants.SCAN_RECORD_FILE:
+                    baseline_files.append(record)
+                    if len(baseline_files) >= GenericConstants.BASELINE_INSERT_BATCH_SIZE:
+                        self._flush_baseline_files(baseline, baseline_files, progress)
+                        baseline_files = []
                     continue
 
+                self._flush_baseline_files(baseline, baseline_files, progress)
+                baseline_files = []
+
+                if record_type == GenericConstants.SCAN_RECORD_ERROR:
+                    self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+                    return False, record
+                break
+        finally:
+            stop_event.set()
+
+        Commons.create_audit_log(
+            user_id=params['user_id'],
+            action=GenericConstants.ACTION_CREATE,
+            resource_type=GenericConstants.RESOURCE_TYPE_BASELINE_FILES,
+            resource_id=baseline.id,
+            new_values={
+                "message": "Baseline files created",
+            }
+        )
+
+        return True, None
+
+    def _produce_baseline_files(self, baseline, algorithm_type, entries, records, stop_event):
+        """
+            Walk and hash entries, handing BaselineFile records to the consumer queue.
+            Runs in its own thread; blocks when the queue is full.
+            @param baseline:
+            @param algorithm_type:
+            @param entries:
+            @param records: Bounded queue of (record_type, payload)
+            @param stop_event: Set by the consumer when it stops reading
+            @return: None
+        """
+        def put(record_type, record):
+            while not stop_event.is_set():
                 try:
-                    stat_info = os.stat(file_path)
-                    file_size = stat_info.st_size
-                    permissions = stat_info.st_mode
-                    uid = stat_info.st_uid
-                    gid = stat_info.st_gid
-                    inode = stat_info.st_ino
-                    hard_links = stat_info.st_nlink
-                    mtime = stat_info.st_mtime
-                    atime = stat_info.st_atime
-                    ctime = stat_info.st_ctime
-
-                    is_success, sha256_hash = self.calculate_hash(file_path, "sha256")
-
-                    sha512_hash = None
-                    if algorithm_type == "sha512":
-                        is_success, sha512_hash = self.calculate_hash(file_path, "sha512")
-
-                    if not is_success:
-                        self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
-                        return False, GenericConstants.BASELINE_FILE_HASH_ERROR_MESSAGE
+                    records.put((record_type, record), timeout=GenericConstants.SCAN_QUEUE_POLL_SECONDS)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            def files_to_hash():
+                for file_path, stat_info in entries:
+                    if stop_event.is_set():
+                        return
+                    yield file_path, stat_info
 
+            engine = self.get_hashing_engine(baseline)
+            self.block_hasher = self.get_block_hasher(baseline)
+            algorithms = self.get_hash_algorithms(algorithm_type, with_checksum=baseline.checksum_prefilter)
+            for file_path, stat_info, is_success, digests in engine.hash_files(files_to_hash(), algorithms):
+                if not is_success:
+                    put(GenericConstants.SCAN_RECORD_ERROR, GenericConstants.BASELINE_FILE_HASH_ERROR_MESSAGE)
+                    return
+
+                try:
                     baseline_file = BaselineFile(
                         baseline=baseline,
                         file_path=file_path,
                         file_name=os.path.basename(file_path),
-                        sha256=sha256_hash,
-                        sha512=sha512_hash,
-                        file_size=file_size,
-                        permissions=permissions,
-                        uid=uid,
-                        gid=gid,
-                        inode=inode,
-                        hard_links=hard_links,
-                        mtime=mtime,
-                        atime=atime,
-                        ctime=ctime,
+                        **self.get_baseline_file_hashes(algorithm_type, digests),
+                        file_size=stat_info.st_size,
+                        permissions=stat_info.st_mode,
+                        uid=stat_info.st_uid,
+                        gid=stat_info.st_gid,
+                        inode=stat_info.st_ino,
+                        hard_links=stat_info.st_nlink,
+                        mtime=stat_info.st_mtime,
+                        atime=stat_info.st_atime,
+                        ctime=stat_info.st_ctime,
                         metadata={}
                     )
-                    baseline_files.append(baseline_file)
-
+                    self.add_block_hashes(baseline_file, baseline, stat_info)
                 except Exception as e:
                     print(f"Error processing file {file_path}: {str(e)}")
                     continue
 
-        # Bulk insert all files
+                if not put(GenericConstants.SCAN_RECORD_FILE, baseline_file):
+                    return
+
+            put(GenericConstants.SCAN_RECORD_DONE, None)
+
+        except Exception as e:
+            print(f"Error scanning baseline {baseline.id}: {str(e)}")
+            put(GenericConstants.SCAN_RECORD_ERROR, f"Error scanning baseline: {str(e)}")
+
+        finally:
+            self._close_block_hasher()
+
+    @staticmethod
+    def _flush_baseline_files(baseline, baseline_files, progress):
+        """
+            Commit a batch of baseline files and the scan progress in one transaction
+            @param baseline:
+            @param baseline_files:
+            @param progress: Progress dict, updated in place
+            @return: None
+        """
         if baseline_files:
-            BaselineFile.objects.bulk_create(baseline_files, batch_size=1000)
+            progress["files_processed"] += len(baseline_files)
+            progress["bytes_processed"] += sum(baseline_file.file_size for baseline_file in baseline_files)
+            progress["last_file_path"] = max(
+                [baseline_file.file_path for baseline_file in baseline_files] +
+                ([progress["last_file_path"]] if progress.get("last_file_path") else [])
+            )
+        progress["updated_at"] = timezone.now().isoformat()
 
-        Commons.create_audit_log(
-            user_id=params['user_id'],
-            action=GenericConstants.ACTION_CREATE,
-            resource_type=GenericConstants.RESOURCE_TYPE_BASELINE_FILES,
-            resource_id=baseline.id,
-            new_values={
-                "message": "Baseline files created",
-            }
+        with transaction.atomic():
+            if baseline_files:
+                BaselineFile.objects.bulk_create(baseline_files, ignore_conflicts=True)
+            Baseline.objects.filter(id=baseline.id).update(
+                scan_progress=progress,
+                total_files=F('total_files') + len(baseline_files),
+                total_bytes=F('total_bytes') + sum(baseline_file.file_size for baseline_file in baseline_files)
+            )
+        baseline.scan_progress = progress
+
+    @staticmethod
+    def refresh_file_stats(baseline):
+        """
+            Recount the baseline's files and bytes from the BaselineFile table
+            @param baseline:
+            @return: None
+        """
+        stats = BaselineFile.objects.filter(baseline_id=baseline.id).aggregate(
+            files=Count('id'), bytes=Sum('file_size')
+        )
+        baseline.total_files = stats['files']
+        baseline.total_bytes = stats['bytes'] or 0
+        Baseline.objects.filter(id=baseline.id).update(
+            total_files=baseline.total_files, total_bytes=baseline.total_bytes
         )
 
-        return True, None
+    def run_baseline_scan(self, baseline, params, entries=None, success_status=GenericConstants.STATUS_ACTIVE):
+        """
+            Scan baseline files and move the baseline out of scanning.
+            A failed scan keeps its committed files and is marked incomplete so it can be resumed.
+            @param baseline:
+            @param params:
+            @param entries:
+            @param success_status: Status to set when the scan finishes
+            @return: (is_success, message)
+        """
+        self.io_throttle = IoGovernor.for_baseline(baseline)
+        try:
+            is_success, message = self.scan_baseline_files_sync(baseline, params, entries)
+            if is_success and params.get("resume"):
+                # Batches re-inserted after an interruption are ignored as conflicts, not counted
+                self.refresh_file_stats(baseline)
+        except Exception as e:
+            self.error = True
+            self.set_status_code(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            is_success, message = False, f"Error scanning baseline: {str(e)}"
+        finally:
+            self.io_throttle.close()
+            self.io_throttle = None
+
+        baseline.status = success_status if is_success else GenericConstants.STATUS_INCOMPLETE
+        baseline.save(update_fields=["status", "updated_at"])
+        return is_success, message
 
     @staticmethod
-    def should_exclude(file_path, exclude_patterns):
-        if not exclude_patterns:
+    def is_valid_rolling_slices(rolling_slices):
+        """
+            @param rolling_slices:
+            @return: True if it is a usable slice count for rolling sessions
+        """
+        try:
+            return 1 <= int(rolling_slices) <= GenericConstants.ROLLING_MAX_SLICES
+        except (TypeError, ValueError):
             return False
 
-        file_name = os.path.basename(file_path)
+    @staticmethod
+    def is_valid_io_budget(io_budget):
+        """
+            @param io_budget: Bytes or files per second
+            @return: True if it is None, 0 for unlimited, or a positive integer
+        """
+        if io_budget is None:
+            return True
+        try:
+            return int(io_budget) >= 0
+        except (TypeError, ValueError):
+            return False
 
-        for pattern in exclude_patterns:
+    @staticmethod
+    def is_valid_block_hash_threshold(block_hash_threshold):
+        """
+            @param block_hash_threshold:
+            @return: True if it is None, 0 to disable block hashing, or a usable file size threshold
+        """
+        if block_hash_threshold is None:
+            return True
+        try:
+            block_hash_threshold = int(block_hash_threshold)
+            return block_hash_threshold == 0 or block_hash_threshold >= GenericConstants.BLOCK_HASH_MIN_THRESHOLD
+        except (TypeError, ValueError):
+            return False
 
-            if pattern.startswith("*"):
-                if file_name.endswith(pattern[1:]):
-                    return True
+    @staticmethod
+    def is_valid_hash_engine(hash_workers, hash_executor):
+        """
+            Validate hashing engine settings
+            @param hash_workers:
+            @param hash_executor:
+            @return: True if the settings are usable
+        """
+        try:
+            hash_workers = int(hash_workers)
+        except (TypeError, ValueError):
+            return False
 
-            elif pattern.endswith("*"):
-                if file_name.startswith(pattern[:-1]):
-                    return True
+        return (
+            1 <= hash_workers <= GenericConstants.MAX_HASH_WORKERS
+            and hash_executor in (GenericConstants.HASH_EXECUTOR_THREAD, GenericConstants.HASH_EXECUTOR_PROCESS)
+        )
 
-            elif pattern == file_name:
-                return True
+    def get_hashing_engine(self, baseline):
+        """
+            Build the hashing engine configured for a baseline, with a fresh in-scan digest cache
+            and the process-wide persistent hash cache
+            @param baseline:
+            @return: HashingEngine
+        """
+        workers = min(baseline.hash_workers or 1, GenericConstants.MAX_HASH_WORKERS)
+        return HashingEngine(
+            self.calculate_hashes,
+            workers=workers,
+            executor_type=baseline.hash_executor,
+            digest_cache=DigestCache(),
+            throttle=self.io_throttle,
+            hash_cache=HashCache.get_instance(),
+            paranoid_sample=self.paranoid_sample
+        )
 
-            elif "*" in pattern:
-                if fnmatch.fnmatch(file_name, pattern):
-                    return True
+    def get_block_hasher(self, baseline):
+        """
+            Build the block hasher of a baseline, on as many threads as it has hash workers
+            @param baseline:
+            @return: BlockHasher, None when the baseline has no block_hash_threshold
+        """
+        if baseline.block_hash_threshold is None:
+            return None
+        return BlockHasher(
+            workers=min(baseline.hash_workers or 1, GenericConstants.MAX_HASH_WORKERS),
+            throttle=self.io_throttle
+        )
 
-        return False
+    def _close_block_hasher(self):
+        if self.block_hasher is not None:
+            self.block_hasher.close()
+            self.block_hasher = None
+
+    def uses_block_hashes(self, baseline, stat_info):
+        """
+            @param baseline:
+            @param stat_info:
+            @return: True if the file is compared block by block in the running scan
+        """
+        return (
+            self.block_hasher is not None and baseline.block_hash_threshold is not None
+            and stat_info.st_size >= baseline.block_hash_threshold
+        )
+
+    def add_block_hashes(self, baseline_file, baseline, stat_info):
+        """
+            Block hash a file above the baseline's threshold and store the digests on its BaselineFile.
+            The file is read a second time; one that cannot be block hashed keeps null block columns
+            and is compared by its whole-file digest
+            @param baseline_file: Unsaved BaselineFile
+            @param baseline:
+            @param stat_info:
+            @return: None
+        """
+        if not self.uses_block_hashes(baseline, stat_info):
+            return
+
+        is_success, digests, _ = self.block_hasher.hash_blocks(baseline_file.file_path)
+        if is_success:
+            baseline_file.block_size = self.block_hasher.block_size
+            baseline_file.block_hashes = BlockHasher.encode(digests)
+            baseline_file.block_root = BlockHasher.root_of(digests)
+
+    @staticmethod
+    def get_hash_algorithms(algorithm_type, with_checksum=False):
+        """
+            Get every digest stored for a baseline algorithm; sha512 baselines keep sha256 too
+            @param algorithm_type:
+            @param with_checksum: Add the prefilter checksum
+            @return: Tuple of algorithms
+        """
+        if algorithm_type == GenericConstants.ALGORITHM_SHA512:
+            algorithms = GenericConstants.ALGORITHM_SHA256, GenericConstants.ALGORITHM_SHA512
+        else:
+            algorithms = algorithm_type,
+
+        if with_checksum:
+            algorithms += GenericConstants.CHECKSUM_PREFILTER_ALGORITHM,
+        return algorithms
+
+    @staticmethod
+    def is_valid_algorithm_type(algorithm_type):
+        """
+            @param algorithm_type:
+            @return: True if it is a digest of the hash algorithm registry
+        """
+        return HashAlgorithms.is_digest(algorithm_type)
+
+    @staticmethod
+    def get_baseline_hash(baseline_file, algorithm):
+        """
+            Get the stored hash of a baseline file for the given algorithm
+            @param baseline_file: BaselineFile or BaselineFileRow
+            @param algorithm:
+            @return: Stored hash
+        """
+        if algorithm == GenericConstants.ALGORITHM_SHA512:
+            return baseline_file.sha512
+        if algorithm == GenericConstants.ALGORITHM_SHA256:
+            return baseline_file.sha256
+        return baseline_file.content_hash
+
+    @staticmethod
+    def set_baseline_hash(baseline_file, algorithm, digest):
+        """
+            Store the hash of a baseline file for the given algorithm
+            @param baseline_file: BaselineFile
+            @param algorithm:
+            @param digest:
+            @return: None
+        """
+        if algorithm == GenericConstants.ALGORITHM_SHA512:
+            baseline_file.sha512 = digest
+        elif algorithm == GenericConstants.ALGORITHM_SHA256:
+            baseline_file.sha256 = digest
+        else:
+            baseline_file.content_hash = digest
+
+    @staticmethod
+    def get_baseline_file_hashes(algorithm_type, digests):
+        """
+            @param algorithm_type: Algorithm of the baseline
+            @param digests: Digest dict from the hashing engine
+            @return: BaselineFile hash fields
+        """
+        return {
+            "sha256": digests.get(GenericConstants.ALGORITHM_SHA256),
+            "sha512": digests.get(GenericConstants.ALGORITHM_SHA512),
+            "content_hash": None if algorithm_type in (
+                GenericConstants.ALGORITHM_SHA256, GenericConstants.ALGORITHM_SHA512
+            ) else digests.get(algorithm_type),
+            "checksum": digests.get(GenericConstants.CHECKSUM_PREFILTER_ALGORITHM)
+        }
+
+    @staticmethod
+    def should_exclude(file_path, exclude_patterns, is_dir=False):
+        """
+            Check a path against exclude patterns, compiled once per pattern list
+            @param file_path:
+            @param exclude_patterns:
+            @param is_dir: Whether the path is a directory (enables "dir/" patterns)
+            @return: True when the path is excluded
+        """
+        if not exclude_patterns:
+            return False
+
+        return ExcludeMatcher.compile(exclude_patterns).matches(file_path, is_dir)
 
     @staticmethod
     def calculate_hash(file_path, algorithm=GenericConstants.ALGORITHM_SHA256):
@@ -159,17 +641,86 @@ class MonitoringServiceHelper(BaseService, ABC):
             @param algorithm:
             @return: Hash of file
         """
+        is_success, digests = MonitoringServiceHelper.calculate_hashes(file_path, (algorithm,))
+        return is_success, digests.get(algorithm)
+
+    @staticmethod
+    def calculate_hashes(file_path, algorithms=(GenericConstants.ALGORITHM_SHA256,)):
+        """
+            Calculate several hashes of a file in a single read pass
+            @param file_path:
+            @param algorithms:
+            @return: Dict of algorithm to hash
+        """
         try:
-            if algorithm == GenericConstants.ALGORITHM_SHA512:
-                hash_obj = hashlib.sha512()
-            else:
-                hash_obj = hashlib.sha256()
+            hash_objs = {algorithm: HashAlgorithms.new(algorithm) for algorithm in algorithms}
 
-            with open(file_path, 'rb') as f:
-                while chunk := f.read(GenericConstants.CHUNK_SIZE):
-                    hash_obj.update(chunk)
+            with open(file_path, 'rb', buffering=0) as f:
+                MonitoringServiceHelper.read_into_hashes(f, hash_objs.values())
 
-            return True, hash_obj.hexdigest()
+            return True, {algorithm: hash_obj.hexdigest() for algorithm, hash_obj in hash_objs.items()}
 
         except Exception as e:
-            return False, None
\ No newline at end of file
+            return False, {}
+
+    @staticmethod
+    def read_into_hashes(f, hash_objs):
+        """
+            Feed an open binary file into hash objects, picking the reader by file size:
+            a single read for tiny files, mmap for large regular files and
+            readinto a reusable per-thread buffer for everything else
+            @param f: File opened with buffering=0
+            @param hash_objs: Hash objects to update
+            @return: None
+        """
+        stat_info = os.fstat(f.fileno())
+        file_size = stat_info.st_size
+        is_regular = stat.S_ISREG(stat_info.st_mode)
+
+        if is_regular and file_size <= GenericConstants.HASH_SMALL_FILE_SIZE:
+            data = f.read(GenericConstants.HASH_SMALL_FILE_SIZE + 1)
+            for hash_obj in hash_objs:
+                hash_obj.update(data)
+            # A file that grew after fstat is finished by the buffered loop below
+            if len(data) <= GenericConstants.HASH_SMALL_FILE_SIZE:
+                return
+
+        elif (is_regular and GenericConstants.HASH_USE_MMAP
+              and file_size >= GenericConstants.HASH_MMAP_THRESHOLD):
+            try:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                mapped = None
+
+            if mapped is not None:
+                with mapped:
+                    if hasattr(mapped, "madvise"):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    view = memoryview(mapped)
+                    try:
+                        for offset in range(0, len(mapped), GenericConstants.HASH_MMAP_SLICE_SIZE):
+                            piece = view[offset:offset + GenericConstants.HASH_MMAP_SLICE_SIZE]
+                            for hash_obj in hash_objs:
+                                hash_obj.update(piece)
+                            piece.release()
+                    finally:
+                        view.release()
+                    f.seek(len(mapped))
+
+        buffer, view = MonitoringServiceHelper._get_read_buffer()
+        while size := f.readinto(buffer):
+            for hash_obj in hash_objs:
+                hash_obj.update(view[:size])
+
+    @staticmethod
+    def _get_read_buffer():
+        """
+            Get this thread's preallocated read buffer
+            @return: (bytearray, memoryview)
+        """
+        buffer = getattr(_read_buffers, "buffer", None)
+        if buffer is None:
+            buffer = bytearray(GenericConstants.HASH_READ_BUFFER_SIZE)
+            _read_buffers.buffer = buffer
+            _read_buffers.view = memoryview(buffer)
+        return buffer, _read_buffers.view
\ No newline at end of file
@@ -0,0 +1,143 @@
+import threading
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from monitoring.models import Baseline, MonitoringJob, MonitoringSession
+
+
+class SessionHeartbeat:
+    """
+        Touch a running session's updated_at every SESSION_HEARTBEAT_SECONDS from a side thread,
+        so a scan busy hashing one large file is not taken for abandoned. Only the attempt that
+        owns the session keeps it alive
+    """
+
+    def __init__(self, session_id, attempt=0, interval=GenericConstants.SESSION_HEARTBEAT_SECONDS):
+        self.session_id = session_id
+        self.attempt = attempt
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._run, name=f"fim-session-heartbeat-{self.session_id}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        try:
+            while not self._stop_event.wait(self.interval):
+                MonitoringSession.objects.filter(
+                    id=self.session_id, status=GenericConstants.SESSION_STATUS_RUNNING, attempt=self.attempt
+                ).update(updated_at=timezone.now())
+        except Exception as e:
+            print(f"Error in heartbeat of monitoring session {self.session_id}: {str(e)}")
+        finally:
+            connection.close()
+
+
+class MonitoringSessionReaper:
+    """
+        Recover monitoring sessions whose worker died.
+
+        A running session without a heartbeat for SESSION_STALE_SECONDS is abandoned. Its job is
+        queued again, and the next run resumes from the session's checkpoint, until the job has
+        been attempted SESSION_MAX_ATTEMPTS times; then the session is marked failed. Jobs
+        claimed by a worker that died before starting their session are queued again too.
+
+        A worker that was only stalled may still be scanning. Its writes are conditional on the
+        session's attempt, which the next run moves on, so they are dropped once it has started.
+    """
+
+    def __init__(self, stale_seconds=GenericConstants.SESSION_STALE_SECONDS,
+                 max_attempts=GenericConstants.SESSION_MAX_ATTEMPTS):
+        """
+            @param stale_seconds: Silence after which a running session is abandoned
+            @param max_attempts: Runs a job gets before its session is failed
+        """
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+
+    def reap(self, now=None):
+        """
+            @param now: Defaults to now
+            @return: {"requeued": n, "failed": n}
+        """
+        now = now or timezone.now()
+        cutoff = now - timedelta(seconds=self.stale_seconds)
+        stats = {"requeued": 0, "failed": 0}
+
+        stale_sessions = MonitoringSession.objects.filter(
+            status=GenericConstants.SESSION_STATUS_RUNNING, updated_at__lt=cutoff
+        ).select_related('job')
+
+        for session in stale_sessions:
+            job = getattr(session, 'job', None)
+            if job is not None and job.attempts < self.max_attempts:
+                if self._requeue(session, job):
+                    stats["requeued"] += 1
+            elif self._fail(session, job, now):
+                stats["failed"] += 1
+
+        # Claimed, but the worker died before moving the session to running
+        orphaned_job_ids = MonitoringJob.objects.filter(
+            status=GenericConstants.SESSION_STATUS_RUNNING,
+            started_at__lt=cutoff,
+            session__status=GenericConstants.SESSION_STATUS_QUEUED
+        ).values_list('id', flat=True)
+        for job_id in orphaned_job_ids:
+            stats["requeued"] += MonitoringJob.objects.filter(
+                id=job_id, status=GenericConstants.SESSION_STATUS_RUNNING, started_at__lt=cutoff
+            ).update(status=GenericConstants.SESSION_STATUS_QUEUED, worker=None)
+
+        return stats
+
+    @staticmethod
+    def _requeue(session, job):
+        with transaction.atomic():
+            # Conditional on updated_at: a heartbeat since the query means the worker is alive
+            requeued = MonitoringSession.objects.filter(
+                id=session.id, status=GenericConstants.SESSION_STATUS_RUNNING, updated_at=session.updated_at
+            ).update(
+                status=GenericConstants.SESSION_STATUS_QUEUED,
+                metadata={**session.metadata, "resumes": session.metadata.get("resumes", 0) + 1}
+            )
+            if requeued:
+                MonitoringJob.objects.filter(id=job.id).update(
+                    status=GenericConstants.SESSION_STATUS_QUEUED, worker=None
+                )
+        return bool(requeued)
+
+    @staticmethod
+    def _fail(session, job, now):
+        metadata = {key: value for key, value in session.metadata.items() if key != "checkpoint"}
+        with transaction.atomic():
+            failed = MonitoringSession.objects.filter(
+                id=session.id, status=GenericConstants.SESSION_STATUS_RUNNING, updated_at=session.updated_at
+            ).update(
+                status=GenericConstants.SESSION_STATUS_FAILED,
+                error_message=GenericConstants.MONITORING_SESSION_ABANDONED_MESSAGE,
+                end_time=now,
+                metadata=metadata,
+                updated_at=now
+            )
+            if failed:
+                if job is not None:
+                    MonitoringJob.objects.filter(id=job.id).update(
+                        status=GenericConstants.SESSION_STATUS_FAILED, finished_at=now
+                    )
+                Baseline.objects.filter(id=session.baseline_id).update(
+                    last_scan_at=now,
+                    last_scan_status=GenericConstants.SESSION_STATUS_FAILED,
+                    last_scan_files_changed=session.files_changed
+                )
+        return bool(failed)
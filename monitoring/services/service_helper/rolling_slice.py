@@ -0,0 +1,125 @@
+import zlib
+
+from django.db import transaction
+from django.utils import timezone
+
+from monitoring.models import Baseline
+
+
+class RollingSlice:
+    """
+        One of the path-hash slices a rolling session content-verifies.
+
+        Files fall into crc32(path) % count; slice membership never depends on the walk, so
+        `count` consecutive rolling sessions re-read every file once. Coverage is tracked on
+        Baseline.rolling_coverage as the set of slices verified in the current cycle.
+    """
+
+    def __init__(self, index, count):
+        """
+            @param index: Slice verified, 0 to count - 1
+            @param count: Number of slices
+        """
+        self.index = index
+        self.count = max(int(count or 1), 1)
+
+    @staticmethod
+    def slice_of(file_path, count):
+        """
+            @param file_path:
+            @param count:
+            @return: Slice index of the path
+        """
+        return zlib.crc32(file_path.encode("utf-8", "surrogateescape")) % count
+
+    def contains(self, file_path):
+        return self.slice_of(file_path, self.count) == self.index
+
+    @classmethod
+    def for_session(cls, baseline, session=None):
+        """
+            The baseline's next slice, kept in the session metadata so a resumed run verifies the same one
+            @param baseline:
+            @param session: Optional MonitoringSession
+            @return: RollingSlice
+        """
+        stored = (session.metadata or {}).get("rolling_slice") if session is not None else None
+        if stored:
+            return cls(stored["index"], stored["count"])
+
+        count = max(baseline.rolling_slices or 1, 1)
+        coverage = baseline.rolling_coverage or {}
+        index = coverage.get("next_slice", 0) % count if coverage.get("slices") == count else 0
+
+        if session is not None:
+            session.metadata = {**(session.metadata or {}), "rolling_slice": {"index": index, "count": count}}
+        return cls(index, count)
+
+    def record_verified(self, baseline_id, started_at, now=None):
+        """
+            Mark the slice verified and move the baseline to its next unverified slice.
+            A change of rolling_slices since the session started begins a new cycle.
+            @param baseline_id:
+            @param started_at: Start of the verifying session
+            @param now: Defaults to now
+            @return: Updated coverage dict
+        """
+        now = now or timezone.now()
+        with transaction.atomic():
+            baseline = Baseline.objects.select_for_update().get(id=baseline_id)
+            coverage = dict(baseline.rolling_coverage or {})
+            if coverage.get("slices") != baseline.rolling_slices:
+                coverage = {
+                    "slices": baseline.rolling_slices,
+                    "verified": [],
+                    "next_slice": 0,
+                    "cycles_completed": coverage.get("cycles_completed", 0),
+                    "last_cycle_completed_at": coverage.get("last_cycle_completed_at"),
+                    "verified_since": coverage.get("verified_since")
+                }
+            if baseline.rolling_slices != self.count:
+                # rolling_slices changed while the session ran: its slice is not one of the new ones
+                Baseline.objects.filter(id=baseline_id).update(rolling_coverage=coverage)
+                return coverage
+
+            verified = set(coverage.get("verified", []))
+            if not verified:
+                coverage["cycle_started_at"] = started_at.isoformat()
+            verified.add(self.index)
+
+            if len(verified) >= self.count:
+                # Every file has been read at least once since the cycle started
+                coverage["cycles_completed"] = coverage.get("cycles_completed", 0) + 1
+                coverage["last_cycle_completed_at"] = now.isoformat()
+                coverage["verified_since"] = coverage.get("cycle_started_at")
+                coverage["cycle_started_at"] = None
+                verified = set()
+
+            coverage["verified"] = sorted(verified)
+            coverage["next_slice"] = next(
+                (index % self.count for index in range(self.index + 1, self.index + 1 + self.count)
+                 if index % self.count not in verified),
+                0
+            )
+            Baseline.objects.filter(id=baseline_id).update(rolling_coverage=coverage)
+        return coverage
+
+    @staticmethod
+    def describe(baseline):
+        """
+            @param baseline:
+            @return: Coverage of the current cycle for API responses
+        """
+        coverage = baseline.rolling_coverage or {}
+        count = max(baseline.rolling_slices or 1, 1)
+        verified = coverage.get("verified", []) if coverage.get("slices") == count else []
+        return {
+            "slices": count,
+            "slices_verified": len(verified),
+            "percent": round(len(verified) * 100 / count, 1),
+            "next_slice": coverage.get("next_slice", 0) if coverage.get("slices") == count else 0,
+            "cycle_started_at": coverage.get("cycle_started_at"),
+            "cycles_completed": coverage.get("cycles_completed", 0),
+            "last_cycle_completed_at": coverage.get("last_cycle_completed_at"),
+            "verified_since": coverage.get("verified_since")
+        }
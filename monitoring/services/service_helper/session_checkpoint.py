@@ -0,0 +1,36 @@
+from collections import OrderedDict
+
+
+class ScanWatermark:
+    """
+        Highest walked path below which every file has been fully compared.
+
+        Files are walked in ascending path order but hashed in completion order, so the
+        watermark only moves past a path once it and every path walked before it are done.
+        Memory is bounded by the files in flight.
+    """
+
+    def __init__(self, last_path=None, completed=0):
+        """
+            @param last_path: Watermark restored from a checkpoint
+            @param completed: Number of paths up to last_path
+        """
+        self.last_path = last_path
+        self.completed = completed
+        self._pending = OrderedDict()
+
+    def started(self, path):
+        self._pending[path] = False
+
+    def finished(self, path):
+        if path not in self._pending:
+            return
+        self._pending[path] = True
+        while self._pending:
+            first_path, is_done = next(iter(self._pending.items()))
+            if not is_done:
+                break
+            self._pending.popitem(last=False)
+            self.last_path = first_path
+            self.completed += 1
+
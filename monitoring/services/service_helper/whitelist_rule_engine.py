@@ -0,0 +1,227 @@
+import re
+
+from django.db.models import Q
+from django.utils import timezone
+
+from monitoring.models import WhitelistRule
+from monitoring.services.service_helper.exclude_matcher import GLOB_CHARACTERS, translate
+
+REGEX_PATTERN_PREFIX = "re:"
+
+# Rule change types that name a scan change type differently
+CHANGE_TYPE_ALIASES = {
+    "content_changed": "modified",
+    "permission_changed": "permission",
+}
+
+ALL_CHANGE_TYPES = "all"
+
+
+class _RuleIndex:
+    """
+        Whitelist patterns of one change type, indexed so a lookup walks the path once.
+
+        - exact paths and names are dict lookups
+        - "*suffix" names are probed by suffix length, "prefix*" names through a character trie
+        - other name globs are bucketed in a trie by their literal prefix
+        - absolute path globs are bucketed in a trie by their literal leading directories
+        - regexes ("re:...") and relative path globs are the only rules tested one by one
+    """
+
+    def __init__(self):
+        self.exact_paths = {}
+        self.exact_names = {}
+        self.suffixes = {}
+        self.suffix_lengths = ()
+        self.name_prefix_trie = {}
+        self.name_glob_trie = {}
+        self.path_glob_trie = {}
+        self.scanned_rules = []
+
+    def add(self, rule_id, pattern):
+        if pattern.startswith(REGEX_PATTERN_PREFIX):
+            self.scanned_rules.append((re.compile(pattern[len(REGEX_PATTERN_PREFIX):]), rule_id))
+            return
+
+        has_glob = bool(GLOB_CHARACTERS & set(pattern))
+
+        if "/" in pattern:
+            if not has_glob:
+                self.exact_paths.setdefault(pattern, rule_id)
+            elif pattern.startswith("/"):
+                # Leading components before the first glob character select the trie node
+                literal = self._literal_prefix(pattern)
+                node = self.path_glob_trie
+                for component in literal.split("/")[:-1]:
+                    node = node.setdefault(component, {})
+                node.setdefault(None, []).append((re.compile(translate(pattern)), rule_id))
+            else:
+                self.scanned_rules.append((re.compile("(?:.*/)?" + translate(pattern)), rule_id))
+            return
+
+        if not has_glob:
+            self.exact_names.setdefault(pattern, rule_id)
+        elif pattern.startswith("*") and not GLOB_CHARACTERS & set(pattern[1:]):
+            self.suffixes.setdefault(pattern[1:], rule_id)
+        elif pattern.endswith("*") and not GLOB_CHARACTERS & set(pattern[:-1]):
+            node = self.name_prefix_trie
+            for character in pattern[:-1]:
+                node = node.setdefault(character, {})
+            node.setdefault(None, rule_id)
+        else:
+            node = self.name_glob_trie
+            for character in self._literal_prefix(pattern):
+                node = node.setdefault(character, {})
+            node.setdefault(None, []).append((re.compile(translate(pattern)), rule_id))
+
+    def compile(self):
+        self.suffix_lengths = tuple(sorted({len(suffix) for suffix in self.suffixes}))
+
+    @staticmethod
+    def _literal_prefix(pattern):
+        for index, character in enumerate(pattern):
+            if character in GLOB_CHARACTERS:
+                return pattern[:index]
+        return pattern
+
+    def match(self, file_path):
+        """
+            @param file_path:
+            @return: Id of a matching rule or None
+        """
+        rule_id = self.exact_paths.get(file_path)
+        if rule_id is not None:
+            return rule_id
+
+        name = file_path.rsplit("/", 1)[-1]
+
+        rule_id = self.exact_names.get(name)
+        if rule_id is not None:
+            return rule_id
+
+        for length in self.suffix_lengths:
+            rule_id = self.suffixes.get(name[-length:] if length else "")
+            if rule_id is not None:
+                return rule_id
+
+        rule_id = self._match_name_tries(name)
+        if rule_id is not None:
+            return rule_id
+
+        node = self.path_glob_trie
+        for component in file_path.split("/"):
+            node = node.get(component)
+            if node is None:
+                break
+            for regex, rule_id in node.get(None, ()):
+                if regex.match(file_path):
+                    return rule_id
+
+        for regex, rule_id in self.scanned_rules:
+            if regex.match(file_path):
+                return rule_id
+
+        return None
+
+    def _match_name_tries(self, name):
+        prefix_node = self.name_prefix_trie
+        glob_node = self.name_glob_trie
+
+        for character in name + "\0":
+            if prefix_node is not None:
+                if None in prefix_node:
+                    return prefix_node[None]
+                prefix_node = prefix_node.get(character)
+
+            if glob_node is not None:
+                for regex, rule_id in glob_node.get(None, ()):
+                    if regex.match(name):
+                        return rule_id
+                glob_node = glob_node.get(character)
+
+            if prefix_node is None and glob_node is None:
+                break
+
+        return None
+
+
+class WhitelistRuleEngine:
+    """
+        Active, unexpired whitelist rules of a baseline compiled into one index per change type.
+
+        Patterns follow the exclude pattern syntax: names ("*.log"), absolute path globs
+        ("/etc/app/*.conf") and relative path globs ("app/cache/*"). A "re:" prefix marks a regex
+        matched against the full path. A rule with no change types never matches.
+    """
+
+    def __init__(self, rules):
+        """
+            @param rules: Iterable of (rule_id, file_pattern, change_types)
+        """
+        self.rule_count = 0
+        self._any_change = _RuleIndex()
+        self._by_change_type = {}
+
+        for rule_id, file_pattern, change_types in rules:
+            if not file_pattern:
+                continue
+            pattern_error = self.pattern_error(file_pattern)
+            if pattern_error is not None:
+                # Rules saved before patterns were validated must not stop the scan
+                print(f"Skipping whitelist rule {rule_id}, invalid regex {file_pattern}: {pattern_error}")
+                continue
+            self.rule_count += 1
+
+            for change_type in set(change_types or ()):
+                if change_type == ALL_CHANGE_TYPES:
+                    self._any_change.add(rule_id, file_pattern)
+                    continue
+                change_type = CHANGE_TYPE_ALIASES.get(change_type, change_type)
+                self._by_change_type.setdefault(change_type, _RuleIndex()).add(rule_id, file_pattern)
+
+        self._any_change.compile()
+        for index in self._by_change_type.values():
+            index.compile()
+
+    @staticmethod
+    def pattern_error(file_pattern):
+        """
+            @param file_pattern:
+            @return: Why a "re:" pattern does not compile, None for a usable pattern
+        """
+        if not file_pattern.startswith(REGEX_PATTERN_PREFIX):
+            return None
+        try:
+            re.compile(file_pattern[len(REGEX_PATTERN_PREFIX):])
+        except re.error as e:
+            return str(e)
+        return None
+
+    @classmethod
+    def for_baseline(cls, baseline):
+        """
+            @param baseline:
+            @return: Engine over the baseline's active rules that have not expired
+        """
+        rules = WhitelistRule.objects.filter(
+            baseline=baseline, active=True
+        ).filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+        ).values_list("id", "file_pattern", "change_types")
+        return cls(rules)
+
+    def match(self, file_path, change_type):
+        """
+            @param file_path:
+            @param change_type: Scan change type (added, modified, deleted, permission)
+            @return: Id of the first matching rule or None
+        """
+        if not self.rule_count:
+            return None
+
+        rule_id = self._any_change.match(file_path)
+        if rule_id is not None:
+            return rule_id
+
+        index = self._by_change_type.get(change_type)
+        return index.match(file_path) if index is not None else None
@@ -3,6 +3,7 @@ from rest_framework import status
 from file_integrity_monitoring.commons.generic_constants import GenericConstants
 from monitoring.models import WhitelistRule
 from monitoring.services.service_helper.monitoring_service_helper import MonitoringServiceHelper
+from monitoring.services.service_helper.whitelist_rule_engine import WhitelistRuleEngine
 from file_integrity_monitoring.commons.commons import Commons
 
 
@@ -35,6 +36,13 @@ class WhitelistRuleUpdateService(MonitoringServiceHelper):
             self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
             return {"message": GenericConstants.WHITELIST_RULE_ID_REQUIRED_MESSAGE}
 
+        if params.get("file_pattern") is not None:
+            pattern_error = WhitelistRuleEngine.pattern_error(params.get("file_pattern"))
+            if pattern_error is not None:
+                self.error = True
+                self.set_status_code(status_code=status.HTTP_400_BAD_REQUEST)
+                return {"message": GenericConstants.INVALID_FILE_PATTERN_MESSAGE.format(pattern_error)}
+
         # Get whitelist rule
         try:
             whitelist_rule = WhitelistRule.objects.get(id=params.get("rule_id"))
@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+
+from monitoring.models import Alert, Baseline, FileChange, MonitoringSession, WhitelistRule
+from monitoring.services.dashboard_summary_get_service import DashboardSummaryGetService
+
+# Bulk writes and queryset updates send no signals; their callers invalidate explicitly
+DASHBOARD_SAVE_MODELS = (Baseline, MonitoringSession, FileChange, Alert, WhitelistRule)
+
+# Sessions, changes and alerts are only deleted through their baseline's cascade. A post_delete
+# receiver on them would stop Django from fast-deleting those rows.
+DASHBOARD_DELETE_MODELS = (Baseline, WhitelistRule)
+
+
+def invalidate_dashboard_summary(sender, **kwargs):
+    DashboardSummaryGetService.invalidate_cache()
+
+
+for model in DASHBOARD_SAVE_MODELS:
+    post_save.connect(invalidate_dashboard_summary, sender=model, dispatch_uid=f"dashboard_save_{model.__name__}")
+
+for model in DASHBOARD_DELETE_MODELS:
+    post_delete.connect(invalidate_dashboard_summary, sender=model, dispatch_uid=f"dashboard_delete_{model.__name__}")
@@ -1,3 +1,824 @@
+import os
+import re
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest import mock
+
 from django.test import TestCase
+from django.utils import timezone
+
+from accounts.models import Users
+from file_integrity_monitoring.commons.generic_constants import GenericConstants
+from file_integrity_monitoring.commons.keyset_paginator import InvalidCursor, KeysetPaginator
+from file_integrity_monitoring.services.view_services import ViewServices
+from monitoring.models import (
+    Alert, Baseline, BaselineFile, FileChange, MonitoringCounter, MonitoringJob, MonitoringSchedule,
+    MonitoringSession, WhitelistRule
+)
+from monitoring.services.baseline_scan_resume_service import BaselineScanResumeService
+from monitoring.services.monitoring_session_create_service import (
+    MonitoringSessionCancelled, MonitoringSessionCreateService
+)
+from monitoring.services.service_helper.file_change_recorder import FileChangeRecorder
+from monitoring.services.service_helper.hash_cache import HashCache
+from monitoring.services.service_helper.hashing_engine import HashingEngine
+from monitoring.management.commands.benchmark_exclude_matcher import legacy_should_exclude
+from monitoring.services.service_helper.cron_schedule import CronSchedule
+from monitoring.services.service_helper.exclude_matcher import ExcludeMatcher, translate
+from monitoring.services.service_helper.monitoring_counters import MonitoringCounters
+from monitoring.services.service_helper.monitoring_job_runner import MonitoringJobRunner
+from monitoring.services.service_helper.monitoring_scheduler import MonitoringScheduler
+from monitoring.services.service_helper.monitoring_session_reaper import MonitoringSessionReaper
+from monitoring.services.service_helper.whitelist_rule_engine import CHANGE_TYPE_ALIASES, WhitelistRuleEngine
+
+
+class MonitoringTestCase(TestCase):
+    """Baseline over a temporary tree of files a0.txt .. a9.txt, without the persistent hash cache"""
+
+    file_count = 10
+
+    def setUp(self):
+        hash_cache_patch = mock.patch.object(GenericConstants, "HASH_CACHE_ENABLED", False)
+        hash_cache_patch.start()
+        self.addCleanup(hash_cache_patch.stop)
+        HashCache._instance = None
+
+        self.root = tempfile.mkdtemp(prefix="fim-test-")
+        self.addCleanup(shutil.rmtree, self.root, ignore_errors=True)
+        for index in range(self.file_count):
+            self.write(f"a{index}.txt", f"content {index}")
+
+        self.user = Users.objects.create(email="tester@example.com", password="x")
+        status_code, response = ViewServices(service_name="create_baseline").execute_service(data={
+            "name": "test baseline",
+            "path": self.root,
+            "user_id": self.user.id
+        })
+        self.assertEqual(status_code, 200, response)
+        self.baseline = Baseline.objects.get(name="test baseline")
+
+    def path(self, name):
+        return os.path.join(self.root, name)
+
+    def write(self, name, content):
+        with open(self.path(name), "w") as f:
+            f.write(content)
+
+    def open_changes(self):
+        return sorted(
+            (os.path.basename(file_path), change_type)
+            for file_path, change_type in FileChange.objects.filter(
+                baseline=self.baseline, acknowledged=False
+            ).values_list("file_path", "change_type")
+        )
+
+
+class MergeJoinScanTests(MonitoringTestCase):
+
+    def scan(self, session=None, checkpoint=None):
+        return MonitoringSessionCreateService()._scan_and_compare(
+            self.baseline, "full", self.user.id, session, checkpoint
+        )
+
+    def test_clean_tree_has_no_changes(self):
+        results = self.scan()
+
+        self.assertEqual(results["files_scanned"], self.file_count)
+        self.assertEqual(results["changes_found"], 0)
+        self.assertEqual(self.open_changes(), [])
+
+    def test_added_deleted_and_modified_files(self):
+        self.write("a3.txt", "tampered")
+        os.remove(self.path("a5.txt"))
+        # Sorts between baseline paths, and past the last one
+        self.write("a55.txt", "new")
+        self.write("z.txt", "new")
+        os.remove(self.path("a9.txt"))
+
+        results = self.scan()
+
+        self.assertEqual(self.open_changes(), [
+            ("a3.txt", "modified"),
+            ("a5.txt", "deleted"),
+            ("a55.txt", "added"),
+            ("a9.txt", "deleted"),
+            ("z.txt", "added"),
+        ])
+        self.assertEqual(results["files_scanned"], self.file_count - 2 + 2)
+        self.assertEqual(results["files_added"], 2)
+        self.assertEqual(results["files_deleted"], 2)
+        self.assertEqual(results["files_modified"], 1)
+        self.assertEqual(results["errors"], 0)
+
+    def test_resumed_checkpoint_compares_only_paths_after_it(self):
+        session = MonitoringSession.objects.create(
+            baseline=self.baseline, user=self.user, monitor_type="full",
+            status=GenericConstants.SESSION_STATUS_RUNNING
+        )
+        service = MonitoringSessionCreateService()
+        checkpoint = {
+            "last_path": self.path("a4.txt"),
+            "results": {
+                **{key: value for key, value in service._empty_results().items() if key != "cancelled"},
+                "files_scanned": 5
+            }
+        }
+        # Changes at or before last_path belong to the interrupted run
+        self.write("a1.txt", "tampered before the checkpoint")
+        os.remove(self.path("a2.txt"))
+        self.write("a7.txt", "tampered after the checkpoint")
+        os.remove(self.path("a8.txt"))
+        self.write("a65.txt", "new")
+
+        results = self.scan(session, checkpoint)
+
+        self.assertEqual(self.open_changes(), [
+            ("a65.txt", "added"),
+            ("a7.txt", "modified"),
+            ("a8.txt", "deleted"),
+        ])
+        # a5, a6, a65, a7 and a9 walked on top of the five the checkpoint counted
+        self.assertEqual(results["files_scanned"], 10)
+        self.assertEqual(results["files_added"], 1)
+        self.assertEqual(results["files_deleted"], 1)
+        self.assertEqual(results["files_modified"], 1)
+
+
+class IncrementalScanTests(MonitoringTestCase):
+
+    def scan(self, monitor_type):
+        return MonitoringSessionCreateService()._scan_and_compare(self.baseline, monitor_type, self.user.id)
+
+    def edit_in_place(self, name):
+        # Rewriting a file keeps its directory's mtime; the file's own mtime moves
+        stat_info = os.stat(self.path(name))
+        self.write(name, "tampered in place")
+        os.utime(self.path(name), ns=(stat_info.st_atime_ns, stat_info.st_mtime_ns + 10 ** 9))
+
+    def test_incremental_catches_in_place_edits(self):
+        self.scan("structural")
+        self.edit_in_place("a3.txt")
+
+        results = self.scan("incremental")
+
+        self.assertEqual(results["files_scanned"], self.file_count)
+        self.assertEqual(self.open_changes(), [("a3.txt", "modified")])
+
+    def test_structural_skips_unchanged_directories(self):
+        self.scan("structural")
+        self.edit_in_place("a3.txt")
+        self.write("new.txt", "new")
+
+        self.scan("structural")
+
+        # The new file moved the directory's mtime, so the edit is found with it
+        self.assertEqual(self.open_changes(), [("a3.txt", "modified"), ("new.txt", "added")])
+
+        self.edit_in_place("a4.txt")
+        results = self.scan("structural")
+        self.assertEqual(results["files_scanned"], 0)
+        self.assertEqual(results["directories_skipped"], 1)
+        self.assertNotIn(("a4.txt", "modified"), self.open_changes())
+
+    def test_structural_scan_with_errors_keeps_the_old_fingerprints(self):
+        self.scan("structural")
+        self.edit_in_place("a3.txt")
+        self.write("new.txt", "new")
+
+        with mock.patch.object(FileChangeRecorder, "flush", autospec=True) as flush:
+            flush.side_effect = lambda recorder: setattr(recorder, "errors", recorder.errors + 1)
+            results = self.scan("structural")
+        self.assertGreater(results["errors"], 0)
+
+        # The directory is walked again and the change that failed to write is found
+        results = self.scan("structural")
+        self.assertEqual(results["directories_skipped"], 0)
+        self.assertIn(("a3.txt", "modified"), self.open_changes())
+
+
+class FileChangeUpsertTests(MonitoringTestCase):
+
+    def record(self, name, severity="high", current_hash="digest"):
+        recorder = FileChangeRecorder(self.baseline, self.user.id)
+        change = recorder.record(self.path(name), None, "modified", current_hash, severity)
+        recorder.flush()
+        return recorder, change
+
+    def test_open_change_is_updated_not_duplicated(self):
+        first, _ = self.record("a1.txt", current_hash="first")
+        second, _ = self.record("a1.txt", current_hash="second")
+
+        changes = FileChange.objects.filter(baseline=self.baseline)
+        self.assertEqual(changes.count(), 1)
+        self.assertEqual(changes.get().current_hash, "second")
+        self.assertEqual((first.changes_created, second.changes_created, second.changes_updated), (1, 0, 1))
+        # The open change keeps the alert it got the first time
+        self.assertEqual(Alert.objects.filter(file_change__baseline=self.baseline).count(), 1)
+
+    def test_path_recorded_twice_in_one_chunk_is_written_once(self):
+        recorder = FileChangeRecorder(self.baseline, self.user.id)
+        recorder.record(self.path("a1.txt"), None, "modified", "first", "high")
+        recorder.record(self.path("a1.txt"), None, "modified", "second", "critical")
+        recorder.flush()
+
+        change = FileChange.objects.get(baseline=self.baseline)
+        self.assertEqual((change.current_hash, change.severity), ("second", "critical"))
+
+    def test_acknowledged_change_is_reopened_as_a_new_change(self):
+        self.record("a1.txt")
+        change = FileChange.objects.get(baseline=self.baseline)
+        change.acknowledge(self.user, "expected")
+        self.assertIsNone(change.dedup_key)
+
+        recorder, _ = self.record("a1.txt")
+
+        self.assertEqual(recorder.changes_created, 1)
+        self.assertEqual(FileChange.objects.filter(baseline=self.baseline).count(), 2)
+        self.assertEqual(FileChange.objects.filter(baseline=self.baseline, acknowledged=False).count(), 1)
+        self.assertEqual(Alert.objects.filter(file_change__baseline=self.baseline).count(), 2)
+
+
+class MonitoringCounterTests(MonitoringTestCase):
+
+    def record(self, name, severity):
+        recorder = FileChangeRecorder(self.baseline, self.user.id)
+        baseline_file = BaselineFile.objects.get(baseline=self.baseline, file_path=self.path(name))
+        recorder.record(self.path(name), baseline_file, "modified", "digest", severity)
+        recorder.flush()
+
+    def open_total(self, severity=None):
+        return MonitoringCounters.total(
+            MonitoringCounters.file_change_metrics(acknowledged=False), self.baseline.id, severity
+        )
+
+    def test_severity_change_moves_the_count(self):
+        self.record("a1.txt", "medium")
+        self.record("a2.txt", "medium")
+        self.record("a1.txt", "critical")
+
+        self.assertEqual(self.open_total(), 2)
+        self.assertEqual(self.open_total("medium"), 1)
+        self.assertEqual(self.open_total("critical"), 1)
+
+    def test_severity_change_is_counted_on_the_detection_day(self):
+        self.record("a1.txt", "medium")
+        detected_day = timezone.localdate() - timedelta(days=3)
+        FileChange.objects.filter(baseline=self.baseline).update(detected_at=timezone.now() - timedelta(days=3))
+        MonitoringCounter.objects.filter(baseline=self.baseline, day__isnull=False).update(day=detected_day)
+
+        self.record("a1.txt", "critical")
+
+        daily = dict(
+            MonitoringCounter.objects.filter(
+                baseline=self.baseline, metric=MonitoringCounters.file_change_metrics(False)[0], day__isnull=False
+            ).values_list("severity", "count")
+        )
+        self.assertEqual(daily, {"medium": 0, "critical": 1})
+        self.assertFalse(
+            MonitoringCounter.objects.filter(baseline=self.baseline, day=timezone.localdate()).exists()
+        )
+
+    def test_counters_match_a_rebuild(self):
+        self.record("a1.txt", "medium")
+        self.record("a2.txt", "high")
+        self.record("a1.txt", "critical")
+        status_code, response = ViewServices(service_name="acknowledge_file_change").execute_service(data={
+            "change_id": FileChange.objects.get(file_path=self.path("a2.txt")).id,
+            "user_id": self.user.id
+        })
+        self.assertEqual(status_code, 200, response)
+        incremental = MonitoringCounters.totals_by_metric_and_severity()
+
+        MonitoringCounters.rebuild(self.baseline.id)
+
+        self.assertEqual(
+            {key: count for key, count in MonitoringCounters.totals_by_metric_and_severity().items() if count},
+            {key: count for key, count in incremental.items() if count}
+        )
+
+
+class KeysetPaginatorTests(MonitoringTestCase):
+
+    SORT_FIELDS = ("detected_at", "severity", "file_path", "id")
+
+    def setUp(self):
+        super().setUp()
+        recorder = FileChangeRecorder(self.baseline, self.user.id)
+        for index in range(self.file_count):
+            recorder.record(self.path(f"a{index}.txt"), None, "modified", "digest", ("low", "high")[index % 2])
+        recorder.flush()
+
+        # Three detection times shared by several rows each
+        start = timezone.now()
+        for change in FileChange.objects.filter(baseline=self.baseline):
+            FileChange.objects.filter(id=change.id).update(detected_at=start + timedelta(seconds=change.id % 3))
+        self.changes = FileChange.objects.filter(baseline=self.baseline)
+
+    def paginator(self, sort_by="detected_at", sort_order="desc"):
+        return KeysetPaginator(self.changes, sort_by, sort_order, self.SORT_FIELDS)
+
+    def all_pages(self, sort_by, sort_order, page_size):
+        paginator = self.paginator(sort_by, sort_order)
+        ids, cursor = [], None
+        while True:
+            rows, cursor = paginator.get_page(cursor, page_size)
+            self.assertLessEqual(len(rows), page_size)
+            ids += [row.id for row in rows]
+            if cursor is None:
+                return ids
+
+    def test_pages_cover_every_row_once_across_ties(self):
+        for sort_by in ("detected_at", "severity"):
+            for sort_order in ("asc", "desc"):
+                for page_size in (1, 3, 4, self.file_count):
+                    with self.subTest(sort_by=sort_by, sort_order=sort_order, page_size=page_size):
+                        prefix = "-" if sort_order == "desc" else ""
+                        expected = list(
+                            self.changes.order_by(f"{prefix}{sort_by}", f"{prefix}id").values_list("id", flat=True)
+                        )
+                        self.assertEqual(self.all_pages(sort_by, sort_order, page_size), expected)
+
+    def test_cursor_round_trip(self):
+        paginator = self.paginator()
+        rows, cursor = paginator.get_page(None, 4)
+        last = rows[-1]
+
+        self.assertNotIn("=", cursor)
+        self.assertEqual(paginator.decode_cursor(cursor), (last.detected_at, last.id))
+
+    def test_invalid_cursors(self):
+        _, cursor = self.paginator().get_page(None, 4)
+
+        for token in ("not a cursor", "e30", KeysetPaginator.encode_cursor({"s": "detected_at", "d": True})):
+            with self.subTest(token=token):
+                with self.assertRaises(InvalidCursor):
+                    self.paginator().decode_cursor(token)
+        # A cursor only continues the ordering it was issued for
+        with self.assertRaises(InvalidCursor):
+            self.paginator(sort_order="asc").get_page(cursor, 4)
+        with self.assertRaises(InvalidCursor):
+            self.paginator(sort_by="severity").get_page(cursor, 4)
+        with self.assertRaises(InvalidCursor):
+            self.paginator(sort_by="change_type")
+
+    def test_capped_count(self):
+        self.assertEqual(KeysetPaginator.capped_count(self.changes, limit=20), (self.file_count, False))
+        self.assertEqual(KeysetPaginator.capped_count(self.changes, limit=4), (4, True))
+
+
+class BaselineScanResumeTests(MonitoringTestCase):
+
+    def resume(self):
+        return ViewServices(service_name="resume_baseline_scan").execute_service(data={
+            "baseline_id": self.baseline.id,
+            "user_id": self.user.id
+        })[0]
+
+    def test_second_resume_of_a_claimed_scan_is_refused(self):
+        # A scan still marked scanning whose progress went stale, as after a crash
+        stale = timezone.now() - timedelta(seconds=GenericConstants.BASELINE_SCAN_STALE_SECONDS + 60)
+        Baseline.objects.filter(id=self.baseline.id).update(
+            status=GenericConstants.STATUS_SCANNING,
+            scan_progress={"files_processed": 5, "updated_at": stale.isoformat()},
+            updated_at=stale
+        )
+
+        with mock.patch.object(BaselineScanResumeService, "_resume_scan") as resume_scan:
+            first = self.resume()
+            second = self.resume()
+
+        self.assertEqual((first, second), (202, 400))
+        self.assertEqual(resume_scan.call_count, 1)
+
+    def test_failed_scan_is_resumed_once(self):
+        Baseline.objects.filter(id=self.baseline.id).update(status=GenericConstants.STATUS_INCOMPLETE)
+
+        with mock.patch.object(BaselineScanResumeService, "_resume_scan") as resume_scan:
+            codes = [self.resume(), self.resume()]
+
+        self.assertEqual(codes, [202, 400])
+        self.assertEqual(resume_scan.call_count, 1)
+
+
+class ExcludeMatcherTests(TestCase):
+
+    def test_name_patterns_match_the_basename(self):
+        matcher = ExcludeMatcher(["app.log", "*.tmp", "cache*", "core.*.dump"])
+
+        self.assertTrue(matcher.matches("/srv/app.log"))
+        self.assertTrue(matcher.matches("/srv/deep/x.tmp"))
+        self.assertTrue(matcher.matches("/home/u/cached.bin"))
+        self.assertTrue(matcher.matches("/var/core.12.dump"))
+        self.assertFalse(matcher.matches("/srv/app.log.1"))
+        self.assertFalse(matcher.matches("/srv/x.tmp.gz"))
+        self.assertFalse(matcher.matches("/home/u/no-cache"))
+        self.assertFalse(matcher.matches("/var/core.dump"))
+        # A name pattern never matches a parent directory component
+        self.assertFalse(matcher.matches("/srv/app.log/inner"))
+
+    def test_question_mark_and_bracket_are_literal(self):
+        matcher = ExcludeMatcher(["file[1].txt", "log?.*.gz", "*[tmp]"])
+
+        self.assertTrue(matcher.matches("/data/file[1].txt"))
+        self.assertFalse(matcher.matches("/data/file1.txt"))
+        self.assertTrue(matcher.matches("/data/log?.2024.gz"))
+        # The per-pattern loop handed "log?.*.gz" to fnmatch, where "?" matched any character
+        self.assertFalse(matcher.matches("/data/log1.2024.gz"))
+        self.assertTrue(legacy_should_exclude("/data/log1.2024.gz", ["log?.*.gz"]))
+        self.assertTrue(matcher.matches("/data/x[tmp]"))
+        self.assertFalse(matcher.matches("/data/xt"))
+
+    def test_inner_star_of_a_suffix_or_prefix_pattern_is_a_wildcard(self):
+        matcher = ExcludeMatcher(["*.log*"])
+
+        self.assertTrue(matcher.matches("/var/app.log.1"))
+        # The per-pattern loop took everything after the leading "*" as a literal suffix
+        self.assertFalse(legacy_should_exclude("/var/app.log.1", ["*.log*"]))
+
+    def test_path_patterns(self):
+        matcher = ExcludeMatcher(["/var/cache/*", ".git/objects", "build/*.o"])
+
+        # A leading "/" anchors at the root, "*" crossing directories
+        self.assertTrue(matcher.matches("/var/cache/a"))
+        self.assertTrue(matcher.matches("/var/cache/a/b"))
+        self.assertFalse(matcher.matches("/srv/var/cache/a"))
+        # Relative patterns match trailing path components at a directory boundary
+        self.assertTrue(matcher.matches("/repo/.git/objects", is_dir=True))
+        self.assertFalse(matcher.matches("/repo/x.git/objects", is_dir=True))
+        self.assertTrue(matcher.matches("/src/build/main.o"))
+        self.assertFalse(matcher.matches("/src/rebuild/main.o"))
+
+    def test_directory_only_patterns(self):
+        matcher = ExcludeMatcher(["node_modules/", "/var/tmp/"])
+
+        self.assertTrue(matcher.matches("/app/node_modules", is_dir=True))
+        self.assertFalse(matcher.matches("/app/node_modules"))
+        self.assertTrue(matcher.matches("/var/tmp", is_dir=True))
+        self.assertFalse(matcher.matches("/var/tmp"))
+
+    def test_matches_under_checks_every_directory_below_the_root(self):
+        matcher = ExcludeMatcher(["node_modules/", "/srv/app/cache/*", "srv"])
+
+        self.assertTrue(matcher.matches_under("/srv/app/node_modules/lib/index.js", "/srv/app"))
+        self.assertTrue(matcher.matches_under("/srv/app/cache/x/y", "/srv/app"))
+        self.assertFalse(matcher.matches_under("/srv/app/src/index.js", "/srv/app"))
+        # The root and the directories above it are never excluded
+        self.assertFalse(matcher.matches_under("/srv", "/srv", is_dir=True))
+        self.assertFalse(matcher.matches_under("/srv/app/src/index.js", "/srv/"))
+
+    def test_patterns_without_question_mark_or_bracket_match_as_before(self):
+        patterns = ["app.log", "*.tmp", "cache*", "core.*.dump", "a.*.conf", "x*y*z"]
+        names = ["app.log", "a.tmp", "cache", "cachedir", "core.1.dump", "core.dump", "a.d.conf", "xaybz", "xyz", "y"]
+
+        matcher = ExcludeMatcher(patterns)
+        for name in names:
+            with self.subTest(name=name):
+                self.assertEqual(matcher.matches(f"/srv/{name}"), legacy_should_exclude(f"/srv/{name}", patterns))
+
+
+class HashingEngineTests(TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp(prefix="fim-test-")
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.file_path = os.path.join(directory, "a.txt")
+        with open(self.file_path, "w") as f:
+            f.write("content")
+        self.stat_info = os.stat(self.file_path)
+
+        self.hash_cache = HashCache(os.path.join(directory, "hash_cache.sqlite3"))
+        self.addCleanup(self.hash_cache._connection.close)
+
+    def hash_once(self, cached_digest, paranoid_sample):
+        self.hash_cache.put(self.stat_info, {"sha256": cached_digest})
+        self.hash_cache.flush()
+        engine = HashingEngine(
+            lambda file_path, algorithms: (True, {"sha256": "on disk"}),
+            hash_cache=self.hash_cache, paranoid_sample=paranoid_sample
+        )
+        results = list(engine.hash_files([(self.file_path, self.stat_info)], ("sha256",)))
+        return engine, results[0][3]
+
+    def test_cache_hit_is_trusted_without_paranoid_reads(self):
+        engine, digests = self.hash_once("cached", 0.0)
+
+        self.assertEqual(digests, {"sha256": "cached"})
+        self.assertEqual((engine.cache_hits, engine.cache_mismatches), (1, 0))
+
+    def test_paranoid_read_counts_and_replaces_a_stale_cache_entry(self):
+        engine, digests = self.hash_once("cached", 1.0)
+
+        self.assertEqual(digests, {"sha256": "on disk"})
+        self.assertEqual((engine.cache_hits, engine.cache_mismatches), (0, 1))
+        self.assertEqual(self.hash_cache.get(self.stat_info, ("sha256",)), {"sha256": "on disk"})
+
+    def test_paranoid_read_matching_the_cache(self):
+        engine, digests = self.hash_once("on disk", 1.0)
+
+        self.assertEqual(digests, {"sha256": "on disk"})
+        self.assertEqual((engine.cache_hits, engine.cache_mismatches), (0, 0))
+
+
+class WhitelistRuleEngineTests(MonitoringTestCase):
+
+    RULES = [
+        (1, "/etc/app/app.conf", ["content_changed"]),
+        (2, "app.log", ["all"]),
+        (3, "*.tmp", ["added", "deleted"]),
+        (4, "cache*", ["all"]),
+        (5, "core.*.dump", ["deleted"]),
+        (6, "/var/lib/*/state.db", ["content_changed", "permission_changed"]),
+        (7, "build/*.o", ["added"]),
+        (8, r"re:.*/\.git/.*", ["all"]),
+        (9, "report?[1].txt", ["added"]),
+        (10, "/opt/*", []),
+    ]
+
+    PATHS = [
+        "/etc/app/app.conf", "/etc/app/app.conf.bak", "/etc/other/app.conf", "/srv/app.log", "/srv/app.log.1",
+        "/tmp/x.tmp", "/tmp/x.tmp.gz", "/home/u/cache", "/home/u/cached.bin", "/home/u/no-cache",
+        "/core.1.dump", "/var/core.12.dump", "/var/core.dump", "/var/lib/db/state.db",
+        "/var/lib/db/nested/state.db", "/src/build/main.o", "/src/build/sub/main.o", "/repo/.git/HEAD",
+        "/reports/report?[1].txt", "/reports/reportA1.txt", "/opt/tool",
+    ]
+
+    CHANGE_TYPES = ["added", "modified", "deleted", "permission"]
+
+    @staticmethod
+    def linear_match(rules, file_path, change_type):
+        """Every rule tried in turn, as a plain reading of the pattern syntax"""
+        matches = []
+        for rule_id, pattern, change_types in rules:
+            types = {CHANGE_TYPE_ALIASES.get(rule_type, rule_type) for rule_type in change_types}
+            if "all" not in types and change_type not in types:
+                continue
+            if pattern.startswith("re:"):
+                is_match = re.match(pattern[3:], file_path) is not None
+            elif pattern.startswith("/"):
+                is_match = re.match(translate(pattern), file_path) is not None
+            elif "/" in pattern:
+                is_match = re.match("(?:.*/)?" + translate(pattern), file_path) is not None
+            else:
+                is_match = re.match(translate(pattern), os.path.basename(file_path)) is not None
+            if is_match:
+                matches.append(rule_id)
+        return matches
+
+    def test_engine_agrees_with_a_linear_match(self):
+        engine = WhitelistRuleEngine(self.RULES)
+
+        for file_path in self.PATHS:
+            for change_type in self.CHANGE_TYPES:
+                with self.subTest(file_path=file_path, change_type=change_type):
+                    expected = self.linear_match(self.RULES, file_path, change_type)
+                    rule_id = engine.match(file_path, change_type)
+                    if expected:
+                        self.assertIn(rule_id, expected)
+                    else:
+                        self.assertIsNone(rule_id)
+
+    def test_rule_kinds(self):
+        engine = WhitelistRuleEngine(self.RULES)
+
+        self.assertEqual(engine.match("/etc/app/app.conf", "modified"), 1)
+        self.assertEqual(engine.match("/srv/app.log", "permission"), 2)
+        self.assertEqual(engine.match("/tmp/x.tmp", "added"), 3)
+        self.assertEqual(engine.match("/home/u/cached.bin", "deleted"), 4)
+        self.assertEqual(engine.match("/var/core.12.dump", "deleted"), 5)
+        self.assertEqual(engine.match("/var/lib/db/state.db", "modified"), 6)
+        self.assertEqual(engine.match("/src/build/main.o", "added"), 7)
+        self.assertEqual(engine.match("/repo/.git/HEAD", "modified"), 8)
+        # "?" and "[" are literal, as in exclude patterns
+        self.assertEqual(engine.match("/reports/report?[1].txt", "added"), 9)
+        self.assertIsNone(engine.match("/reports/reportA1.txt", "added"))
+        # A rule without change types never matches
+        self.assertIsNone(engine.match("/opt/tool", "added"))
+
+    def test_change_type_aliases(self):
+        engine = WhitelistRuleEngine(self.RULES)
+
+        self.assertEqual(engine.match("/var/lib/db/state.db", "modified"), 6)
+        self.assertEqual(engine.match("/var/lib/db/state.db", "permission"), 6)
+        self.assertIsNone(engine.match("/var/lib/db/state.db", "deleted"))
+        self.assertIsNone(engine.match("/etc/app/app.conf", "content_changed"))
+        self.assertIsNone(engine.match("/etc/app/app.conf", "permission"))
+
+    def test_for_baseline_skips_disabled_and_expired_rules(self):
+        def rule(file_pattern, **kwargs):
+            return WhitelistRule.objects.create(
+                baseline=self.baseline, file_pattern=file_pattern, change_types=["all"], user=self.user, **kwargs
+            )
+
+        active = rule("active.txt")
+        future = rule("future.txt", expires_at=timezone.now() + timedelta(days=1))
+        rule("disabled.txt", active=False)
+        rule("expired.txt", expires_at=timezone.now() - timedelta(seconds=1))
+        # Saved before patterns were validated
+        rule("re:[")
+
+        engine = WhitelistRuleEngine.for_baseline(self.baseline)
+
+        self.assertEqual(engine.rule_count, 2)
+        self.assertEqual(engine.match(self.path("active.txt"), "added"), active.id)
+        self.assertEqual(engine.match(self.path("future.txt"), "added"), future.id)
+        self.assertIsNone(engine.match(self.path("disabled.txt"), "added"))
+        self.assertIsNone(engine.match(self.path("expired.txt"), "added"))
+
+
+class CronScheduleTests(TestCase):
+
+    @staticmethod
+    def at(*args):
+        return timezone.make_aware(datetime(*args))
+
+    def runs(self, expression, after, count=4):
+        schedule = CronSchedule(expression)
+        runs = []
+        for _ in range(count):
+            after = schedule.next_after(after)
+            runs.append(after)
+        return runs
+
+    def test_fields(self):
+        schedule = CronSchedule("*/15 9-17/4 1,15 jan-mar,12 *")
+
+        self.assertEqual(schedule.minutes, {0, 15, 30, 45})
+        self.assertEqual(schedule.hours, {9, 13, 17})
+        self.assertEqual(schedule.days, {1, 15})
+        self.assertEqual(schedule.months, {1, 2, 3, 12})
+        self.assertEqual(CronSchedule("5/20 * * * *").minutes, {5, 25, 45})
+        # Sunday is 0 and 7
+        self.assertEqual(CronSchedule("0 0 * * 5-7").weekdays, {5, 6, 0})
+        self.assertEqual(CronSchedule("@weekly").weekdays, {0})
+
+    def test_invalid_expressions(self):
+        for expression in ["", "* * * *", "60 * * * *", "* 24 * * *", "5-1 * * * *", "*/0 * * * *",
+                           "1,,2 * * * *", "* * * foo *", "0 0 30 2 *"]:
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    CronSchedule(expression)
+
+    def test_next_after_is_strictly_later(self):
+        self.assertEqual(
+            self.runs("*/15 9-10 * * *", self.at(2026, 3, 2, 10, 30), count=3),
+            [self.at(2026, 3, 2, 10, 45), self.at(2026, 3, 3, 9, 0), self.at(2026, 3, 3, 9, 15)]
+        )
+        self.assertEqual(
+            self.runs("0 0 1 1 *", self.at(2026, 1, 1, 0, 0, 30), count=1), [self.at(2027, 1, 1, 0, 0)]
+        )
+
+    def test_restricted_day_of_month_and_day_of_week_match_either(self):
+        # 2026-03-01 is a Sunday: runs on the 13th and on every Friday
+        self.assertEqual(
+            self.runs("0 12 13 * fri", self.at(2026, 3, 1)),
+            [self.at(2026, 3, 6, 12), self.at(2026, 3, 13, 12), self.at(2026, 3, 20, 12), self.at(2026, 3, 27, 12)]
+        )
+
+    def test_one_restricted_day_field_alone_decides(self):
+        self.assertEqual(
+            self.runs("0 0 * * mon", self.at(2026, 3, 1), count=2), [self.at(2026, 3, 2), self.at(2026, 3, 9)]
+        )
+        self.assertEqual(
+            self.runs("0 0 31 * *", self.at(2026, 3, 1), count=2), [self.at(2026, 3, 31), self.at(2026, 5, 31)]
+        )
+        self.assertEqual(self.runs("0 0 29 2 *", self.at(2026, 3, 1), count=1), [self.at(2028, 2, 29)])
+
+
+class MonitoringSchedulerTests(MonitoringTestCase):
+
+    def setUp(self):
+        super().setUp()
+        in_process_patch = mock.patch.object(GenericConstants, "JOB_RUNNER_IN_PROCESS", False)
+        in_process_patch.start()
+        self.addCleanup(in_process_patch.stop)
+
+        self.now = timezone.now()
+        self.schedule = MonitoringSchedule.objects.create(
+            baseline=self.baseline, cron_expression="0 * * * *", jitter_seconds=0,
+            next_run_at=self.now - timedelta(minutes=1), user=self.user
+        )
+
+    def test_due_schedule_is_started_once(self):
+        stats = MonitoringScheduler().run_once(self.now)
+
+        self.schedule.refresh_from_db()
+        self.assertEqual(stats["started"], 1)
+        self.assertGreater(self.schedule.next_run_at, self.now)
+        self.assertEqual(MonitoringJob.objects.filter(session=self.schedule.last_session).count(), 1)
+        self.assertEqual(MonitoringScheduler().run_once(self.now)["started"], 0)
+
+    def test_schedule_claimed_by_another_scheduler_is_not_started_again(self):
+        # Both schedulers read the schedule while it was due
+        stale = MonitoringSchedule.objects.select_related("baseline").get(id=self.schedule.id)
+        MonitoringScheduler().run_once(self.now)
+
+        scheduler = MonitoringScheduler()
+        started = scheduler._start(stale, scheduler.compute_next_run(stale, self.now), self.now)
+
+        self.assertFalse(started)
+        self.assertEqual(MonitoringSession.objects.filter(baseline=self.baseline).count(), 1)
+        self.assertEqual(MonitoringJob.objects.count(), 1)
+
+    def test_in_process_workers_are_woken_after_commit(self):
+        with mock.patch.object(GenericConstants, "JOB_RUNNER_IN_PROCESS", True), \
+                mock.patch.object(MonitoringJobRunner, "get_instance") as get_instance:
+            with self.captureOnCommitCallbacks() as callbacks:
+                MonitoringScheduler().run_once(self.now)
+                get_instance.assert_not_called()
+
+            self.assertEqual(len(callbacks), 1)
+            callbacks[0]()
+            get_instance.return_value.start.assert_called_once()
+
+
+class MonitoringJobTests(MonitoringTestCase):
+
+    def setUp(self):
+        super().setUp()
+        in_process_patch = mock.patch.object(GenericConstants, "JOB_RUNNER_IN_PROCESS", False)
+        in_process_patch.start()
+        self.addCleanup(in_process_patch.stop)
+        heartbeat_patch = mock.patch("monitoring.services.monitoring_session_create_service.SessionHeartbeat")
+        heartbeat_patch.start()
+        self.addCleanup(heartbeat_patch.stop)
+
+        self.session = MonitoringSession.objects.create(
+            baseline=self.baseline, user=self.user, monitor_type="full",
+            status=GenericConstants.SESSION_STATUS_QUEUED
+        )
+        self.params = {"monitor_type": "full", "user_id": self.user.id}
+        self.job = MonitoringJobRunner.enqueue(self.session, self.params)
+
+    def start(self, runner):
+        """Claim the job and move its session to running, as a worker does before scanning"""
+        job = runner.claim_next_job()
+        MonitoringSession.objects.filter(id=self.session.id).update(
+            status=GenericConstants.SESSION_STATUS_RUNNING, attempt=job.attempts, updated_at=timezone.now()
+        )
+        return job
+
+    def expire_heartbeat(self):
+        stale = timezone.now() - timedelta(seconds=GenericConstants.SESSION_STALE_SECONDS + 60)
+        MonitoringSession.objects.filter(id=self.session.id).update(updated_at=stale)
+
+    def test_job_is_claimed_once(self):
+        first, second = MonitoringJobRunner(workers=1), MonitoringJobRunner(workers=1)
+
+        job = first.claim_next_job()
+
+        self.assertEqual((job.id, job.status, job.attempts), (self.job.id, GenericConstants.SESSION_STATUS_RUNNING, 1))
+        self.assertIsNone(second.claim_next_job())
+
+    def test_session_with_a_live_heartbeat_is_left_alone(self):
+        self.start(MonitoringJobRunner(workers=1))
+
+        self.assertEqual(MonitoringSessionReaper().reap(), {"requeued": 0, "failed": 0})
+
+    def test_silent_session_is_requeued_then_failed(self):
+        runner = MonitoringJobRunner(workers=1)
+        for attempt in range(1, GenericConstants.SESSION_MAX_ATTEMPTS):
+            self.start(runner)
+            self.expire_heartbeat()
+            self.assertEqual(MonitoringSessionReaper().reap(), {"requeued": 1, "failed": 0})
+
+            self.session.refresh_from_db()
+            self.assertEqual(self.session.status, GenericConstants.SESSION_STATUS_QUEUED)
+            self.assertEqual(self.session.metadata["resumes"], attempt)
+            self.assertEqual(MonitoringJob.objects.get(id=self.job.id).status, GenericConstants.SESSION_STATUS_QUEUED)
+
+        self.start(runner)
+        self.expire_heartbeat()
+        self.assertEqual(MonitoringSessionReaper().reap(), {"requeued": 0, "failed": 1})
+        self.assertEqual(
+            MonitoringSession.objects.get(id=self.session.id).status, GenericConstants.SESSION_STATUS_FAILED
+        )
+
+    def test_reaped_worker_cannot_write_to_the_session(self):
+        stalled_runner, next_runner = MonitoringJobRunner(workers=1), MonitoringJobRunner(workers=1)
+        stalled_job = stalled_runner.claim_next_job()
+        service = MonitoringSessionCreateService()
+
+        def stall_until_taken_over(*args):
+            # The worker stalls, is reaped, and the job is claimed again and started
+            self.expire_heartbeat()
+            MonitoringSessionReaper().reap()
+            self.start(next_runner)
+            with self.assertRaises(MonitoringSessionCancelled):
+                service._report_progress(args[3], service._empty_results(), force=True)
+            return {**service._empty_results(), "files_scanned": 99}
+
+        with mock.patch.object(service, "_scan_and_compare", side_effect=stall_until_taken_over):
+            self.assertEqual(
+                service.run_session(self.session.id, self.params, stalled_job.attempts),
+                GenericConstants.SESSION_STATUS_QUEUED
+            )
+        with mock.patch.object(
+            MonitoringSessionCreateService, "run_session", return_value=GenericConstants.SESSION_STATUS_COMPLETED
+        ):
+            stalled_runner.run_job(stalled_job)
 
-# Create your tests here.
+        session = MonitoringSession.objects.get(id=self.session.id)
+        self.assertEqual((session.status, session.attempt), (GenericConstants.SESSION_STATUS_RUNNING, 2))
+        self.assertEqual(session.files_scanned, 0)
+        self.assertEqual(MonitoringJob.objects.get(id=self.job.id).status, GenericConstants.SESSION_STATUS_RUNNING)
@@ -14,6 +14,7 @@ urlpatterns = [
     # API routes (JSON responses)
     path('api/baselines', views.BaselinesView.as_view(), name='api_baselines'),
     path('api/baseline-details', views.BaselineDetailsView.as_view(), name='api_baseline_details'),
+    path('api/baseline-resume-scan', views.BaselineResumeScanView.as_view(), name='api_baseline_resume_scan'),
     path('api/file-changes', views.FileChangesView.as_view(), name='api_file_changes'),
     path('api/file-change-details', views.FileChangeDetailsView.as_view(), name='api_file_change_details'),
     path('api/file-change-acknowledge', views.FileChangeAcknowledgeView.as_view(), name='api_file_change_acknowledge'),
@@ -25,7 +26,12 @@ urlpatterns = [
     path('api/monitoring-session-details', views.MonitoringSessionDetailsView.as_view(),
          name='api_monitoring_session_details'),
     path('api/monitoring-session-start', views.MonitoringSessionStartView.as_view(), name='api_monitoring_session_start'),
+    path('api/monitoring-session-progress', views.MonitoringSessionProgressView.as_view(),
+         name='api_monitoring_session_progress'),
+    path('api/monitoring-session-cancel', views.MonitoringSessionCancelView.as_view(),
+         name='api_monitoring_session_cancel'),
     path('api/whitelist-rules', views.WhitelistRulesView.as_view(), name='api_whitelist_rules'),
     path('api/whitelist-rule-details', views.WhitelistRuleDetailsView.as_view(), name='api_whitelist_rule_details'),
+    path('api/monitoring-schedules', views.MonitoringSchedulesView.as_view(), name='api_monitoring_schedules'),
     path('api/dashboard-summary', views.DashboardSummaryView.as_view(), name='api_dashboard_summary'),
 ]
\ No newline at end of file
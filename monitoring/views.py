@@ -118,6 +118,17 @@ class BaselineDetailsView(View):
         return JsonResponse(data, safe=False, status=status_code)
 
 
+@method_decorator(csrf_exempt, name='dispatch')
+class BaselineResumeScanView(View):
+    def post(self, request, *args, **kwargs):
+        data = json.loads(request.body)
+
+        kwargs.update({'data': data})
+        service_obj = ViewServices(service_name='resume_baseline_scan')
+        status_code, data = service_obj.execute_service(*args, **kwargs)
+        return JsonResponse(data, safe=False, status=status_code)
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class FileChangesView(View):
     def get(self, request, baseline_id=None, *args, **kwargs):
@@ -128,6 +139,8 @@ class FileChangesView(View):
         severity = request.GET.get('severity')
         change_type = request.GET.get('change_type')
         acknowledged = request.GET.get('acknowledged')
+        cursor = request.GET.get('cursor')
+        include_total = request.GET.get('include_total', 'true')
 
         data = {
             'baseline_id': baseline_id,
@@ -137,7 +150,9 @@ class FileChangesView(View):
             'sort_order': sort_order,
             'severity': severity,
             'change_type': change_type,
-            'acknowledged': acknowledged
+            'acknowledged': acknowledged,
+            'cursor': cursor,
+            'include_total': include_total
         }
 
         kwargs.update({'data': data})
@@ -180,6 +195,8 @@ class AlertsView(View):
         severity = request.GET.get('severity')
         read = request.GET.get('read')
         is_archived = request.GET.get('is_archived')
+        cursor = request.GET.get('cursor')
+        include_total = request.GET.get('include_total', 'true')
 
         data = {
             'page': page,
@@ -188,7 +205,9 @@ class AlertsView(View):
             'sort_order': sort_order,
             'severity': severity,
             'read': read,
-            'is_archived': is_archived
+            'is_archived': is_archived,
+            'cursor': cursor,
+            'include_total': include_total
         }
 
         kwargs.update({'data': data})
@@ -282,6 +301,31 @@ class MonitoringSessionStartView(View):
         status_code, response = service_obj.execute_service(*args, **kwargs)
         return JsonResponse(response, status=status_code)
 
+
+@method_decorator(csrf_exempt, name='dispatch')
+class MonitoringSessionProgressView(View):
+    def get(self, request, *args, **kwargs):
+        session_id = request.GET.get('monitor_session_id')
+
+        data = {'monitor_session_id': session_id}
+
+        kwargs.update({'data': data})
+        service_obj = ViewServices(service_name='get_monitoring_session_progress')
+        status_code, data = service_obj.execute_service(*args, **kwargs)
+        return JsonResponse(data, safe=False, status=status_code)
+
+
+@method_decorator(csrf_exempt, name='dispatch')
+class MonitoringSessionCancelView(View):
+    def post(self, request, *args, **kwargs):
+        data = json.loads(request.body)
+
+        kwargs.update({'data': data})
+
+        service_obj = ViewServices(service_name='cancel_monitoring_session')
+        status_code, response = service_obj.execute_service(*args, **kwargs)
+        return JsonResponse(response, status=status_code)
+
 @method_decorator(csrf_exempt, name='dispatch')
 class WhitelistRulesView(View):
     def get(self, request, *args, **kwargs):
@@ -341,6 +385,52 @@ class WhitelistRuleDetailsView(View):
         return JsonResponse(data, safe=False, status=status_code)
 
 
+@method_decorator(csrf_exempt, name='dispatch')
+class MonitoringSchedulesView(View):
+    def get(self, request, *args, **kwargs):
+        page = request.GET.get('page', '1')
+        page_size = request.GET.get('page_size', '10')
+        baseline_id = request.GET.get('baseline_id')
+        enabled = request.GET.get('enabled')
+
+        data = {
+            'page': page,
+            'page_size': page_size,
+            'baseline_id': baseline_id,
+            'enabled': enabled
+        }
+
+        kwargs.update({'data': data})
+        service_obj = ViewServices(service_name='get_monitoring_schedules')
+        status_code, data = service_obj.execute_service(*args, **kwargs)
+        return JsonResponse(data, safe=False, status=status_code)
+
+    def post(self, request, *args, **kwargs):
+        data = json.loads(request.body)
+        data['user_id'] = request.user.id if hasattr(request, 'user') else None
+
+        kwargs.update({'data': data})
+        service_obj = ViewServices(service_name='create_monitoring_schedule')
+        status_code, data = service_obj.execute_service(*args, **kwargs)
+        return JsonResponse(data, safe=False, status=status_code)
+
+    def put(self, request, *args, **kwargs):
+        data = json.loads(request.body)
+
+        kwargs.update({'data': data})
+        service_obj = ViewServices(service_name='update_monitoring_schedule')
+        status_code, data = service_obj.execute_service(*args, **kwargs)
+        return JsonResponse(data, safe=False, status=status_code)
+
+    def delete(self, request, *args, **kwargs):
+        data = json.loads(request.body)
+
+        kwargs.update({'data': data})
+        service_obj = ViewServices(service_name='delete_monitoring_schedule')
+        status_code, data = service_obj.execute_service(*args, **kwargs)
+        return JsonResponse(data, safe=False, status=status_code)
+
+
 @method_decorator(csrf_exempt, name='dispatch')
 class DashboardSummaryView(View):
 